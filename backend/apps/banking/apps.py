@@ -5,3 +5,6 @@ class BankingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "backend.apps.banking"
     verbose_name = "Banking"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from backend.apps.banking.models import BankAccount, CreditLimit, Customer
+from backend.apps.banking.services.credit_reservations import CreditLimitReservations
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Mede a vazão de reservas de limite com escritores concorrentes (modo simples e com shards)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--writers", type=int, default=32, help="Threads escritoras simultâneas.")
+        parser.add_argument("--reservations", type=int, default=200, help="Reservas por escritor.")
+        parser.add_argument("--shards", type=int, default=16, help="Subcontadores no modo com shards.")
+        parser.add_argument("--amount", type=str, default="1.00", help="Valor de cada reserva.")
+
+    def handle(self, *args, **options) -> None:
+        writers: int = options["writers"]
+        reservations: int = options["reservations"]
+        amount = Decimal(options["amount"])
+        tenant = Tenant.objects.create(
+            slug=f"bench-credit-{uuid.uuid4().hex[:8]}",
+            display_name="Benchmark de limite",
+            primary_domain=f"bench-{uuid.uuid4().hex[:8]}.iabank.local",
+            pii_policy_version="v1",
+        )
+        try:
+            report = {
+                "writers": writers,
+                "reservations_per_writer": reservations,
+                "plain": self._run(tenant, writers, reservations, amount, shards=0),
+                "sharded": self._run(tenant, writers, reservations, amount, shards=options["shards"]),
+            }
+        finally:
+            self._cleanup(tenant)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _create_limit(self, tenant: Tenant, total: Decimal) -> CreditLimit:
+        with use_tenant(tenant.id):
+            customer = Customer.objects.create(name="Benchmark", document_number=uuid.uuid4().hex[:11])
+            account = BankAccount.objects.create(
+                customer=customer,
+                name="Conta benchmark",
+                agency="0001",
+                account_number=uuid.uuid4().hex[:12],
+                type=BankAccount.AccountType.CHECKING,
+            )
+            return CreditLimit.objects.create(bank_account=account, current_limit=total)
+
+    def _run(self, tenant: Tenant, writers: int, reservations: int, amount: Decimal, shards: int) -> dict[str, Any]:
+        limit = self._create_limit(tenant, amount * writers * reservations)
+        if shards:
+            CreditLimitReservations(tenant.id).enable_sharding(limit.id, shards)
+
+        accepted = [0] * writers
+        barrier = threading.Barrier(writers + 1)
+
+        def writer(index: int) -> None:
+            service = CreditLimitReservations(tenant.id)
+            reserve = service.reserve_sharded if shards else service.reserve
+            try:
+                barrier.wait()
+                for _ in range(reservations):
+                    accepted[index] += int(reserve(limit.id, amount))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        total = sum(accepted)
+        return {
+            "mode": f"sharded({shards})" if shards else "plain",
+            "accepted": total,
+            "seconds": round(elapsed, 4),
+            "reservations_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+            "effective_usage": str(CreditLimitReservations(tenant.id).usage(limit.id)),
+        }
+
+    def _cleanup(self, tenant: Tenant) -> None:
+        with use_tenant(tenant.id):
+            CreditLimit.objects.all().delete()
+            BankAccount.objects.all().delete()
+            Customer.objects.all().delete()
+        tenant.delete()
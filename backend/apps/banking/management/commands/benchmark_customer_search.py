@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backend.apps.banking.services.customer_search import search_customers
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+# Clientes sintéticos em uma instrução, numerados a partir da contagem atual do tenant
+# para que execuções repetidas acumulem linhas em vez de colidir no documento.
+_SEED_SQL = """
+INSERT INTO banking_customer (id, tenant_id, name, document_number, status, created_at, updated_at)
+SELECT gen_random_uuid(), %(tenant)s,
+       'Cliente Sintetico ' || lpad((%(offset)s + n)::text, 7, '0'),
+       '9' || lpad((%(offset)s + n)::text, 13, '0'),
+       'ACTIVE', %(now)s, %(now)s
+FROM generate_series(1, %(rows)s) AS n
+ON CONFLICT (tenant_id, document_number) DO NOTHING
+"""
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class Command(BaseCommand):
+    help = "Mede a latência (p50/p95) da busca de clientes de um tenant e compara com a meta."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--tenant", required=True, help="Slug do tenant.")
+        parser.add_argument("--name", action="append", default=[], help="Trecho de nome (repetível).")
+        parser.add_argument("--document", action="append", default=[], help="Prefixo de documento (repetível).")
+        parser.add_argument("--iterations", type=int, default=50, help="Execuções por termo.")
+        parser.add_argument("--limit", type=int, default=25, help="Tamanho da página.")
+        parser.add_argument("--p95-target-ms", type=float, default=150.0, help="Meta de p95 em milissegundos.")
+        parser.add_argument(
+            "--seed-rows",
+            type=int,
+            default=0,
+            help="Insere N clientes sintéticos no tenant antes de medir (só em tenants de benchmark).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        tenant = Tenant.objects.filter(slug=options["tenant"]).first()
+        if tenant is None:
+            raise CommandError(f"Tenant {options['tenant']} não encontrado.")
+        if options["seed_rows"]:
+            self._seed(tenant, options["seed_rows"])
+
+        queries = [{"name": term} for term in options["name"]] + [{"document": term} for term in options["document"]]
+        queries = queries or [{"name": "Sintetico 00042"}, {"name": "ana"}, {"document": "900000001"}]
+        timings: list[float] = []
+        for query in queries:
+            for _ in range(options["iterations"]):
+                started = time.perf_counter()
+                search_customers(tenant, limit=options["limit"], **query)
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        report = {
+            "tenant": tenant.slug,
+            "queries": len(queries),
+            "samples": len(timings),
+            "p50_ms": round(_percentile(timings, 0.50), 2),
+            "p95_ms": round(_percentile(timings, 0.95), 2),
+            "p95_target_ms": options["p95_target_ms"],
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+        if report["p95_ms"] > options["p95_target_ms"]:
+            raise CommandError(f"p95 da busca de clientes ({report['p95_ms']} ms) acima da meta.")
+
+    def _seed(self, tenant: Tenant, rows: int) -> None:
+        with use_tenant(tenant.id), transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM banking_customer WHERE tenant_id = %s", [str(tenant.id)])
+            offset = cursor.fetchone()[0]
+            cursor.execute(_SEED_SQL, {"tenant": str(tenant.id), "offset": offset, "rows": rows, "now": timezone.now()})
+            cursor.execute("ANALYZE banking_customer")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+import os
+
+from django.core.management.base import BaseCommand
+
+from backend.apps.banking.services.stress_simulation import LoanBook, StressScenario, StressSimulator
+
+
+class Command(BaseCommand):
+    help = "Mede caminhos/segundo do simulador de estresse numa carteira sintética (sem banco)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--loans", type=int, default=5000, help="Empréstimos na carteira sintética.")
+        parser.add_argument("--installments", type=int, default=24, help="Prazo de cada empréstimo sintético.")
+        parser.add_argument("--paths", type=int, default=2000, help="Caminhos simulados por execução.")
+        parser.add_argument("--chunk-paths", type=int, default=250, help="Caminhos por chunk.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            action="append",
+            default=[],
+            help="Processos (repetível; padrão: 1 e todos os núcleos).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        book = LoanBook.synthetic(options["loans"], options["installments"], seed=options["seed"])
+        scenario = StressScenario()
+        workers = options["workers"] or sorted({1, os.cpu_count() or 1})
+        runs = []
+        for count in workers:
+            simulator = StressSimulator(chunk_paths=options["chunk_paths"], workers=count, seed=options["seed"])
+            result = simulator.simulate(book, scenario, options["paths"])
+            runs.append({"workers": count, **result.as_dict()})
+        self.stdout.write(json.dumps({"loans": book.loans, "runs": runs}, indent=2))
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.apps.banking.services.statement_import import (
+    DEFAULT_IMPORT_CHUNK_SIZE,
+    STATEMENT_FORMATS,
+    WRITE_METHODS,
+    StatementImporter,
+    StatementImportError,
+)
+from backend.apps.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Importa um extrato CSV/OFX em streaming para FinancialTransaction, em chunks retomáveis."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", help="Arquivo do extrato.")
+        parser.add_argument("--tenant", required=True, help="Slug do tenant.")
+        parser.add_argument("--account", required=True, help="Id da conta bancária do extrato.")
+        parser.add_argument("--format", choices=STATEMENT_FORMATS, help="Padrão: extensão do arquivo.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_IMPORT_CHUNK_SIZE, help="Linhas por transação.")
+        parser.add_argument("--method", choices=WRITE_METHODS, default="copy", help="Escrita via COPY ou bulk_create.")
+        parser.add_argument("--start-offset", type=int, default=0, help="Byte de retomada informado pela execução anterior.")
+
+    def handle(self, *args, **options) -> None:
+        tenant = Tenant.objects.filter(slug=options["tenant"]).first()
+        if tenant is None:
+            raise CommandError(f"Tenant {options['tenant']} não encontrado.")
+        importer = StatementImporter(chunk_size=options["chunk_size"], method=options["method"])
+        try:
+            result = importer.import_file(
+                tenant.id,
+                options["account"],
+                options["path"],
+                statement_format=options["format"],
+                start_offset=options["start_offset"],
+            )
+        except StatementImportError as exc:
+            raise CommandError(f"{exc} Use --start-offset {exc.offset}.") from exc
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(json.dumps(result.as_dict(), indent=2))
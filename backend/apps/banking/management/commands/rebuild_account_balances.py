@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.apps.banking.services.account_balances import check_daily_balances, rebuild_daily_balances
+from backend.apps.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Reconstrói (ou verifica, com --check) os snapshots diários de saldo das contas."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--tenant", action="append", default=[], help="Slug do tenant (repetível; padrão: todos).")
+        parser.add_argument("--account", action="append", default=[], help="Id da conta (repetível; padrão: todas).")
+        parser.add_argument("--check", action="store_true", help="Apenas compara os snapshots com as transações.")
+
+    def handle(self, *args, **options) -> None:
+        tenants = Tenant.objects.order_by("slug")
+        if options["tenant"]:
+            tenants = tenants.filter(slug__in=options["tenant"])
+        accounts = options["account"] or None
+
+        drifted = 0
+        for tenant in tenants:
+            if options["check"]:
+                drifts = check_daily_balances(tenant.id, accounts)
+                for drift in drifts:
+                    self.stdout.write(
+                        f"{tenant.slug} {drift.bank_account_id} {drift.balance_date}: "
+                        f"esperado={drift.expected} armazenado={drift.stored}",
+                    )
+                drifted += len(drifts)
+            else:
+                rows = rebuild_daily_balances(tenant.id, accounts)
+                self.stdout.write(f"{tenant.slug}: {rows} snapshots reconstruídos")
+
+        if drifted:
+            raise CommandError(f"{drifted} snapshots de saldo divergentes; execute rebuild_account_balances.")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from backend.apps.banking.services.cash_flow_rollup import DEFAULT_REBUILD_WORKERS, rebuild_cash_flow_rollups
+from backend.apps.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Reconstrói a projeção diária de fluxo de caixa, com os tenants em paralelo."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--tenant", action="append", default=[], help="Slug do tenant (repetível; padrão: todos).")
+        parser.add_argument("--workers", type=int, default=DEFAULT_REBUILD_WORKERS, help="Tenants reconstruídos em paralelo.")
+
+    def handle(self, *args, **options) -> None:
+        tenant_ids = None
+        if options["tenant"]:
+            tenant_ids = [str(tenant_id) for tenant_id in Tenant.objects.filter(slug__in=options["tenant"]).values_list("id", flat=True)]
+            if not tenant_ids:
+                self.stdout.write("Nenhum tenant encontrado.")
+                return
+        results = rebuild_cash_flow_rollups(tenant_ids, workers=options["workers"])
+        for tenant_id, days in results.items():
+            self.stdout.write(f"{tenant_id}: {days} dias reconstruídos")
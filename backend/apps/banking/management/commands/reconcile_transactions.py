@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.apps.banking.services.reconciliation import DEFAULT_WINDOW_DAYS, ReconciliationService
+from backend.apps.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Vincula recebimentos de extrato sem parcela às parcelas em aberto (hash join por valor e cliente)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--tenant", required=True, help="Slug do tenant.")
+        parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS, help="Tolerância entre pagamento e vencimento.")
+        parser.add_argument("--dry-run", action="store_true", help="Só calcula o relatório, sem gravar vínculos.")
+        parser.add_argument("--report", help="Caminho do CSV com vínculos, ambíguos e não conciliados.")
+
+    def handle(self, *args, **options) -> None:
+        tenant = Tenant.objects.filter(slug=options["tenant"]).first()
+        if tenant is None:
+            raise CommandError(f"Tenant {options['tenant']} não encontrado.")
+        report = ReconciliationService(window_days=options["window_days"]).reconcile(tenant.id, dry_run=options["dry_run"])
+        if options["report"]:
+            with open(options["report"], "w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(["status", "transaction_id", "installment_ids", "reason"])
+                writer.writerows(report.rows())
+        self.stdout.write(json.dumps({"tenant": tenant.slug, "dry_run": options["dry_run"], **report.as_dict()}))
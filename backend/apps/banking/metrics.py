@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Mapping, Sequence, Type, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.registry import REGISTRY
+
+_Metric = TypeVar("_Metric", Counter, Gauge, Histogram)
+
+
+def _build(metric_class: Type[_Metric], name: str, documentation: str, labels: Sequence[str]) -> _Metric:
+    try:
+        return metric_class(name, documentation, tuple(labels))
+    except ValueError:
+        # Counters registram o nome com sufixo _total; os demais usam o nome puro.
+        existing = REGISTRY._names_to_collectors.get(name) or REGISTRY._names_to_collectors.get(f"{name}_total")
+        if existing is None:
+            raise
+        return existing
+
+
+OVERDUE_SWEEP_ROWS = _build(
+    Counter,
+    "banking_overdue_sweep_rows",
+    "Parcelas PENDING movidas para OVERDUE pelo sweeper",
+    ("tenant_slug",),
+)
+OVERDUE_SWEEP_ROWS_PER_SECOND = _build(
+    Gauge,
+    "banking_overdue_sweep_rows_per_second",
+    "Vazão da última execução do sweeper de inadimplência",
+    ("tenant_slug",),
+)
+OVERDUE_SWEEP_LAG_DAYS = _build(
+    Gauge,
+    "banking_overdue_sweep_lag_days",
+    "Atraso (dias) da parcela mais antiga marcada como OVERDUE na última execução",
+    ("tenant_slug",),
+)
+
+
+def record_overdue_sweep(tenant_slug: str, rows: int, rows_per_second: float, lag_days: int) -> None:
+    labels = {"tenant_slug": str(tenant_slug)}
+    if rows:
+        OVERDUE_SWEEP_ROWS.labels(**labels).inc(rows)
+    OVERDUE_SWEEP_ROWS_PER_SECOND.labels(**labels).set(rows_per_second)
+    OVERDUE_SWEEP_LAG_DAYS.labels(**labels).set(lag_days)
+
+DELINQUENCY_AGING_INSTALLMENTS = _build(
+    Gauge,
+    "banking_delinquency_aging_installments",
+    "Parcelas vencidas por faixa de atraso (dias) na última classificação",
+    ("tenant_slug", "bucket"),
+)
+DELINQUENCY_AGING_AMOUNT = _build(
+    Gauge,
+    "banking_delinquency_aging_amount",
+    "Saldo em aberto das parcelas vencidas por faixa de atraso na última classificação",
+    ("tenant_slug", "bucket"),
+)
+DELINQUENT_CUSTOMERS = _build(
+    Gauge,
+    "banking_delinquent_customers",
+    "Clientes classificados como DELINQUENT na última classificação",
+    ("tenant_slug",),
+)
+
+
+def record_delinquency_aging(
+    tenant_slug: str,
+    buckets: Mapping[str, tuple[int, Decimal]],
+    delinquent_customers: int,
+) -> None:
+    for bucket, (installments, amount) in buckets.items():
+        labels = {"tenant_slug": str(tenant_slug), "bucket": bucket}
+        DELINQUENCY_AGING_INSTALLMENTS.labels(**labels).set(installments)
+        DELINQUENCY_AGING_AMOUNT.labels(**labels).set(float(amount))
+    DELINQUENT_CUSTOMERS.labels(tenant_slug=str(tenant_slug)).set(delinquent_customers)
+
+INTEREST_ACCRUAL_ROWS = _build(
+    Counter,
+    "banking_interest_accrual_rows",
+    "Linhas de juros diários gravadas pelo job de apropriação",
+    ("tenant_slug",),
+)
+INTEREST_ACCRUAL_LOANS_PER_SECOND = _build(
+    Gauge,
+    "banking_interest_accrual_loans_per_second",
+    "Vazão (empréstimos/s) da última apropriação de juros",
+    ("tenant_slug",),
+)
+
+
+def record_interest_accrual(tenant_slug: str, rows: int, loans_per_second: float) -> None:
+    labels = {"tenant_slug": str(tenant_slug)}
+    if rows:
+        INTEREST_ACCRUAL_ROWS.labels(**labels).inc(rows)
+    INTEREST_ACCRUAL_LOANS_PER_SECOND.labels(**labels).set(loans_per_second)
+
+CUSTOMER_SEARCH_SECONDS = _build(
+    Histogram,
+    "banking_customer_search_seconds",
+    "Latência da busca de clientes por nome ou prefixo de documento",
+    ("tenant_slug", "mode"),
+)
+
+
+def record_customer_search(tenant_slug: str, mode: str, seconds: float) -> None:
+    CUSTOMER_SEARCH_SECONDS.labels(tenant_slug=str(tenant_slug), mode=mode).observe(seconds)
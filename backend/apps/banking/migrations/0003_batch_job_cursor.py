@@ -0,0 +1,50 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:01
+
+from pathlib import Path
+
+import backend.apps.tenancy.managers
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+RLS_SQL = (Path(__file__).resolve().parents[2] / 'tenancy' / 'sql' / 'rls_policies.sql').read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+        ('banking', '0002_alter_accountcategory_managers_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchJobCursor',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('job', models.CharField(max_length=64)),
+                ('run_date', models.DateField()),
+                ('position', models.JSONField(default=dict)),
+                ('processed_rows', models.PositiveBigIntegerField(default=0)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='tenancy.tenant')),
+            ],
+            options={
+                'db_table': 'banking_batch_job_cursor',
+            },
+            managers=[
+                ('objects', backend.apps.tenancy.managers.TenantManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='batchjobcursor',
+            constraint=models.UniqueConstraint(fields=('tenant', 'job', 'run_date'), name='batch_job_cursor_unique_run'),
+        ),
+        migrations.RunSQL(sql=RLS_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            sql='SELECT iabank.apply_tenant_rls_policies();',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
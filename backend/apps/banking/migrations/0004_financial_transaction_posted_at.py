@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0003_batch_job_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='financialtransaction',
+            name='posted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:07
+
+from pathlib import Path
+
+import backend.apps.tenancy.managers
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+RLS_SQL = (Path(__file__).resolve().parents[2] / 'tenancy' / 'sql' / 'rls_policies.sql').read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+        ('banking', '0004_financial_transaction_posted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditLimitShard',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('shard_index', models.PositiveSmallIntegerField()),
+                ('capacity', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('used_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('credit_limit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shards', to='banking.creditlimit')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='tenancy.tenant')),
+            ],
+            options={
+                'db_table': 'banking_credit_limit_shard',
+            },
+            managers=[
+                ('objects', backend.apps.tenancy.managers.TenantManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='creditlimitshard',
+            constraint=models.UniqueConstraint(fields=('credit_limit', 'shard_index'), name='credit_limit_shard_unique_index'),
+        ),
+        migrations.AddConstraint(
+            model_name='creditlimitshard',
+            constraint=models.CheckConstraint(check=models.Q(('used_amount__gte', 0)), name='credit_limit_shard_used_non_negative'),
+        ),
+        migrations.AddConstraint(
+            model_name='creditlimitshard',
+            constraint=models.CheckConstraint(check=models.Q(('used_amount__lte', models.F('capacity'))), name='credit_limit_shard_within_capacity'),
+        ),
+        migrations.RunSQL(sql=RLS_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            sql='SELECT iabank.apply_tenant_rls_policies();',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:09
+
+from pathlib import Path
+
+import backend.apps.tenancy.managers
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+RLS_SQL = (Path(__file__).resolve().parents[2] / 'tenancy' / 'sql' / 'rls_policies.sql').read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+        ('banking', '0005_credit_limit_shard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommissionLedgerEntry',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('description', models.CharField(blank=True, default='', max_length=255)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('folded_at', models.DateTimeField(blank=True, null=True)),
+                ('consultant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='commission_entries', to='banking.consultant')),
+                ('loan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='commission_entries', to='banking.loan')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='tenancy.tenant')),
+            ],
+            options={
+                'db_table': 'banking_commission_ledger',
+                'indexes': [models.Index(fields=['consultant', 'occurred_at'], name='commission_ledger_consult_idx'), models.Index(condition=models.Q(('folded_at__isnull', True)), fields=['tenant', 'occurred_at'], name='commission_ledger_unfolded_idx')],
+            },
+            managers=[
+                ('objects', backend.apps.tenancy.managers.TenantManager()),
+            ],
+        ),
+        migrations.RunSQL(sql=RLS_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            sql='SELECT iabank.apply_tenant_rls_policies();',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
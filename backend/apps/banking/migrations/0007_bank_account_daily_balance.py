@@ -0,0 +1,49 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:11
+
+from pathlib import Path
+
+import backend.apps.tenancy.managers
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+RLS_SQL = (Path(__file__).resolve().parents[2] / 'tenancy' / 'sql' / 'rls_policies.sql').read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+        ('banking', '0006_commission_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankAccountDailyBalance',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('balance_date', models.DateField()),
+                ('delta', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('closing_balance', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('bank_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_balances', to='banking.bankaccount')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='tenancy.tenant')),
+            ],
+            options={
+                'db_table': 'banking_bank_account_daily_balance',
+            },
+            managers=[
+                ('objects', backend.apps.tenancy.managers.TenantManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='bankaccountdailybalance',
+            constraint=models.UniqueConstraint(fields=('bank_account', 'balance_date'), name='bank_account_daily_balance_unique'),
+        ),
+        migrations.RunSQL(sql=RLS_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            sql='SELECT iabank.apply_tenant_rls_policies();',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:15
+
+from pathlib import Path
+
+import backend.apps.tenancy.managers
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+RLS_SQL = (Path(__file__).resolve().parents[2] / 'tenancy' / 'sql' / 'rls_policies.sql').read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+        ('banking', '0007_bank_account_daily_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CashFlowDailyRollup',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('rollup_date', models.DateField()),
+                ('receivables', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('open_installments', models.PositiveIntegerField(default=0)),
+                ('expected_income', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('expected_expense', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+            ],
+            options={
+                'db_table': 'banking_cash_flow_daily_rollup',
+            },
+            managers=[
+                ('objects', backend.apps.tenancy.managers.TenantManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='financialtransaction',
+            index=models.Index(condition=models.Q(('is_paid', False)), fields=['tenant', 'transaction_date'], name='financial_tx_open_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='installment',
+            index=models.Index(fields=['tenant', 'due_date'], name='installment_tenant_due_idx'),
+        ),
+        migrations.AddField(
+            model_name='cashflowdailyrollup',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='tenancy.tenant'),
+        ),
+        migrations.AddConstraint(
+            model_name='cashflowdailyrollup',
+            constraint=models.UniqueConstraint(fields=('tenant', 'rollup_date'), name='cash_flow_rollup_tenant_date_unique'),
+        ),
+        migrations.RunSQL(sql=RLS_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            sql='SELECT iabank.apply_tenant_rls_policies();',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:26
+
+from pathlib import Path
+
+import backend.apps.tenancy.managers
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+RLS_SQL = (Path(__file__).resolve().parents[2] / 'tenancy' / 'sql' / 'rls_policies.sql').read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+        ('banking', '0008_cash_flow_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoanInterestAccrual',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('accrual_date', models.DateField()),
+                ('outstanding_principal', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('daily_rate', models.DecimalField(decimal_places=10, max_digits=12)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('loan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interest_accruals', to='banking.loan')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='tenancy.tenant')),
+            ],
+            options={
+                'db_table': 'banking_loan_interest_accrual',
+                'indexes': [models.Index(fields=['tenant', 'accrual_date'], name='loan_accrual_tenant_date_idx')],
+            },
+            managers=[
+                ('objects', backend.apps.tenancy.managers.TenantManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='loaninterestaccrual',
+            constraint=models.UniqueConstraint(fields=('loan', 'accrual_date'), name='loan_interest_accrual_unique_day'),
+        ),
+        migrations.RunSQL(sql=RLS_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(
+            sql='SELECT iabank.apply_tenant_rls_policies();',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
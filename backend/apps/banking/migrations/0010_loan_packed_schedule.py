@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0009_loan_interest_accrual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='packed_schedule',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:46
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+# O trigram acelera ``name__icontains``, que o Django compila para
+# ``UPPER(name::text) LIKE UPPER('%termo%')``: o índice precisa ser da mesma expressão
+# ``UPPER(name)``, senão o planner não o usa. Servidores sem pg_trgm seguem sem o
+# índice: a busca continua correta, apenas sem o atalho para nomes parciais.
+TRIGRAM_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS banking_cust_name_trgm_idx
+            ON banking_customer USING gin ((UPPER(name)) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0010_loan_packed_schedule'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['tenant', 'name', 'id'], name='banking_cust_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(models.F('tenant'), django.db.models.functions.comparison.Collate(models.F('document_number'), 'C'), name='banking_cust_doc_prefix_idx'),
+        ),
+        migrations.RunSQL(
+            sql=TRIGRAM_SQL,
+            reverse_sql='DROP INDEX IF EXISTS banking_cust_name_trgm_idx;',
+        ),
+    ]
@@ -5,6 +5,8 @@ import uuid
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Collate
+from django.utils import timezone
 
 from backend.apps.tenancy.managers import TenantManager, use_tenant
 from backend.apps.tenancy.models import Tenant
@@ -53,6 +55,16 @@ class Customer(TimestampedTenantModel):
         unique_together = (("tenant", "document_number"),)
         indexes = [
             models.Index(fields=["tenant", "status"], name="banking_cust_status_idx"),
+            # Busca de clientes: ordem do keyset por nome e prefixo de documento. Em
+            # collation "C" o mesmo índice atende ``LIKE 'prefixo%'`` e a ordenação do
+            # keyset. O índice trigram de ``UPPER(name)`` fica na migração 0011, condicionado
+            # à extensão pg_trgm.
+            models.Index(fields=["tenant", "name", "id"], name="banking_cust_name_idx"),
+            models.Index(
+                models.F("tenant"),
+                Collate(models.F("document_number"), "C"),
+                name="banking_cust_doc_prefix_idx",
+            ),
         ]
 
     def __str__(self) -> str:  # pragma: no cover - auxiliar de debug
@@ -146,6 +158,25 @@ class BankAccount(TimestampedTenantModel):
         ]
 
 
+class BankAccountDailyBalance(TimestampedTenantModel):
+    """
+    Saldo diário da conta: ``delta`` do dia e ``closing_balance`` acumulado desde
+    ``BankAccount.initial_balance``, mantido a cada transação paga.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    bank_account = models.ForeignKey(BankAccount, on_delete=models.CASCADE, related_name="daily_balances")
+    balance_date = models.DateField()
+    delta = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    closing_balance = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        db_table = "banking_bank_account_daily_balance"
+        constraints = [
+            models.UniqueConstraint(fields=["bank_account", "balance_date"], name="bank_account_daily_balance_unique"),
+        ]
+
+
 class AccountCategory(TimestampedTenantModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(max_length=40)
@@ -207,6 +238,9 @@ class Loan(TimestampedTenantModel):
     iof_amount = models.DecimalField(max_digits=10, decimal_places=2)
     cet_annual_rate = models.DecimalField(max_digits=7, decimal_places=4)
     cet_monthly_rate = models.DecimalField(max_digits=7, decimal_places=4)
+    # Cópia compacta do cronograma (vencimentos, valores e valores pagos em colunas
+    # empacotadas) para leitura em uma única linha; ver services/packed_schedule.py.
+    packed_schedule = models.BinaryField(null=True, blank=True, editable=False)
 
     class Meta:
         db_table = "banking_loan"
@@ -245,6 +279,7 @@ class Installment(TimestampedTenantModel):
         indexes = [
             models.Index(fields=["tenant", "status"], name="banking_installment_status_idx"),
             models.Index(fields=["loan", "due_date"], name="banking_installment_due_idx"),
+            models.Index(fields=["tenant", "due_date"], name="installment_tenant_due_idx"),
         ]
         constraints = [
             models.CheckConstraint(check=models.Q(amount_due__gte=0), name="installment_amount_due_positive"),
@@ -292,12 +327,18 @@ class FinancialTransaction(TimestampedTenantModel):
         blank=True,
         related_name="payments",
     )
+    posted_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = "banking_financial_transaction"
         indexes = [
             models.Index(fields=["tenant", "type"], name="financial_tx_type_idx"),
             models.Index(fields=["bank_account"], name="financial_tx_account_idx"),
+            models.Index(
+                fields=["tenant", "transaction_date"],
+                name="financial_tx_open_date_idx",
+                condition=models.Q(is_paid=False),
+            ),
         ]
         constraints = [
             models.CheckConstraint(check=models.Q(amount__gte=0), name="financial_tx_amount_positive"),
@@ -308,6 +349,75 @@ class FinancialTransaction(TimestampedTenantModel):
         ]
 
 
+class CashFlowDailyRollup(TimestampedTenantModel):
+    """
+    Projeção de caixa por dia: parcelas em aberto e transações não pagas previstas
+    para ``rollup_date``. Recalculada por dia sempre que uma das origens muda.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    rollup_date = models.DateField()
+    receivables = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    open_installments = models.PositiveIntegerField(default=0)
+    expected_income = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    expected_expense = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "banking_cash_flow_daily_rollup"
+        constraints = [
+            models.UniqueConstraint(fields=["tenant", "rollup_date"], name="cash_flow_rollup_tenant_date_unique"),
+        ]
+
+
+class LoanInterestAccrual(TimestampedTenantModel):
+    """
+    Juros do dia sobre o saldo devedor de principal; uma linha por empréstimo e data,
+    o que torna o job de apropriação seguro para reexecução.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    loan = models.ForeignKey(Loan, on_delete=models.CASCADE, related_name="interest_accruals")
+    accrual_date = models.DateField()
+    outstanding_principal = models.DecimalField(max_digits=12, decimal_places=2)
+    daily_rate = models.DecimalField(max_digits=12, decimal_places=10)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        db_table = "banking_loan_interest_accrual"
+        indexes = [
+            models.Index(fields=["tenant", "accrual_date"], name="loan_accrual_tenant_date_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["loan", "accrual_date"], name="loan_interest_accrual_unique_day"),
+        ]
+
+
+class CommissionLedgerEntry(TimestampedTenantModel):
+    """
+    Lançamento imutável de comissão; ``folded_at`` marca quando o valor entrou em
+    ``Consultant.balance`` pelo job de consolidação.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    consultant = models.ForeignKey(Consultant, on_delete=models.PROTECT, related_name="commission_entries")
+    loan = models.ForeignKey(Loan, on_delete=models.SET_NULL, null=True, blank=True, related_name="commission_entries")
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    description = models.CharField(max_length=255, blank=True, default="")
+    occurred_at = models.DateTimeField(default=timezone.now)
+    folded_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "banking_commission_ledger"
+        indexes = [
+            models.Index(fields=["consultant", "occurred_at"], name="commission_ledger_consult_idx"),
+            models.Index(
+                fields=["tenant", "occurred_at"],
+                name="commission_ledger_unfolded_idx",
+                condition=models.Q(folded_at__isnull=True),
+            ),
+        ]
+
+
 class CreditLimit(TimestampedTenantModel):
     class Status(models.TextChoices):
         ACTIVE = "ACTIVE", "Active"
@@ -335,6 +445,30 @@ class CreditLimit(TimestampedTenantModel):
         ]
 
 
+class CreditLimitShard(TimestampedTenantModel):
+    """
+    Subcontador de um ``CreditLimit`` muito disputado: cada shard recebe uma fatia da
+    folga do limite e é reservado de forma independente.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    credit_limit = models.ForeignKey(CreditLimit, on_delete=models.CASCADE, related_name="shards")
+    shard_index = models.PositiveSmallIntegerField()
+    capacity = models.DecimalField(max_digits=12, decimal_places=2)
+    used_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "banking_credit_limit_shard"
+        constraints = [
+            models.UniqueConstraint(fields=["credit_limit", "shard_index"], name="credit_limit_shard_unique_index"),
+            models.CheckConstraint(check=models.Q(used_amount__gte=0), name="credit_limit_shard_used_non_negative"),
+            models.CheckConstraint(
+                check=models.Q(used_amount__lte=models.F("capacity")),
+                name="credit_limit_shard_within_capacity",
+            ),
+        ]
+
+
 class Contract(TimestampedTenantModel):
     class Status(models.TextChoices):
         ACTIVE = "ACTIVE", "Active"
@@ -374,3 +508,23 @@ class Contract(TimestampedTenantModel):
                 name="contract_etag_unique_per_tenant",
             ),
         ]
+
+
+class BatchJobCursor(TimestampedTenantModel):
+    """
+    Posição persistida de jobs em lote por tenant e data de referência, para retomada
+    após falha ou interrupção entre chunks.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.CharField(max_length=64)
+    run_date = models.DateField()
+    position = models.JSONField(default=dict)
+    processed_rows = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "banking_batch_job_cursor"
+        constraints = [
+            models.UniqueConstraint(fields=["tenant", "job", "run_date"], name="batch_job_cursor_unique_run"),
+        ]
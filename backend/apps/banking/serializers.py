@@ -293,3 +293,76 @@ class ContractSerializer(BaseModelSerializer):
         ]
         read_only_fields = ["id"]
         extra_kwargs = {"etag_payload": {"validators": []}}
+
+
+class CustomerSearchHitSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    document_number = serializers.CharField()
+    status = serializers.CharField()
+
+
+class Customer360AddressSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    zip_code = serializers.CharField()
+    street = serializers.CharField()
+    number = serializers.CharField()
+    complement = serializers.CharField(allow_null=True)
+    neighborhood = serializers.CharField()
+    city = serializers.CharField()
+    state = serializers.CharField()
+    is_primary = serializers.BooleanField()
+
+
+class Customer360CreditLimitSerializer(serializers.Serializer):
+    current_limit = serializers.DecimalField(max_digits=12, decimal_places=2)
+    used_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    status = serializers.CharField()
+    effective_from = serializers.DateField(allow_null=True)
+    effective_through = serializers.DateField(allow_null=True)
+
+
+class Customer360BankAccountSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    agency = serializers.CharField()
+    account_number = serializers.CharField()
+    type = serializers.CharField()
+    status = serializers.CharField()
+    credit_limit = Customer360CreditLimitSerializer(allow_null=True)
+
+
+class Customer360InstallmentSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    installment_number = serializers.IntegerField()
+    due_date = serializers.DateField()
+    amount_due = serializers.DecimalField(max_digits=10, decimal_places=2)
+    amount_paid = serializers.DecimalField(max_digits=10, decimal_places=2)
+    status = serializers.CharField()
+
+
+class Customer360LoanSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    principal_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    interest_rate = serializers.DecimalField(max_digits=5, decimal_places=2)
+    number_of_installments = serializers.IntegerField()
+    contract_date = serializers.DateField()
+    first_installment_date = serializers.DateField()
+    status = serializers.CharField()
+    iof_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    cet_annual_rate = serializers.DecimalField(max_digits=7, decimal_places=4)
+    cet_monthly_rate = serializers.DecimalField(max_digits=7, decimal_places=4)
+    next_installments = Customer360InstallmentSerializer(many=True)
+
+
+class Customer360Serializer(serializers.Serializer):
+    id = serializers.UUIDField(source="customer.id")
+    name = serializers.CharField(source="customer.name")
+    document_number = serializers.CharField(source="customer.document_number")
+    birth_date = serializers.DateField(source="customer.birth_date", allow_null=True)
+    email = serializers.EmailField(source="customer.email", allow_null=True)
+    phone = serializers.CharField(source="customer.phone", allow_null=True)
+    status = serializers.CharField(source="customer.status")
+    addresses = Customer360AddressSerializer(many=True)
+    bank_accounts = Customer360BankAccountSerializer(many=True)
+    loans = Customer360LoanSerializer(many=True)
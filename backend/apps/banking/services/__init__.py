@@ -1,3 +1,10 @@
+from backend.apps.banking.services.cet_solver import CETSolution, solve_cet, solve_cet_batch
+from backend.apps.banking.services.early_settlement import (
+    SettlementQuote,
+    quote_early_settlement,
+    quote_tenant_settlements,
+    stream_settlement_csv,
+)
 from backend.apps.banking.services.financial_calculations import (
     CETBreakdown,
     InstallmentQuote,
@@ -6,12 +13,40 @@ from backend.apps.banking.services.financial_calculations import (
     calculate_iof,
     generate_installments,
 )
+from backend.apps.banking.services.installment_stream import InstallmentRow, iter_installments
+from backend.apps.banking.services.month_calendar import MonthEndCalendar, get_month_calendar
+from backend.apps.banking.services.payment_posting import PaymentPostingService, PostingResult, post_payments
+from backend.apps.banking.services.portfolio_quotes import PortfolioQuote, quote_portfolio
+from backend.apps.banking.services.schedule_cache import (
+    AmortizationScheduleCache,
+    ScheduleCacheStats,
+    get_schedule_cache,
+)
 
 __all__ = [
+    "AmortizationScheduleCache",
     "CETBreakdown",
+    "CETSolution",
     "InstallmentQuote",
+    "InstallmentRow",
     "LoanInput",
+    "MonthEndCalendar",
+    "PaymentPostingService",
+    "PortfolioQuote",
+    "PostingResult",
+    "ScheduleCacheStats",
+    "SettlementQuote",
     "calculate_cet",
     "calculate_iof",
     "generate_installments",
+    "get_month_calendar",
+    "get_schedule_cache",
+    "iter_installments",
+    "post_payments",
+    "quote_early_settlement",
+    "quote_portfolio",
+    "quote_tenant_settlements",
+    "solve_cet",
+    "solve_cet_batch",
+    "stream_settlement_csv",
 ]
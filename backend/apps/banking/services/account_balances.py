@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+import structlog
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from backend.apps.banking.models import BankAccount, BankAccountDailyBalance, FinancialTransaction
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+
+logger = structlog.get_logger(__name__)
+
+# Efeito de cada transação paga: entrada soma e saída subtrai, na data de pagamento.
+# Dias com efeito líquido zero não têm snapshot (o saldo é o do dia anterior).
+_DAILY_DELTAS_SQL = """
+SELECT bank_account_id,
+       COALESCE(payment_date, transaction_date) AS balance_date,
+       SUM(CASE WHEN type = 'INCOME' THEN amount ELSE -amount END) AS delta
+FROM banking_financial_transaction
+WHERE tenant_id = %s
+  AND is_paid
+  AND bank_account_id IS NOT NULL
+  {account_filter}
+GROUP BY bank_account_id, COALESCE(payment_date, transaction_date)
+HAVING SUM(CASE WHEN type = 'INCOME' THEN amount ELSE -amount END) <> 0
+"""
+
+_UPSERT_DAY_SQL = """
+INSERT INTO banking_bank_account_daily_balance
+    (id, tenant_id, bank_account_id, balance_date, delta, closing_balance, created_at, updated_at)
+SELECT gen_random_uuid(), %(tenant)s, %(account)s, %(day)s, %(delta)s,
+       COALESCE(
+           (SELECT closing_balance FROM banking_bank_account_daily_balance
+            WHERE bank_account_id = %(account)s AND balance_date < %(day)s
+            ORDER BY balance_date DESC LIMIT 1),
+           %(initial)s
+       ) + %(delta)s,
+       %(now)s, %(now)s
+ON CONFLICT (bank_account_id, balance_date) DO UPDATE
+SET delta = banking_bank_account_daily_balance.delta + EXCLUDED.delta,
+    closing_balance = banking_bank_account_daily_balance.closing_balance + %(delta)s,
+    updated_at = EXCLUDED.updated_at
+"""
+
+_DROP_EMPTY_DAY_SQL = """
+DELETE FROM banking_bank_account_daily_balance
+WHERE bank_account_id = %(account)s AND balance_date = %(day)s AND delta = 0
+"""
+
+_SHIFT_LATER_DAYS_SQL = """
+UPDATE banking_bank_account_daily_balance
+SET closing_balance = closing_balance + %(delta)s, updated_at = %(now)s
+WHERE bank_account_id = %(account)s AND balance_date > %(day)s
+"""
+
+_REBUILD_SQL = """
+INSERT INTO banking_bank_account_daily_balance
+    (id, tenant_id, bank_account_id, balance_date, delta, closing_balance, created_at, updated_at)
+SELECT gen_random_uuid(), account.tenant_id, deltas.bank_account_id, deltas.balance_date, deltas.delta,
+       account.initial_balance + SUM(deltas.delta) OVER (
+           PARTITION BY deltas.bank_account_id ORDER BY deltas.balance_date
+       ),
+       %s, %s
+FROM ({deltas}) AS deltas
+JOIN banking_bank_account AS account ON account.id = deltas.bank_account_id
+"""
+
+_CHECK_SQL = """
+WITH expected AS (
+    SELECT deltas.bank_account_id, deltas.balance_date, deltas.delta,
+           account.initial_balance + SUM(deltas.delta) OVER (
+               PARTITION BY deltas.bank_account_id ORDER BY deltas.balance_date
+           ) AS closing_balance
+    FROM ({deltas}) AS deltas
+    JOIN banking_bank_account AS account ON account.id = deltas.bank_account_id
+), stored AS (
+    SELECT bank_account_id, balance_date, delta, closing_balance
+    FROM banking_bank_account_daily_balance
+    WHERE tenant_id = %s {account_filter}
+)
+SELECT COALESCE(expected.bank_account_id, stored.bank_account_id),
+       COALESCE(expected.balance_date, stored.balance_date),
+       expected.closing_balance,
+       stored.closing_balance
+FROM expected
+FULL OUTER JOIN stored
+  ON stored.bank_account_id = expected.bank_account_id AND stored.balance_date = expected.balance_date
+WHERE expected.closing_balance IS DISTINCT FROM stored.closing_balance
+   OR expected.delta IS DISTINCT FROM stored.delta
+ORDER BY 1, 2
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class BalanceEffect:
+    bank_account_id: UUID
+    balance_date: date
+    amount: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class BalanceDrift:
+    bank_account_id: UUID
+    balance_date: date
+    expected: Optional[Decimal]
+    stored: Optional[Decimal]
+
+
+def transaction_effect(financial_transaction: FinancialTransaction) -> Optional[BalanceEffect]:
+    """
+    Efeito da transação no saldo: só transações pagas e vinculadas a uma conta contam.
+    """
+    if not financial_transaction.is_paid or financial_transaction.bank_account_id is None:
+        return None
+    amount = Decimal(financial_transaction.amount)
+    if financial_transaction.type != FinancialTransaction.TransactionType.INCOME:
+        amount = -amount
+    return BalanceEffect(
+        bank_account_id=financial_transaction.bank_account_id,
+        balance_date=financial_transaction.payment_date or financial_transaction.transaction_date,
+        amount=amount,
+    )
+
+
+def apply_balance_delta(tenant_id: TenantIdentifier, bank_account_id: UUID, on_date: date, delta: Decimal) -> None:
+    """
+    Soma ``delta`` ao dia ``on_date`` e desloca o saldo de fechamento dos dias seguintes.
+
+    A linha da conta fica travada durante a atualização para que dois lançamentos no
+    mesmo dia novo não calculem o saldo de abertura em paralelo.
+    """
+    if not delta:
+        return
+    with use_tenant(tenant_id), transaction.atomic():
+        initial_balance = (
+            BankAccount.objects.select_for_update().filter(id=bank_account_id).values_list("initial_balance", flat=True).get()
+        )
+        params = {
+            "tenant": str(tenant_id),
+            "account": str(bank_account_id),
+            "day": on_date,
+            "delta": delta,
+            "initial": initial_balance,
+            "now": timezone.now(),
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(_UPSERT_DAY_SQL, params)
+            cursor.execute(_DROP_EMPTY_DAY_SQL, params)
+            cursor.execute(_SHIFT_LATER_DAYS_SQL, params)
+
+
+def apply_transaction_change(
+    tenant_id: TenantIdentifier,
+    before: Optional[BalanceEffect],
+    after: Optional[BalanceEffect],
+) -> None:
+    if before == after:
+        return
+    if before is not None:
+        apply_balance_delta(tenant_id, before.bank_account_id, before.balance_date, -before.amount)
+    if after is not None:
+        apply_balance_delta(tenant_id, after.bank_account_id, after.balance_date, after.amount)
+
+
+def balance_at(tenant_id: TenantIdentifier, bank_account_id: UUID, on_date: date) -> Decimal:
+    """
+    Saldo ao fim de ``on_date``: último snapshot até a data (já com o delta do dia) ou,
+    sem movimento anterior, o saldo inicial da conta. Uma consulta indexada.
+    """
+    last_snapshot = (
+        BankAccountDailyBalance.objects.unscoped()
+        .filter(bank_account_id=OuterRef("pk"), balance_date__lte=on_date)
+        .order_by("-balance_date")
+        .values("closing_balance")[:1]
+    )
+    return (
+        BankAccount.objects.scoped(tenant_id)
+        .filter(id=bank_account_id)
+        .annotate(balance=Coalesce(Subquery(last_snapshot), "initial_balance"))
+        .values_list("balance", flat=True)
+        .get()
+    )
+
+
+def _account_filter(column: str, account_ids: Optional[Sequence[UUID]]) -> tuple[str, list[str]]:
+    if not account_ids:
+        return "", []
+    return f"AND {column} = ANY(%s::uuid[])", [[str(account_id) for account_id in account_ids]]
+
+
+def rebuild_daily_balances(tenant_id: TenantIdentifier, account_ids: Optional[Sequence[UUID]] = None) -> int:
+    """
+    Recalcula os snapshots do tenant (ou das contas informadas) a partir das transações.
+    """
+    tx_filter, tx_params = _account_filter("bank_account_id", account_ids)
+    now = timezone.now()
+    with use_tenant(tenant_id), transaction.atomic():
+        snapshots = BankAccountDailyBalance.objects.filter(tenant_id=tenant_id)
+        if account_ids:
+            snapshots = snapshots.filter(bank_account_id__in=list(account_ids))
+        snapshots.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _REBUILD_SQL.format(deltas=_DAILY_DELTAS_SQL.format(account_filter=tx_filter)),
+                [now, now, str(tenant_id), *tx_params],
+            )
+            rows = cursor.rowcount
+    logger.info("banking_daily_balance_rebuild", tenant_id=str(tenant_id), rows=rows)
+    return rows
+
+
+def check_daily_balances(tenant_id: TenantIdentifier, account_ids: Optional[Sequence[UUID]] = None) -> List[BalanceDrift]:
+    """
+    Compara os snapshots com o recálculo a partir das transações; lista vazia = consistente.
+    """
+    tx_filter, tx_params = _account_filter("bank_account_id", account_ids)
+    sql = _CHECK_SQL.format(deltas=_DAILY_DELTAS_SQL.format(account_filter=tx_filter), account_filter=tx_filter)
+    with use_tenant(tenant_id), connection.cursor() as cursor:
+        cursor.execute(sql, [str(tenant_id), *tx_params, str(tenant_id), *tx_params])
+        return [BalanceDrift(*row) for row in cursor.fetchall()]
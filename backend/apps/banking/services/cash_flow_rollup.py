@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence
+
+import structlog
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backend.apps.banking.models import CashFlowDailyRollup
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+from backend.apps.tenancy.models import Tenant
+
+logger = structlog.get_logger(__name__)
+
+PROJECTION_DAYS = 180
+DEFAULT_REBUILD_WORKERS = 4
+
+# Origens da projeção: parcelas ainda não quitadas (saldo devedor no vencimento) e
+# transações não pagas fora do fluxo de parcelas (os recebimentos de parcela já estão
+# contados no saldo devedor). ``{installment_days}``/``{transaction_days}`` restringem
+# aos dias sendo recalculados; vazios, agregam o tenant inteiro.
+_SOURCES_SQL = """
+receivable AS (
+    SELECT due_date AS day,
+           SUM(GREATEST(amount_due - amount_paid, 0)) AS receivables,
+           COUNT(*) AS open_installments
+    FROM banking_installment
+    WHERE tenant_id = %(tenant)s AND status <> 'PAID' {installment_days}
+    GROUP BY due_date
+), planned AS (
+    SELECT transaction_date AS day,
+           COALESCE(SUM(amount) FILTER (WHERE type = 'INCOME'), 0) AS income,
+           COALESCE(SUM(amount) FILTER (WHERE type = 'EXPENSE'), 0) AS expense
+    FROM banking_financial_transaction
+    WHERE tenant_id = %(tenant)s AND NOT is_paid AND installment_id IS NULL {transaction_days}
+    GROUP BY transaction_date
+), combined AS (
+    SELECT COALESCE(receivable.day, planned.day) AS day,
+           COALESCE(receivable.receivables, 0) AS receivables,
+           COALESCE(receivable.open_installments, 0) AS open_installments,
+           COALESCE(planned.income, 0) AS income,
+           COALESCE(planned.expense, 0) AS expense
+    FROM receivable
+    FULL OUTER JOIN planned ON planned.day = receivable.day
+)
+"""
+
+_INSERT_SQL = """
+INSERT INTO banking_cash_flow_daily_rollup
+    (id, tenant_id, rollup_date, receivables, open_installments, expected_income, expected_expense, created_at, updated_at)
+SELECT gen_random_uuid(), %(tenant)s, day, receivables, open_installments, income, expense, %(now)s, %(now)s
+FROM combined
+ON CONFLICT (tenant_id, rollup_date) DO UPDATE
+SET receivables = EXCLUDED.receivables,
+    open_installments = EXCLUDED.open_installments,
+    expected_income = EXCLUDED.expected_income,
+    expected_expense = EXCLUDED.expected_expense,
+    updated_at = EXCLUDED.updated_at
+"""
+
+_REFRESH_SQL = (
+    "WITH "
+    + _SOURCES_SQL.format(
+        installment_days="AND due_date = ANY(%(days)s::date[])",
+        transaction_days="AND transaction_date = ANY(%(days)s::date[])",
+    )
+    + """, emptied AS (
+    DELETE FROM banking_cash_flow_daily_rollup
+    WHERE tenant_id = %(tenant)s
+      AND rollup_date = ANY(%(days)s::date[])
+      AND rollup_date NOT IN (SELECT day FROM combined)
+)"""
+    + _INSERT_SQL
+)
+
+# Trava de transação por (tenant, dia), em ordem de chave para não haver deadlock entre
+# quem recalcula conjuntos de dias diferentes. Quem chega depois espera o commit do
+# outro e recalcula já enxergando a contribuição dele (cada comando do READ COMMITTED
+# tira um snapshot novo). Colisão de hash só serializa dias a mais.
+_LOCK_DAYS_SQL = """
+SELECT pg_advisory_xact_lock(key)
+FROM (
+    SELECT DISTINCT hashtextextended(%(tenant)s || ':' || day::text, 0) AS key
+    FROM unnest(%(days)s::date[]) AS day
+) AS keys
+ORDER BY key
+"""
+
+_REBUILD_SQL = "WITH " + _SOURCES_SQL.format(installment_days="", transaction_days="") + _INSERT_SQL
+
+
+@dataclass(frozen=True, slots=True)
+class CashFlowDay:
+    day: date
+    receivables: Decimal
+    open_installments: int
+    expected_income: Decimal
+    expected_expense: Decimal
+
+    @property
+    def net(self) -> Decimal:
+        return self.receivables + self.expected_income - self.expected_expense
+
+
+def refresh_cash_flow_days(tenant_id: TenantIdentifier, days: Iterable[Optional[date]]) -> None:
+    """
+    Recalcula a partir das origens apenas os dias informados (um comando).
+
+    Chamado pelos sinais de ``Installment``/``FinancialTransaction`` e pelos fluxos em
+    lote que atualizam parcelas sem disparar sinais. Os dias ficam travados até o fim
+    da transação do chamador, então escritores concorrentes no mesmo dia recalculam
+    em série em vez de um sobrescrever a contribuição do outro.
+    """
+    pending = sorted({day for day in days if day is not None})
+    if not pending:
+        return
+    params = {"tenant": str(tenant_id), "days": pending, "now": timezone.now()}
+    with use_tenant(tenant_id), transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_LOCK_DAYS_SQL, params)
+        cursor.execute(_REFRESH_SQL, params)
+
+
+def rebuild_tenant_cash_flow(tenant_id: TenantIdentifier) -> int:
+    """
+    Descarta e recalcula todos os dias do tenant; retorna o número de dias gravados.
+    """
+    with use_tenant(tenant_id), transaction.atomic():
+        CashFlowDailyRollup.objects.filter(tenant_id=tenant_id).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(_REBUILD_SQL, {"tenant": str(tenant_id), "now": timezone.now()})
+            rows = cursor.rowcount
+    logger.info("banking_cash_flow_rebuild", tenant_id=str(tenant_id), days=rows)
+    return rows
+
+
+def _rebuild_in_worker(tenant_id: str) -> int:
+    try:
+        return rebuild_tenant_cash_flow(tenant_id)
+    finally:
+        connection.close()
+
+
+def rebuild_cash_flow_rollups(
+    tenant_ids: Optional[Sequence[str]] = None,
+    *,
+    workers: int = DEFAULT_REBUILD_WORKERS,
+) -> dict[str, int]:
+    """
+    Reconstrução completa em paralelo: cada tenant roda em uma thread com conexão própria.
+    """
+    if workers < 1:
+        raise ValueError("workers da reconstrução de fluxo de caixa deve ser positivo.")
+    tenants = Tenant.objects.exclude(status=Tenant.Status.DECOMMISSIONED).order_by("slug")
+    if tenant_ids:
+        tenants = tenants.filter(id__in=list(tenant_ids))
+    ids = [str(tenant_id) for tenant_id in tenants.values_list("id", flat=True)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cash-flow-rebuild") as pool:
+        return dict(zip(ids, pool.map(_rebuild_in_worker, ids)))
+
+
+def cash_flow_projection(
+    tenant_id: TenantIdentifier,
+    start: Optional[date] = None,
+    days: int = PROJECTION_DAYS,
+) -> List[CashFlowDay]:
+    """
+    Projeção diária de ``start`` (hoje por padrão) até ``days`` dias à frente.
+
+    Uma varredura de intervalo no índice único (tenant, rollup_date); dias sem
+    movimento voltam zerados para a série ficar contínua.
+    """
+    if days < 1:
+        raise ValueError("days da projeção de fluxo de caixa deve ser positivo.")
+    start = start or timezone.localdate()
+    rows = {
+        row[0]: row
+        for row in CashFlowDailyRollup.objects.scoped(tenant_id)
+        .filter(rollup_date__gte=start, rollup_date__lt=start + timedelta(days=days))
+        .order_by("rollup_date")
+        .values_list("rollup_date", "receivables", "open_installments", "expected_income", "expected_expense")
+    }
+    zero = Decimal("0.00")
+    projection: List[CashFlowDay] = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        projection.append(CashFlowDay(*row) if row else CashFlowDay(day, zero, 0, zero, zero))
+    return projection
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, List, Optional, Sequence
+
+from backend.apps.banking.services.financial_calculations import LoanInput, loan_input_key
+from backend.apps.banking.services.portfolio_quotes import PortfolioQuote, quote_portfolio
+from backend.apps.banking.services.schedule_cache import get_schedule_cache
+
+MAX_NEWTON_ITERATIONS = 25
+MAX_BISECTION_ITERATIONS = 200
+RATE_TOLERANCE = 1e-12
+_DAYS_PER_YEAR = 365.0
+_MIN_RATE = -0.9999
+_RATE_PLACES = Decimal("0.0001")
+
+
+@dataclass(frozen=True, slots=True)
+class CETSolution:
+    cet_annual_rate: Decimal
+    cet_monthly_rate: Decimal
+    iterations: int
+    method: str
+
+
+@dataclass(slots=True)
+class _CashFlow:
+    """
+    Fluxo do cliente: recebe ``principal`` em d0 e paga ``payment`` em cada prazo (anos desde d0).
+    """
+
+    principal: float
+    payment: float
+    year_fractions: Sequence[float]
+
+    def npv(self, rate: float) -> float:
+        log_growth = math.log1p(rate)
+        return self.payment * math.fsum(math.exp(-t * log_growth) for t in self.year_fractions) - self.principal
+
+    def npv_and_derivative(self, rate: float) -> tuple[float, float]:
+        log_growth = math.log1p(rate)
+        discounted = [math.exp(-t * log_growth) for t in self.year_fractions]
+        value = self.payment * math.fsum(discounted) - self.principal
+        slope = -self.payment * math.fsum(t * d for t, d in zip(self.year_fractions, discounted)) / (1.0 + rate)
+        return value, slope
+
+
+def _cash_flows(quote: PortfolioQuote, contract_dates: Sequence[date]) -> List[_CashFlow]:
+    flows: list[_CashFlow] = []
+    for index, contract_date in enumerate(contract_dates):
+        start, end = quote.schedule_offsets[index], quote.schedule_offsets[index + 1]
+        origin = contract_date.toordinal()
+        flows.append(
+            _CashFlow(
+                principal=quote.principal_cents[index] / 100.0,
+                payment=quote.payment_cents[index] / 100.0,
+                year_fractions=[(ordinal - origin) / _DAYS_PER_YEAR for ordinal in quote.due_date_ordinals[start:end]],
+            ),
+        )
+    return flows
+
+
+def _initial_guess(quote: PortfolioQuote, index: int) -> float:
+    return (1.0 + quote.monthly_rate_bp[index] / 10_000.0) ** 12 - 1.0 + 0.01
+
+
+def _newton(flow: _CashFlow, guess: float) -> tuple[float, int, bool]:
+    """
+    Newton–Raphson escalar com iterações limitadas; devolve ``converged=False`` quando
+    o passo diverge (taxa não finita ou abaixo de -100%) ou o limite se esgota.
+    """
+    rate = guess
+    for iteration in range(1, MAX_NEWTON_ITERATIONS + 1):
+        value, slope = flow.npv_and_derivative(rate)
+        candidate = rate - value / slope if slope else math.nan
+        if not math.isfinite(candidate) or candidate <= _MIN_RATE:
+            return rate, iteration, False
+        if abs(candidate - rate) <= RATE_TOLERANCE * max(1.0, abs(candidate)):
+            return candidate, iteration, True
+        rate = candidate
+    return rate, MAX_NEWTON_ITERATIONS, False
+
+
+def _bisection(flow: _CashFlow) -> tuple[float, int]:
+    """
+    Fallback robusto: o VPL é decrescente na taxa quando todas as parcelas são positivas.
+    """
+    low, high = _MIN_RATE, 1.0
+    expansions = 0
+    while flow.npv(high) > 0 and expansions < 64:
+        high = high * 2 + 1
+        expansions += 1
+
+    for iteration in range(1, MAX_BISECTION_ITERATIONS + 1):
+        middle = (low + high) / 2
+        if flow.npv(middle) > 0:
+            low = middle
+        else:
+            high = middle
+        if high - low <= RATE_TOLERANCE * max(1.0, abs(middle)):
+            return (low + high) / 2, iteration
+    return (low + high) / 2, MAX_BISECTION_ITERATIONS
+
+
+def _to_solution(annual_rate: float, iterations: int, method: str) -> CETSolution:
+    monthly_rate = math.expm1(math.log1p(annual_rate) / 12)
+    return CETSolution(
+        cet_annual_rate=Decimal(repr(annual_rate * 100)).quantize(_RATE_PLACES, rounding=ROUND_HALF_UP),
+        cet_monthly_rate=Decimal(repr(monthly_rate * 100)).quantize(_RATE_PLACES, rounding=ROUND_HALF_UP),
+        iterations=iterations,
+        method=method,
+    )
+
+
+def solve_cet_batch(requests: Iterable[LoanInput]) -> List[CETSolution]:
+    """
+    Resolve o CET (TIR anual, base 365 dias) do fluxo real do contrato para vários empréstimos.
+
+    O fluxo considera a liberação do principal na data do contrato e as parcelas com
+    IOF financiado. O lote está na cotação da carteira (uma passada para todos os
+    cronogramas) e no cache; a TIR em si é resolvida empréstimo a empréstimo, com
+    Newton–Raphson escalar e bisseção para quem não converge. Soluções já conhecidas
+    vêm do cache de cronogramas.
+    """
+    loans = list(requests)
+    cache = get_schedule_cache()
+    keys = [("cet", loan_input_key(loan)) for loan in loans]
+    solutions: list[Optional[CETSolution]] = [cache.get(key) for key in keys]
+    pending = [index for index, solution in enumerate(solutions) if solution is None]
+    for index, solution in zip(pending, _solve_uncached([loans[index] for index in pending])):
+        cache.put(keys[index], solution)
+        solutions[index] = solution
+    return solutions  # type: ignore[return-value]
+
+
+def _solve_uncached(loans: List[LoanInput]) -> List[CETSolution]:
+    quote = quote_portfolio(loans)
+    flows = _cash_flows(quote, [loan.contract_date for loan in loans])
+    solutions: list[CETSolution] = []
+    for index, flow in enumerate(flows):
+        rate, iterations, converged = _newton(flow, _initial_guess(quote, index))
+        if converged:
+            solutions.append(_to_solution(rate, iterations, "newton"))
+            continue
+        rate, bisection_iterations = _bisection(flow)
+        solutions.append(_to_solution(rate, iterations + bisection_iterations, "bisection"))
+    return solutions
+
+
+def solve_cet(request: LoanInput) -> CETSolution:
+    return solve_cet_batch([request])[0]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+import structlog
+from django.db import connection, transaction
+from django.db.models import DecimalField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from backend.apps.banking.models import CommissionLedgerEntry, Consultant
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+
+logger = structlog.get_logger(__name__)
+
+# Marca e soma os lançamentos pendentes e aplica um único UPDATE agrupado por consultor,
+# tudo no mesmo comando: não há janela entre "marcar como consolidado" e "somar ao saldo".
+_FOLD_SQL = """
+WITH folded AS (
+    UPDATE banking_commission_ledger
+    SET folded_at = %s
+    WHERE tenant_id = %s
+      AND folded_at IS NULL
+      AND occurred_at <= %s
+    RETURNING consultant_id, amount
+), totals AS (
+    SELECT consultant_id, SUM(amount) AS total, COUNT(*) AS entries
+    FROM folded
+    GROUP BY consultant_id
+)
+UPDATE banking_consultant AS consultant
+SET balance = consultant.balance + totals.total, updated_at = %s
+FROM totals
+WHERE consultant.id = totals.consultant_id
+RETURNING totals.entries
+"""
+_ZERO = Value(Decimal("0"), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+@dataclass(frozen=True, slots=True)
+class CommissionAccrual:
+    consultant_id: UUID
+    amount: Decimal
+    loan_id: Optional[UUID] = None
+    description: str = ""
+    occurred_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True, slots=True)
+class FoldResult:
+    tenant_id: str
+    consultants: int
+    entries: int
+
+
+def record_commissions(tenant_id: TenantIdentifier, accruals: Iterable[CommissionAccrual]) -> int:
+    """
+    Anexa lançamentos ao ledger (um INSERT em lote); o saldo só muda na consolidação.
+    """
+    now = timezone.now()
+    entries = [
+        CommissionLedgerEntry(
+            tenant_id=tenant_id,
+            consultant_id=accrual.consultant_id,
+            loan_id=accrual.loan_id,
+            amount=accrual.amount,
+            description=accrual.description,
+            occurred_at=accrual.occurred_at or now,
+        )
+        for accrual in accruals
+    ]
+    with use_tenant(tenant_id):
+        CommissionLedgerEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def fold_commission_ledger(tenant_id: TenantIdentifier, until: Optional[datetime] = None) -> FoldResult:
+    """
+    Consolida em ``Consultant.balance`` os lançamentos pendentes até ``until``.
+    """
+    now = timezone.now()
+    with use_tenant(tenant_id), transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_FOLD_SQL, [now, str(tenant_id), until or now, now])
+        rows = cursor.fetchall()
+    result = FoldResult(tenant_id=str(tenant_id), consultants=len(rows), entries=sum(row[0] for row in rows))
+    logger.info("banking_commission_fold", tenant_id=result.tenant_id, consultants=result.consultants, entries=result.entries)
+    return result
+
+
+def _ledger_sum(condition: Q) -> Subquery:
+    return Subquery(
+        CommissionLedgerEntry.objects.unscoped()
+        .filter(condition, consultant_id=OuterRef("pk"))
+        .order_by()
+        .values("consultant_id")
+        .annotate(total=Sum("amount"))
+        .values("total")[:1],
+    )
+
+
+def balances_as_of(
+    tenant_id: TenantIdentifier,
+    consultant_ids: Sequence[UUID],
+    at: Optional[datetime] = None,
+) -> dict[UUID, Decimal]:
+    """
+    Saldo de comissão em ``at``: saldo consolidado, mais a cauda ainda não consolidada
+    até ``at``, menos o que já foi consolidado mas ocorreu depois de ``at``.
+
+    Uma única consulta, então a leitura é consistente mesmo durante uma consolidação.
+    """
+    at = at or timezone.now()
+    rows = (
+        Consultant.objects.scoped(tenant_id)
+        .filter(id__in=list(consultant_ids))
+        .annotate(
+            pending=Coalesce(_ledger_sum(Q(folded_at__isnull=True, occurred_at__lte=at)), _ZERO),
+            ahead=Coalesce(_ledger_sum(Q(folded_at__isnull=False, occurred_at__gt=at)), _ZERO),
+        )
+        .values_list("id", "balance", "pending", "ahead")
+    )
+    return {consultant_id: balance + pending - ahead for consultant_id, balance, pending, ahead in rows}
+
+
+def balance_as_of(tenant_id: TenantIdentifier, consultant_id: UUID, at: Optional[datetime] = None) -> Decimal:
+    return balances_as_of(tenant_id, [consultant_id], at).get(consultant_id, Decimal("0"))
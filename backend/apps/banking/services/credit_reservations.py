@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import random
+from decimal import Decimal, ROUND_DOWN
+from typing import Dict, Optional
+from uuid import UUID
+
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from backend.apps.banking.models import CreditLimit, CreditLimitShard
+from backend.apps.tenancy.managers import TenantIdentifier
+
+_CENT = Decimal("0.01")
+
+
+def _validate_amount(amount: Decimal) -> Decimal:
+    amount = Decimal(amount)
+    if amount <= 0:
+        raise ValueError("O valor da reserva de limite deve ser positivo.")
+    return amount
+
+
+class CreditLimitReservations:
+    """
+    Reserva e libera limite de crédito com UPDATE condicional, sem leitura prévia.
+
+    O modo padrão atualiza a própria linha de ``CreditLimit`` guardada por
+    ``used_amount + valor <= current_limit``. Contas muito disputadas podem ativar
+    subcontadores (``CreditLimitShard``): a folga do limite é repartida entre os
+    shards e consumida do pai, então o caminho simples continua correto (sem folga)
+    enquanto os shards estiverem ativos.
+
+    Só limites ``ACTIVE`` aceitam reservas, inclusive nos shards. Valores reservados
+    antes de ativar os shards continuam no pai; ``release_sharded`` os libera de lá
+    quando os shards não cobrem o valor.
+
+    A quantidade de shards fica em cache por instância; como outro processo pode
+    ativar ou recolher os shards, uma tentativa que falha relê a contagem e, se ela
+    mudou, repete uma vez com o valor novo.
+    """
+
+    def __init__(self, tenant_id: TenantIdentifier) -> None:
+        self.tenant_id = tenant_id
+        self._shard_counts: Dict[UUID, int] = {}
+
+    def _limits(self):
+        return CreditLimit.objects.scoped(self.tenant_id)
+
+    def _shards(self):
+        return CreditLimitShard.objects.scoped(self.tenant_id)
+
+    def reserve(self, credit_limit_id: UUID, amount: Decimal) -> bool:
+        amount = _validate_amount(amount)
+        updated = self._limits().filter(
+            id=credit_limit_id,
+            status=CreditLimit.Status.ACTIVE,
+            used_amount__lte=F("current_limit") - amount,
+        ).update(used_amount=F("used_amount") + amount, updated_at=timezone.now())
+        return updated == 1
+
+    def release(self, credit_limit_id: UUID, amount: Decimal) -> bool:
+        amount = _validate_amount(amount)
+        updated = self._limits().filter(id=credit_limit_id, used_amount__gte=amount).update(
+            used_amount=F("used_amount") - amount,
+            updated_at=timezone.now(),
+        )
+        return updated == 1
+
+    def enable_sharding(self, credit_limit_id: UUID, shards: int) -> int:
+        """
+        Reparte a folga atual em ``shards`` subcontadores; idempotente se já houver shards.
+        """
+        if shards < 1:
+            raise ValueError("A quantidade de shards deve ser positiva.")
+        with transaction.atomic():
+            parent = self._limits().select_for_update().get(id=credit_limit_id)
+            existing = self._shards().filter(credit_limit_id=credit_limit_id).count()
+            if existing:
+                self._shard_counts[credit_limit_id] = existing
+                return existing
+
+            headroom = max(parent.current_limit - parent.used_amount, Decimal("0"))
+            # Cada shard precisa de ao menos um centavo de capacidade.
+            shards = min(shards, int(headroom / _CENT))
+            if shards == 0:
+                raise ValueError("O limite não tem folga para repartir em shards.")
+            share = (headroom / shards).quantize(_CENT, rounding=ROUND_DOWN)
+            capacities = [share] * shards
+            capacities[0] += headroom - share * shards
+            self._shards().bulk_create(
+                [
+                    CreditLimitShard(
+                        tenant_id=parent.tenant_id,
+                        credit_limit_id=parent.id,
+                        shard_index=index,
+                        capacity=capacity,
+                    )
+                    for index, capacity in enumerate(capacities)
+                ],
+            )
+            parent.used_amount += headroom
+            parent.save(update_fields=["used_amount", "updated_at"])
+        self._shard_counts[credit_limit_id] = shards
+        return shards
+
+    def collapse_shards(self, credit_limit_id: UUID) -> None:
+        """
+        Devolve ao pai a folga não usada dos shards e remove os subcontadores.
+        """
+        with transaction.atomic():
+            parent = self._limits().select_for_update().get(id=credit_limit_id)
+            shards = list(self._shards().select_for_update().filter(credit_limit_id=credit_limit_id).order_by("shard_index"))
+            unused = sum((shard.capacity - shard.used_amount for shard in shards), Decimal("0"))
+            parent.used_amount -= unused
+            parent.save(update_fields=["used_amount", "updated_at"])
+            self._shards().filter(id__in=[shard.id for shard in shards]).delete()
+        self._shard_counts.pop(credit_limit_id, None)
+
+    def _shard_count(self, credit_limit_id: UUID) -> int:
+        if credit_limit_id not in self._shard_counts:
+            return self._reload_shard_count(credit_limit_id)
+        return self._shard_counts[credit_limit_id]
+
+    def _reload_shard_count(self, credit_limit_id: UUID) -> int:
+        self._shard_counts[credit_limit_id] = self._shards().filter(credit_limit_id=credit_limit_id).count()
+        return self._shard_counts[credit_limit_id]
+
+    def reserve_sharded(self, credit_limit_id: UUID, amount: Decimal, hint: Optional[int] = None) -> bool:
+        """
+        Tenta um shard por vez a partir de ``hint`` (ou aleatório); se nenhum comporta o
+        valor sozinho, reparte entre shards sob lock ordenado.
+        """
+        return self._apply_sharded(credit_limit_id, _validate_amount(amount), hint, reserve=True)
+
+    def release_sharded(self, credit_limit_id: UUID, amount: Decimal, hint: Optional[int] = None) -> bool:
+        return self._apply_sharded(credit_limit_id, _validate_amount(amount), hint, reserve=False)
+
+    def _apply_sharded(self, credit_limit_id: UUID, amount: Decimal, hint: Optional[int], *, reserve: bool) -> bool:
+        count = self._shard_count(credit_limit_id)
+        if self._apply_with_count(credit_limit_id, amount, count, hint, reserve=reserve):
+            return True
+        fresh = self._reload_shard_count(credit_limit_id)
+        if fresh == count:
+            return False
+        return self._apply_with_count(credit_limit_id, amount, fresh, hint, reserve=reserve)
+
+    def _apply_with_count(self, credit_limit_id: UUID, amount: Decimal, count: int, hint: Optional[int], *, reserve: bool) -> bool:
+        if count == 0:
+            return self.reserve(credit_limit_id, amount) if reserve else self.release(credit_limit_id, amount)
+        if reserve:
+            guard = {"used_amount__lte": F("capacity") - amount, "credit_limit__status": CreditLimit.Status.ACTIVE}
+            delta = F("used_amount") + amount
+        else:
+            guard = {"used_amount__gte": amount}
+            delta = F("used_amount") - amount
+        start = random.randrange(count) if hint is None else hint % count
+        for offset in range(count):
+            updated = self._shards().filter(
+                credit_limit_id=credit_limit_id,
+                shard_index=(start + offset) % count,
+                **guard,
+            ).update(used_amount=delta, updated_at=timezone.now())
+            if updated:
+                return True
+        if self._spread(credit_limit_id, amount, reserve=reserve):
+            return True
+        return not reserve and self._release_from_parent(credit_limit_id, amount)
+
+    def _spread(self, credit_limit_id: UUID, amount: Decimal, *, reserve: bool) -> bool:
+        with transaction.atomic():
+            shards = self._shards().select_for_update().filter(credit_limit_id=credit_limit_id)
+            if reserve:
+                shards = shards.filter(credit_limit__status=CreditLimit.Status.ACTIVE)
+            shards = list(shards.order_by("shard_index"))
+            available = [shard.capacity - shard.used_amount if reserve else shard.used_amount for shard in shards]
+            if not shards or sum(available, Decimal("0")) < amount:
+                return False
+            remaining = amount
+            now = timezone.now()
+            for shard, room in zip(shards, available):
+                step = min(room, remaining)
+                shard.used_amount += step if reserve else -step
+                shard.updated_at = now
+                remaining -= step
+            self._shards().bulk_update(shards, ["used_amount", "updated_at"])
+        return True
+
+    def _release_from_parent(self, credit_limit_id: UUID, amount: Decimal) -> bool:
+        """
+        Libera do pai o que foi reservado antes dos shards, sem tocar na folga repassada a eles.
+        """
+        handed_to_shards = (
+            self._shards()
+            .filter(credit_limit_id=OuterRef("id"))
+            .values("credit_limit_id")
+            .annotate(total=Sum("capacity"))
+            .values("total")
+        )
+        updated = self._limits().filter(
+            id=credit_limit_id,
+            used_amount__gte=Subquery(handed_to_shards, output_field=DecimalField()) + amount,
+        ).update(used_amount=F("used_amount") - amount, updated_at=timezone.now())
+        return updated == 1
+
+    def usage(self, credit_limit_id: UUID) -> Decimal:
+        """
+        Uso efetivo do limite, descontando a folga ainda parada nos shards.
+        """
+        parent_used = self._limits().values_list("used_amount", flat=True).get(id=credit_limit_id)
+        totals = self._shards().filter(credit_limit_id=credit_limit_id).aggregate(
+            capacity=Sum("capacity"),
+            used=Sum("used_amount"),
+        )
+        unused = (totals["capacity"] or Decimal("0")) - (totals["used"] or Decimal("0"))
+        return parent_used - unused
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import DateTimeField, F, FilteredRelation, IntegerField, OuterRef, Prefetch
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import JSONObject
+
+from backend.apps.banking.models import Address, BankAccount, Customer, Installment, Loan
+from backend.apps.foundation.api.views import _compute_etag_for_payload, _etag_matches
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+NEXT_INSTALLMENTS_PER_LOAN = 3
+# Orçamento fixo de ``load_customer_360``, contando o ``set_config`` do tenant:
+# GUC, cliente (com endereços e carimbo do ETag), contas com limite, empréstimos e
+# próximas parcelas. Não cresce com a quantidade de filhos.
+CUSTOMER_360_QUERY_BUDGET = 5
+
+# Carimbo do ETag: maior ``updated_at`` entre o cliente e as cinco tabelas exibidas,
+# mais a contagem de filhos diretos para que exclusões também mudem o ETag.
+_STAMP_SQL = """
+GREATEST(
+    banking_customer.updated_at,
+    (SELECT MAX(updated_at) FROM banking_address WHERE customer_id = banking_customer.id),
+    (SELECT MAX(updated_at) FROM banking_bank_account WHERE customer_id = banking_customer.id),
+    (SELECT MAX(credit_limit.updated_at)
+       FROM banking_credit_limit AS credit_limit
+       JOIN banking_bank_account AS account ON account.id = credit_limit.bank_account_id
+      WHERE account.customer_id = banking_customer.id),
+    (SELECT MAX(updated_at) FROM banking_loan WHERE customer_id = banking_customer.id),
+    (SELECT MAX(installment.updated_at)
+       FROM banking_installment AS installment
+       JOIN banking_loan AS loan ON loan.id = installment.loan_id
+      WHERE loan.customer_id = banking_customer.id)
+)
+"""
+_CHILD_ROWS_SQL = """
+(SELECT COUNT(*) FROM banking_address WHERE customer_id = banking_customer.id)
++ (SELECT COUNT(*) FROM banking_bank_account WHERE customer_id = banking_customer.id)
++ (SELECT COUNT(*) FROM banking_loan WHERE customer_id = banking_customer.id)
+"""
+
+_ADDRESS_FIELDS = ("id", "zip_code", "street", "number", "complement", "neighborhood", "city", "state", "is_primary")
+_ACCOUNT_FIELDS = ("id", "name", "agency", "account_number", "type", "status")
+_CREDIT_LIMIT_FIELDS = ("current_limit", "used_amount", "status", "effective_from", "effective_through")
+_LOAN_FIELDS = (
+    "id",
+    "customer_id",
+    "principal_amount",
+    "interest_rate",
+    "number_of_installments",
+    "contract_date",
+    "first_installment_date",
+    "status",
+    "iof_amount",
+    "cet_annual_rate",
+    "cet_monthly_rate",
+)
+
+
+@dataclass(slots=True)
+class Customer360:
+    customer: Customer
+    addresses: List[Dict[str, Any]]
+    bank_accounts: List[Dict[str, Any]]
+    loans: List[Loan]
+    etag: str
+    not_modified: bool = False
+
+
+def _compute_etag(customer: Customer) -> str:
+    return _compute_etag_for_payload(
+        {
+            "id": str(customer.id),
+            "stamp": customer.stamp.isoformat(),
+            "child_rows": customer.child_rows,
+            "next_installments": NEXT_INSTALLMENTS_PER_LOAN,
+        },
+    )
+
+
+def _customer_row(tenant: Tenant, customer_id: UUID) -> Optional[Customer]:
+    # ``unscoped`` + filtro explícito: o GUC já vem de ``use_tenant`` e o manager
+    # escopado emitiria outro ``set_config`` a cada queryset montado.
+    addresses = (
+        Address.objects.unscoped()
+        .filter(customer_id=OuterRef("pk"))
+        .order_by("-is_primary", "created_at")
+        .values(json=JSONObject(**{field: field for field in _ADDRESS_FIELDS}))
+    )
+    return (
+        Customer.objects.unscoped()
+        .filter(tenant_id=tenant.id, id=customer_id)
+        .annotate(
+            address_rows=ArraySubquery(addresses),
+            stamp=RawSQL(_STAMP_SQL, (), output_field=DateTimeField()),
+            child_rows=RawSQL(_CHILD_ROWS_SQL, (), output_field=IntegerField()),
+        )
+        .first()
+    )
+
+
+def _bank_accounts(tenant: Tenant, customer_id: UUID) -> List[Dict[str, Any]]:
+    # ``CreditLimit`` é único por conta no tenant: o LEFT JOIN devolve uma linha por conta.
+    rows = (
+        BankAccount.objects.unscoped()
+        .filter(tenant_id=tenant.id, customer_id=customer_id)
+        .annotate(account_limit=FilteredRelation("credit_limits"))
+        .order_by("created_at", "id")
+        .values(*_ACCOUNT_FIELDS, **{f"limit_{field}": F(f"account_limit__{field}") for field in _CREDIT_LIMIT_FIELDS})
+    )
+    accounts = []
+    for row in rows:
+        limit = {field: row.pop(f"limit_{field}") for field in _CREDIT_LIMIT_FIELDS}
+        row["credit_limit"] = limit if limit["current_limit"] is not None else None
+        accounts.append(row)
+    return accounts
+
+
+def _loans(tenant: Tenant, customer_id: UUID) -> List[Loan]:
+    next_installments = (
+        Installment.objects.unscoped()
+        .exclude(status=Installment.Status.PAID)
+        .order_by("due_date", "installment_number")[:NEXT_INSTALLMENTS_PER_LOAN]
+    )
+    return list(
+        Loan.objects.unscoped()
+        .filter(tenant_id=tenant.id, customer_id=customer_id)
+        .only(*_LOAN_FIELDS)
+        .order_by("-contract_date", "id")
+        .prefetch_related(Prefetch("installments", queryset=next_installments, to_attr="next_installments")),
+    )
+
+
+def load_customer_360(tenant: Tenant, customer_id: UUID, *, if_none_match: Optional[str] = None) -> Optional[Customer360]:
+    """
+    Carrega cliente, endereços, contas com limite de crédito, empréstimos e as
+    próximas parcelas em aberto de cada empréstimo em ``CUSTOMER_360_QUERY_BUDGET``
+    consultas, independentemente da quantidade de filhos.
+
+    O ETag sai da primeira consulta; quando ``if_none_match`` (o cabeçalho cru, com
+    lista, ``*`` ou ``W/``) casa com ele, as demais não são executadas e o retorno vem
+    com ``not_modified`` e listas vazias.
+    """
+    with use_tenant(tenant.id):
+        customer = _customer_row(tenant, customer_id)
+        if customer is None:
+            return None
+        etag = _compute_etag(customer)
+        if _etag_matches(if_none_match, etag):
+            return Customer360(customer=customer, addresses=[], bank_accounts=[], loans=[], etag=etag, not_modified=True)
+        return Customer360(
+            customer=customer,
+            addresses=list(customer.address_rows),
+            bank_accounts=_bank_accounts(tenant, customer_id),
+            loans=_loans(tenant, customer_id),
+            etag=etag,
+        )
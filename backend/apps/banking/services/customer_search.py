@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from django.db.models import BooleanField, F, QuerySet
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Collate
+
+from backend.apps.banking.metrics import record_customer_search
+from backend.apps.banking.models import Customer
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+MIN_NAME_TERM_LENGTH = 3
+# Pontuação de CPF/CNPJ digitado pelo operador. Documentos mascarados pelo Vault
+# (hex) não têm nenhum desses caracteres e chegam intactos à comparação exata.
+_DOCUMENT_PUNCTUATION = re.compile(r"[\s./-]")
+
+# Comparação de linha ``(chave, id) > (%s, %s)``: o Postgres a usa como condição de
+# índice, então cada página começa direto no ponto do cursor em vez de varrer e
+# descartar as anteriores.
+_KEYSET_SQL = {
+    "name": "(banking_customer.name, banking_customer.id) > (%s, %s)",
+    "document": '(banking_customer.document_number COLLATE "C", banking_customer.id) > (%s, %s)',
+}
+# Documento em collation "C", a mesma expressão de ``banking_cust_doc_prefix_idx``: o
+# prefixo vira faixa no índice e a ordem do keyset sai dele sem sort.
+_SORT_FIELDS = {"name": "name", "document": "document_c"}
+
+
+class CustomerSearchError(ValueError):
+    """Parâmetros de busca inválidos (termo curto, cursor corrompido, página fora do limite)."""
+
+
+@dataclass(frozen=True, slots=True)
+class CustomerSearchHit:
+    id: UUID
+    name: str
+    document_number: str
+    status: str
+
+
+@dataclass(frozen=True, slots=True)
+class CustomerSearchPage:
+    results: List[CustomerSearchHit]
+    next_cursor: Optional[str]
+    mode: str
+
+
+def normalize_document(value: str) -> str:
+    return _DOCUMENT_PUNCTUATION.sub("", value)
+
+
+def encode_cursor(mode: str, sort_value: str, customer_id: UUID) -> str:
+    payload = json.dumps([mode, sort_value, str(customer_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, mode: str) -> Tuple[str, UUID]:
+    try:
+        cursor_mode, sort_value, customer_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        parsed_id = UUID(customer_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise CustomerSearchError("Cursor de busca inválido.") from exc
+    if cursor_mode != mode or not isinstance(sort_value, str):
+        raise CustomerSearchError("Cursor de busca não corresponde aos filtros informados.")
+    return sort_value, parsed_id
+
+
+def _validated_mode(name: str, document: str, status: Optional[str], limit: int) -> str:
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise CustomerSearchError(f"limit deve estar entre 1 e {MAX_PAGE_SIZE}.")
+    if status and status not in Customer.Status.values:
+        raise CustomerSearchError(f"Status de cliente desconhecido: {status}.")
+    if document:
+        return "document"
+    if len(name) < MIN_NAME_TERM_LENGTH:
+        raise CustomerSearchError(f"Informe ao menos {MIN_NAME_TERM_LENGTH} caracteres do nome ou um prefixo de documento.")
+    return "name"
+
+
+def _search_queryset(tenant: Tenant, mode: str, name: str, document: str, status: Optional[str], cursor: Optional[str]) -> QuerySet:
+    queryset = Customer.objects.scoped(tenant.id).annotate(document_c=Collate(F("document_number"), "C"))
+    if document:
+        queryset = queryset.filter(document_c__startswith=document)
+    if name:
+        queryset = queryset.filter(name__icontains=name)
+    if status:
+        queryset = queryset.filter(status=status)
+    if cursor:
+        queryset = queryset.filter(RawSQL(_KEYSET_SQL[mode], decode_cursor(cursor, mode), output_field=BooleanField()))
+    return queryset.order_by(_SORT_FIELDS[mode], "id")
+
+
+def search_customers(
+    tenant: Tenant,
+    *,
+    name: str = "",
+    document: str = "",
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> CustomerSearchPage:
+    """
+    Busca clientes do tenant por trecho do nome (``icontains``, acelerado pelo índice
+    trigram sobre ``UPPER(name)``) e/ou prefixo do documento (btree em collation "C"). O prefixo
+    inclui a igualdade, então um documento completo, mascarado ou não, casa exatamente.
+
+    Com documento, a ordem é (documento, id); só com nome, (nome, id). ``next_cursor``
+    retoma a página seguinte pelo keyset.
+    """
+    name = (name or "").strip()
+    document = normalize_document(document or "")
+    mode = _validated_mode(name, document, status, limit)
+    queryset = _search_queryset(tenant, mode, name, document, status, cursor)
+
+    started = time.perf_counter()
+    with use_tenant(tenant.id):
+        rows = list(queryset.values_list("id", "name", "document_number", "status")[: limit + 1])
+    record_customer_search(tenant.slug, mode, time.perf_counter() - started)
+
+    hits = [CustomerSearchHit(*row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = hits[-1]
+        next_cursor = encode_cursor(mode, last.name if mode == "name" else last.document_number, last.id)
+    return CustomerSearchPage(results=hits, next_cursor=next_cursor, mode=mode)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+import structlog
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backend.apps.banking.metrics import record_delinquency_aging
+from backend.apps.banking.models import Customer
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_DELINQUENCY_CHUNK_SIZE = 2000
+DEFAULT_DELINQUENCY_THRESHOLD_DAYS = 30
+
+# (rótulo, menor atraso, maior atraso) em dias; ``None`` deixa a faixa aberta.
+AGING_BUCKETS: Sequence[tuple[str, int, Optional[int]]] = (
+    ("0-30", 1, 30),
+    ("31-60", 31, 60),
+    ("61-90", 61, 90),
+    ("90+", 91, None),
+)
+
+# Só clientes ACTIVE/DELINQUENT mudam de status; BLOCKED e CANCELED são decisões manuais.
+_RECLASSIFIABLE = (Customer.Status.ACTIVE, Customer.Status.DELINQUENT)
+
+
+def _bucket_columns() -> str:
+    columns = []
+    for label, low, high in AGING_BUCKETS:
+        condition = f"overdue.days_past_due >= {low}" + (f" AND overdue.days_past_due <= {high}" if high else "")
+        columns.append(
+            f"COUNT(overdue.id) FILTER (WHERE {condition}) AS \"count_{label}\", "
+            f"COALESCE(SUM(overdue.open_amount) FILTER (WHERE {condition}), 0) AS \"amount_{label}\"",
+        )
+    return ",\n       ".join(columns)
+
+
+# Um chunk de clientes em ordem de id (keyset) com o maior atraso e a contagem por faixa
+# das parcelas vencidas, tudo numa consulta agrupada.
+_CHUNK_SQL = f"""
+SELECT customer.id,
+       customer.status,
+       COALESCE(MAX(overdue.days_past_due), 0) AS max_days_past_due,
+       {_bucket_columns()}
+FROM banking_customer AS customer
+LEFT JOIN LATERAL (
+    SELECT installment.id,
+           %(run_date)s::date - installment.due_date AS days_past_due,
+           GREATEST(installment.amount_due - installment.amount_paid, 0) AS open_amount
+    FROM banking_loan AS loan
+    JOIN banking_installment AS installment ON installment.loan_id = loan.id
+    WHERE loan.customer_id = customer.id
+      AND installment.status <> 'PAID'
+      AND installment.due_date < %(run_date)s::date
+) AS overdue ON TRUE
+WHERE customer.tenant_id = %(tenant)s
+  AND customer.id > %(after)s::uuid
+GROUP BY customer.id
+ORDER BY customer.id
+LIMIT %(limit)s
+"""
+_START_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@dataclass(slots=True)
+class AgingBucket:
+    installments: int = 0
+    amount: Decimal = Decimal("0.00")
+
+
+@dataclass(slots=True)
+class DelinquencyResult:
+    tenant_id: str
+    run_date: date
+    customers_scanned: int = 0
+    marked_delinquent: int = 0
+    restored_active: int = 0
+    delinquent_customers: int = 0
+    chunks: int = 0
+    buckets: dict[str, AgingBucket] = field(default_factory=lambda: {label: AgingBucket() for label, _, _ in AGING_BUCKETS})
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "tenant_id": self.tenant_id,
+            "run_date": self.run_date.isoformat(),
+            "customers_scanned": self.customers_scanned,
+            "marked_delinquent": self.marked_delinquent,
+            "restored_active": self.restored_active,
+            "delinquent_customers": self.delinquent_customers,
+            "chunks": self.chunks,
+            "aging": {
+                label: {"installments": bucket.installments, "amount": str(bucket.amount)}
+                for label, bucket in self.buckets.items()
+            },
+        }
+
+
+class DelinquencyClassifier:
+    """
+    Classifica clientes como DELINQUENT pelo maior atraso entre as parcelas vencidas.
+
+    Cada chunk de clientes é lido em uma consulta agrupada e as mudanças de status são
+    gravadas com um ``bulk_update``. A mesma varredura acumula as faixas de aging
+    publicadas como gauges do Prometheus.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_DELINQUENCY_CHUNK_SIZE,
+        threshold_days: int = DEFAULT_DELINQUENCY_THRESHOLD_DAYS,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size da classificação de inadimplência deve ser positivo.")
+        if threshold_days < 0:
+            raise ValueError("threshold_days da classificação de inadimplência não pode ser negativo.")
+        self.chunk_size = chunk_size
+        self.threshold_days = threshold_days
+
+    def classify(self, tenant: Tenant, run_date: Optional[date] = None) -> DelinquencyResult:
+        result = DelinquencyResult(tenant_id=str(tenant.id), run_date=run_date or timezone.localdate())
+        after = _START_ID
+        with use_tenant(tenant.id):
+            while True:
+                rows = self._fetch_chunk(tenant, result.run_date, after)
+                if not rows:
+                    break
+                self._apply_chunk(rows, result)
+                after = str(rows[-1][0])
+                if len(rows) < self.chunk_size:
+                    break
+
+        record_delinquency_aging(
+            tenant.slug,
+            {label: (bucket.installments, bucket.amount) for label, bucket in result.buckets.items()},
+            result.delinquent_customers,
+        )
+        logger.info("banking_delinquency_classification", tenant_slug=tenant.slug, **result.as_dict())
+        return result
+
+    def _fetch_chunk(self, tenant: Tenant, run_date: date, after: str) -> List[tuple]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _CHUNK_SQL,
+                {"tenant": str(tenant.id), "run_date": run_date, "after": after, "limit": self.chunk_size},
+            )
+            return cursor.fetchall()
+
+    def _target_status(self, current: str, max_days_past_due: int) -> str:
+        if current not in _RECLASSIFIABLE:
+            return current
+        if max_days_past_due > self.threshold_days:
+            return Customer.Status.DELINQUENT
+        return Customer.Status.ACTIVE
+
+    def _apply_chunk(self, rows: Sequence[tuple], result: DelinquencyResult) -> None:
+        now = timezone.now()
+        changed: List[Customer] = []
+        for customer_id, current, max_days_past_due, *aging in rows:
+            for index, (label, _, _) in enumerate(AGING_BUCKETS):
+                bucket = result.buckets[label]
+                bucket.installments += aging[2 * index]
+                bucket.amount += aging[2 * index + 1]
+            target = self._target_status(current, max_days_past_due)
+            result.delinquent_customers += int(target == Customer.Status.DELINQUENT)
+            if target != current:
+                changed.append(Customer(id=customer_id, status=target, updated_at=now))
+                result.marked_delinquent += int(target == Customer.Status.DELINQUENT)
+                result.restored_active += int(target == Customer.Status.ACTIVE)
+
+        if changed:
+            with transaction.atomic():
+                Customer.objects.bulk_update(changed, ["status", "updated_at"])
+        result.customers_scanned += len(rows)
+        result.chunks += 1
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import calendar
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
 from typing import List
 
+from backend.apps.banking.services.month_calendar import calendar_for_schedule, get_month_calendar
+from backend.apps.banking.services.schedule_cache import get_schedule_cache
+
 
 @dataclass(slots=True)
 class LoanInput:
@@ -16,7 +18,7 @@ class LoanInput:
     first_installment_date: date
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class InstallmentQuote:
     number: int
     due_date: date
@@ -31,16 +33,24 @@ class CETBreakdown:
     installments: List[InstallmentQuote]
 
 
+def loan_input_key(request: LoanInput) -> tuple:
+    return (
+        request.principal_amount,
+        request.annual_rate_pct,
+        request.number_of_installments,
+        request.contract_date,
+        request.first_installment_date,
+    )
+
+
 def _monthly_rate_pct(request: LoanInput) -> Decimal:
     return (request.annual_rate_pct / Decimal("12")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
 
 def _add_months(start: date, offset: int) -> date:
-    month = start.month - 1 + offset
-    year = start.year + month // 12
-    month = month % 12 + 1
-    day = min(start.day, calendar.monthrange(year, month)[1])
-    return date(year, month, day)
+    target_year = (start.year * 12 + start.month - 1 + offset) // 12
+    month_calendar = get_month_calendar(min(start.year, target_year), max(start.year, target_year))
+    return month_calendar.add_months(start, offset)
 
 
 def calculate_iof(request: LoanInput) -> Decimal:
@@ -54,6 +64,12 @@ def calculate_iof(request: LoanInput) -> Decimal:
 
 
 def generate_installments(request: LoanInput) -> List[InstallmentQuote]:
+    if request.number_of_installments < 1:
+        raise ValueError("number_of_installments deve ser pelo menos 1.")
+    return list(_cached_breakdown(request).installments)
+
+
+def _compute_installments(request: LoanInput) -> List[InstallmentQuote]:
     if request.number_of_installments < 1:
         raise ValueError("number_of_installments deve ser pelo menos 1.")
 
@@ -68,20 +84,33 @@ def generate_installments(request: LoanInput) -> List[InstallmentQuote]:
         denominator = Decimal(1) - (Decimal(1) + rate_fraction) ** Decimal(-request.number_of_installments)
         payment = (total_amount * rate_fraction / denominator).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
-    installments: list[InstallmentQuote] = []
-    for idx in range(request.number_of_installments):
-        due_date = _add_months(request.first_installment_date, idx)
-        installments.append(InstallmentQuote(number=idx + 1, due_date=due_date, amount=payment))
-    return installments
+    month_calendar = calendar_for_schedule(request.first_installment_date, request.number_of_installments)
+    ordinals = month_calendar.schedule_ordinals(request.first_installment_date, request.number_of_installments)
+    return [
+        InstallmentQuote(number=number, due_date=date.fromordinal(ordinal), amount=payment)
+        for number, ordinal in enumerate(ordinals, start=1)
+    ]
 
 
 def calculate_cet(request: LoanInput) -> CETBreakdown:
+    breakdown = _cached_breakdown(request)
+    return replace(breakdown, installments=list(breakdown.installments))
+
+
+def _cached_breakdown(request: LoanInput) -> CETBreakdown:
+    return get_schedule_cache().get_or_compute(
+        ("breakdown", loan_input_key(request)),
+        lambda: _compute_cet(request),
+    )
+
+
+def _compute_cet(request: LoanInput) -> CETBreakdown:
     monthly_rate_pct = _monthly_rate_pct(request)
     rate_fraction = (monthly_rate_pct / Decimal("100")).quantize(Decimal("0.0001"))
     annual_rate = (((Decimal(1) + rate_fraction) ** 12) - Decimal(1)) * Decimal("100")
 
     iof_amount = calculate_iof(request)
-    installments = generate_installments(request)
+    installments = _compute_installments(request)
 
     return CETBreakdown(
         cet_annual_rate=annual_rate.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
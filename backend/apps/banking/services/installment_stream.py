@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Hashable, Iterable, Iterator, NamedTuple, Tuple
+
+from backend.apps.banking.services.financial_calculations import LoanInput
+from backend.apps.banking.services.month_calendar import calendar_for_schedule
+from backend.apps.banking.services.portfolio_quotes import quote_loan_cents
+
+
+class InstallmentRow(NamedTuple):
+    """
+    Linha pronta para inserção em massa (``executemany``/``COPY``) de uma parcela.
+    """
+
+    loan_ref: Hashable
+    installment_number: int
+    due_date: date
+    amount_due: Decimal
+
+
+def iter_installments(loans: Iterable[Tuple[Hashable, LoanInput]]) -> Iterator[InstallmentRow]:
+    """
+    Gera as parcelas de cada ``(loan_ref, LoanInput)`` sob demanda, sem materializar listas.
+
+    Valores batem centavo a centavo com ``generate_installments``; os vencimentos vêm da
+    tabela de fim de mês compartilhada, ampliada apenas quando um prazo sai da faixa.
+    """
+    for loan_ref, request in loans:
+        _, _, _, payment = quote_loan_cents(request)
+        amount = Decimal(payment).scaleb(-2)
+        first_installment_date = request.first_installment_date
+        installments = request.number_of_installments
+        month_calendar = calendar_for_schedule(first_installment_date, installments)
+        base_index = first_installment_date.year * 12 + first_installment_date.month - 1
+        day = first_installment_date.day
+        for offset in range(installments):
+            yield InstallmentRow(
+                loan_ref,
+                offset + 1,
+                date.fromordinal(month_calendar.due_ordinal(base_index + offset, day)),
+                amount,
+            )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+import structlog
+from django.db import connection
+from django.utils import timezone
+
+from backend.apps.banking.metrics import record_interest_accrual
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_ACCRUAL_CHUNK_SIZE = 5000
+DEFAULT_ACCRUAL_WORKERS = 4
+
+# Um chunk de empréstimos IN_PROGRESS em ordem de id (keyset) calculado de uma vez no
+# banco. Saldo devedor pela tabela Price após ``paid`` parcelas quitadas, partindo do
+# valor financiado (principal + IOF), que é o que o cronograma amortiza; taxa
+# diária equivalente à mensal em mês comercial de 30 dias. ON CONFLICT torna a
+# reexecução da mesma data inofensiva.
+_ACCRUAL_CHUNK_SQL = """
+WITH chunk AS (
+    SELECT id, principal_amount + iof_amount AS financed, interest_rate / 100 AS rate
+    FROM banking_loan
+    WHERE tenant_id = %(tenant)s
+      AND status = 'IN_PROGRESS'
+      AND contract_date <= %(day)s
+      AND id > %(after)s::uuid
+    ORDER BY id
+    LIMIT %(limit)s
+), schedule AS (
+    SELECT chunk.id,
+           chunk.financed AS principal,
+           chunk.rate,
+           COUNT(*) FILTER (WHERE installment.status = 'PAID') AS paid,
+           MIN(installment.amount_due) FILTER (WHERE installment.installment_number = 1) AS payment
+    FROM chunk
+    JOIN banking_installment AS installment ON installment.loan_id = chunk.id
+    GROUP BY chunk.id, chunk.financed, chunk.rate
+), balances AS (
+    SELECT id,
+           GREATEST(ROUND(
+               CASE WHEN rate = 0 THEN principal - payment * paid
+                    ELSE principal * POWER(1 + rate, paid) - payment * (POWER(1 + rate, paid) - 1) / rate
+               END, 2), 0) AS outstanding,
+           ROUND(POWER(1 + rate, 1.0 / 30) - 1, 10) AS daily_rate
+    FROM schedule
+), inserted AS (
+    INSERT INTO banking_loan_interest_accrual
+        (id, tenant_id, loan_id, accrual_date, outstanding_principal, daily_rate, amount, created_at, updated_at)
+    SELECT gen_random_uuid(), %(tenant)s, id, %(day)s, outstanding, daily_rate,
+           ROUND(outstanding * daily_rate, 2), %(now)s, %(now)s
+    FROM balances
+    WHERE outstanding > 0
+    ON CONFLICT (loan_id, accrual_date) DO NOTHING
+    RETURNING amount
+)
+SELECT (SELECT id FROM chunk ORDER BY id DESC LIMIT 1),
+       (SELECT COUNT(*) FROM chunk),
+       (SELECT COUNT(*) FROM inserted),
+       (SELECT COALESCE(SUM(amount), 0) FROM inserted)
+"""
+_START_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@dataclass(slots=True)
+class AccrualResult:
+    tenant_id: str
+    accrual_date: date
+    loans_scanned: int = 0
+    rows_inserted: int = 0
+    amount: Decimal = Decimal("0.00")
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def loans_per_second(self) -> float:
+        return self.loans_scanned / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "tenant_id": self.tenant_id,
+            "accrual_date": self.accrual_date.isoformat(),
+            "loans_scanned": self.loans_scanned,
+            "rows_inserted": self.rows_inserted,
+            "amount": str(self.amount),
+            "chunks": self.chunks,
+            "loans_per_second": round(self.loans_per_second, 2),
+        }
+
+
+class InterestAccrualEngine:
+    """
+    Apropria os juros diários dos empréstimos IN_PROGRESS de um tenant, chunk a chunk.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_ACCRUAL_CHUNK_SIZE) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size da apropriação de juros deve ser positivo.")
+        self.chunk_size = chunk_size
+
+    def accrue(self, tenant: Tenant, accrual_date: date) -> AccrualResult:
+        result = AccrualResult(tenant_id=str(tenant.id), accrual_date=accrual_date)
+        started = time.perf_counter()
+        after = _START_ID
+        params = {"tenant": str(tenant.id), "day": accrual_date, "limit": self.chunk_size, "now": timezone.now()}
+        with use_tenant(tenant.id), connection.cursor() as cursor:
+            while True:
+                cursor.execute(_ACCRUAL_CHUNK_SQL, {**params, "after": after})
+                last_id, scanned, inserted, amount = cursor.fetchone()
+                if not scanned:
+                    break
+                result.chunks += 1
+                result.loans_scanned += scanned
+                result.rows_inserted += inserted
+                result.amount += amount
+                after = str(last_id)
+                if scanned < self.chunk_size:
+                    break
+        result.elapsed_seconds = time.perf_counter() - started
+        record_interest_accrual(tenant.slug, result.rows_inserted, result.loans_per_second)
+        logger.info("banking_interest_accrual", tenant_slug=tenant.slug, **result.as_dict())
+        return result
+
+
+def accrue_interest(
+    accrual_date: date,
+    tenant_ids: Optional[Sequence[str]] = None,
+    *,
+    workers: int = DEFAULT_ACCRUAL_WORKERS,
+    chunk_size: int = DEFAULT_ACCRUAL_CHUNK_SIZE,
+) -> List[AccrualResult]:
+    """
+    Roda a apropriação de ``accrual_date`` para os tenants ativos. Com ``workers > 1``
+    cada tenant vai para uma thread com conexão própria.
+    """
+    if workers < 1:
+        raise ValueError("workers da apropriação de juros deve ser positivo.")
+    engine = InterestAccrualEngine(chunk_size=chunk_size)
+    tenants = Tenant.objects.exclude(status=Tenant.Status.DECOMMISSIONED).order_by("slug")
+    if tenant_ids:
+        tenants = tenants.filter(id__in=list(tenant_ids))
+    tenants = list(tenants)
+    if workers == 1:
+        return [engine.accrue(tenant, accrual_date) for tenant in tenants]
+
+    def run(tenant: Tenant) -> AccrualResult:
+        try:
+            return engine.accrue(tenant, accrual_date)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="interest-accrual") as pool:
+        return list(pool.map(run, tenants))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import calendar
+import threading
+from array import array
+from datetime import date
+from typing import Optional
+
+DEFAULT_FIRST_YEAR = 1970
+DEFAULT_LAST_YEAR = 2100
+
+
+class MonthEndCalendar:
+    """
+    Tabela pré-calculada de meses: ordinal do dia anterior ao dia 1 e total de dias.
+
+    Índices são absolutos (``ano * 12 + mês - 1``) deslocados pelo primeiro ano coberto,
+    então somar meses a uma data vira aritmética inteira sem ``calendar.monthrange``.
+    """
+
+    __slots__ = ("first_year", "last_year", "_base", "_before_first", "_days")
+
+    def __init__(self, first_year: int, last_year: int) -> None:
+        if first_year < 1 or last_year > 9999 or first_year > last_year:
+            raise ValueError("Intervalo de anos inválido para o calendário de vencimentos.")
+        self.first_year = first_year
+        self.last_year = last_year
+        self._base = first_year * 12
+        self._before_first = array("l")
+        self._days = array("b")
+        for year in range(first_year, last_year + 1):
+            for month in range(1, 13):
+                self._before_first.append(date(year, month, 1).toordinal() - 1)
+                self._days.append(calendar.monthrange(year, month)[1])
+
+    def covers(self, first_year: int, last_year: int) -> bool:
+        return self.first_year <= first_year and last_year <= self.last_year
+
+    def due_ordinal(self, month_index: int, day: int) -> int:
+        """
+        Ordinal do vencimento no mês absoluto ``month_index``, limitado ao último dia do mês.
+        """
+        slot = month_index - self._base
+        days = self._days[slot]
+        return self._before_first[slot] + (day if day < days else days)
+
+    def add_months(self, start: date, offset: int) -> date:
+        return date.fromordinal(self.due_ordinal(start.year * 12 + start.month - 1 + offset, start.day))
+
+    def schedule_ordinals(self, first_installment_date: date, installments: int) -> array:
+        base_index = first_installment_date.year * 12 + first_installment_date.month - 1
+        day = first_installment_date.day
+        return array("l", [self.due_ordinal(index, day) for index in range(base_index, base_index + installments)])
+
+
+_calendar: Optional[MonthEndCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def schedule_year_span(first_installment_date: date, installments: int) -> tuple[int, int]:
+    last_index = first_installment_date.year * 12 + first_installment_date.month - 1 + max(installments - 1, 0)
+    return min(first_installment_date.year, last_index // 12), max(first_installment_date.year, last_index // 12)
+
+
+def get_month_calendar(first_year: Optional[int] = None, last_year: Optional[int] = None) -> MonthEndCalendar:
+    """
+    Calendário compartilhado do processo; é ampliado (nunca reduzido) quando a carteira
+    pede anos fora da faixa atual.
+    """
+    global _calendar
+    wanted_first = DEFAULT_FIRST_YEAR if first_year is None else first_year
+    wanted_last = DEFAULT_LAST_YEAR if last_year is None else last_year
+    current = _calendar
+    if current is not None and current.covers(wanted_first, wanted_last):
+        return current
+
+    with _calendar_lock:
+        current = _calendar
+        if current is not None:
+            if current.covers(wanted_first, wanted_last):
+                return current
+            wanted_first = min(wanted_first, current.first_year)
+            wanted_last = max(wanted_last, current.last_year)
+        else:
+            wanted_first = min(wanted_first, DEFAULT_FIRST_YEAR)
+            wanted_last = max(wanted_last, DEFAULT_LAST_YEAR)
+        _calendar = MonthEndCalendar(wanted_first, wanted_last)
+        return _calendar
+
+
+def calendar_for_schedule(first_installment_date: date, installments: int) -> MonthEndCalendar:
+    return get_month_calendar(*schedule_year_span(first_installment_date, installments))
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+import structlog
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backend.apps.banking.metrics import record_overdue_sweep
+from backend.apps.banking.models import BatchJobCursor, Installment
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+logger = structlog.get_logger(__name__)
+
+OVERDUE_SWEEP_JOB = "overdue_sweep"
+DEFAULT_SWEEP_CHUNK_SIZE = 5000
+
+# Keyset em (loan_id, due_date, id): percorre o índice banking_installment_due_idx em
+# ordem e trava só as linhas do chunk. SKIP LOCKED evita disputar com baixas de pagamento;
+# uma linha pulada nessa corrida fica atrás do cursor, então o fim de cada passada
+# confere se restou parcela vencida PENDING e, se sim, recomeça do início em vez de
+# fechar o dia.
+_SWEEP_CHUNK_SQL = """
+WITH chunk AS (
+    SELECT id, loan_id, due_date
+    FROM banking_installment
+    WHERE tenant_id = %s
+      AND status = %s
+      AND due_date < %s
+      AND (loan_id, due_date, id) > (%s::uuid, %s::date, %s::uuid)
+    ORDER BY loan_id, due_date, id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE banking_installment AS installment
+SET status = %s, updated_at = NOW()
+FROM chunk
+WHERE installment.id = chunk.id
+RETURNING chunk.loan_id, chunk.due_date, chunk.id
+"""
+_START_KEY = ("00000000-0000-0000-0000-000000000000", "0001-01-01", "00000000-0000-0000-0000-000000000000")
+
+
+@dataclass(slots=True)
+class SweepResult:
+    tenant_id: str
+    run_date: date
+    rows_updated: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    lag_days: int = 0
+    passes: int = 0
+    completed: bool = False
+    stalled: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_updated / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "tenant_id": self.tenant_id,
+            "run_date": self.run_date.isoformat(),
+            "rows_updated": self.rows_updated,
+            "chunks": self.chunks,
+            "rows_per_second": round(self.rows_per_second, 2),
+            "lag_days": self.lag_days,
+            "passes": self.passes,
+            "completed": self.completed,
+            "stalled": self.stalled,
+        }
+
+
+class OverdueSweeper:
+    """
+    Move parcelas PENDING vencidas para OVERDUE em UPDATEs limitados por chunk.
+
+    Cada chunk roda em transação própria junto com o avanço do cursor persistido
+    (``BatchJobCursor``), então uma execução interrompida retoma do último chunk
+    confirmado sem reprocessar nem pular linhas.
+
+    Linhas travadas por outra transação são puladas e revisitadas em uma nova
+    passada; o dia só é fechado quando nenhuma parcela vencida segue PENDING. Se uma
+    passada inteira não consegue atualizar nada (a linha continua travada), a
+    execução para com ``stalled`` e o dia fica pendente para a próxima.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_SWEEP_CHUNK_SIZE, max_chunks: Optional[int] = None) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size do sweeper deve ser positivo.")
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+
+    def sweep(self, tenant: Tenant, run_date: Optional[date] = None) -> SweepResult:
+        run_date = run_date or timezone.localdate()
+        result = SweepResult(tenant_id=str(tenant.id), run_date=run_date)
+        started = time.perf_counter()
+        with use_tenant(tenant.id):
+            cursor_row, _ = BatchJobCursor.objects.get_or_create(
+                tenant_id=tenant.id,
+                job=OVERDUE_SWEEP_JOB,
+                run_date=run_date,
+            )
+            result.completed = cursor_row.completed_at is not None
+            pass_rows = 0
+            while not (result.completed or result.stalled or self._budget_exhausted(result)):
+                passes = result.passes
+                pass_rows += self._sweep_chunk(cursor_row.id, result)
+                if result.passes != passes:
+                    result.stalled = pass_rows == 0
+                    pass_rows = 0
+
+        result.elapsed_seconds = time.perf_counter() - started
+        record_overdue_sweep(tenant.slug, result.rows_updated, result.rows_per_second, result.lag_days)
+        logger.info("banking_overdue_sweep", tenant_slug=tenant.slug, **result.as_dict())
+        return result
+
+    def _budget_exhausted(self, result: SweepResult) -> bool:
+        return self.max_chunks is not None and result.chunks >= self.max_chunks
+
+    def _sweep_chunk(self, cursor_id, result: SweepResult) -> int:
+        with transaction.atomic():
+            cursor_row = BatchJobCursor.objects.select_for_update().get(id=cursor_id)
+            if cursor_row.completed_at is not None:
+                result.completed = True
+                return 0
+            start_key = tuple(cursor_row.position.get("last_key") or _START_KEY)
+            with connection.cursor() as db_cursor:
+                db_cursor.execute(
+                    _SWEEP_CHUNK_SQL,
+                    [
+                        str(cursor_row.tenant_id),
+                        Installment.Status.PENDING,
+                        result.run_date,
+                        *start_key,
+                        self.chunk_size,
+                        Installment.Status.OVERDUE,
+                    ],
+                )
+                rows = db_cursor.fetchall()
+
+            if rows:
+                loan_id, due_date, installment_id = max(rows)
+                cursor_row.position = {**cursor_row.position, "last_key": [str(loan_id), due_date.isoformat(), str(installment_id)]}
+                cursor_row.processed_rows += len(rows)
+                oldest = min(row[1] for row in rows)
+                result.lag_days = max(result.lag_days, (result.run_date - oldest).days)
+            if len(rows) < self.chunk_size:
+                self._finish_pass(cursor_row, result)
+            cursor_row.save(update_fields=["position", "processed_rows", "completed_at", "updated_at"])
+
+        result.rows_updated += len(rows)
+        result.chunks += 1
+        return len(rows)
+
+    def _finish_pass(self, cursor_row: BatchJobCursor, result: SweepResult) -> None:
+        result.passes += 1
+        skipped = Installment.objects.filter(
+            tenant_id=cursor_row.tenant_id,
+            status=Installment.Status.PENDING,
+            due_date__lt=result.run_date,
+        ).exists()
+        if skipped:
+            cursor_row.position = {"last_key": None, "passes": cursor_row.position.get("passes", 0) + 1}
+            return
+        cursor_row.completed_at = timezone.now()
+        result.completed = True
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+from django.db import transaction
+from django.utils import timezone
+
+from backend.apps.banking.models import Installment, Loan
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+
+# Formato v1, little-endian: cabeçalho (versão u8, quantidade u16) seguido de quatro
+# colunas com uma posição por parcela, na ordem de ``installment_number``: número da
+# parcela (u16), vencimento (ordinal i32), valor devido e valor pago (centavos i64).
+PACKED_SCHEDULE_VERSION = 1
+_HEADER = struct.Struct("<BH")
+
+
+class ScheduleRow(NamedTuple):
+    installment_number: int
+    due_date: date
+    amount_due: Decimal
+    amount_paid: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class PackedSchedule:
+    installment_numbers: Tuple[int, ...]
+    due_ordinals: Tuple[int, ...]
+    amount_cents: Tuple[int, ...]
+    paid_cents: Tuple[int, ...]
+
+    def __len__(self) -> int:
+        return len(self.due_ordinals)
+
+    def rows(self) -> Iterator[ScheduleRow]:
+        columns = zip(self.installment_numbers, self.due_ordinals, self.amount_cents, self.paid_cents)
+        for number, ordinal, amount, paid in columns:
+            yield ScheduleRow(number, date.fromordinal(ordinal), Decimal(amount).scaleb(-2), Decimal(paid).scaleb(-2))
+
+    @property
+    def open_balance(self) -> Decimal:
+        return Decimal(sum(max(amount - paid, 0) for amount, paid in zip(self.amount_cents, self.paid_cents))).scaleb(-2)
+
+
+def _cents(value: Decimal) -> int:
+    return int(value.scaleb(2).to_integral_value())
+
+
+def pack_schedule(rows: Sequence[Tuple[int, date, Decimal, Decimal]]) -> bytes:
+    """
+    Empacota (número, vencimento, valor devido, valor pago) já ordenados por número de parcela.
+    """
+    count = len(rows)
+    return b"".join(
+        (
+            _HEADER.pack(PACKED_SCHEDULE_VERSION, count),
+            struct.pack(f"<{count}H", *(number for number, _, _, _ in rows)),
+            struct.pack(f"<{count}i", *(due.toordinal() for _, due, _, _ in rows)),
+            struct.pack(f"<{count}q", *(_cents(amount) for _, _, amount, _ in rows)),
+            struct.pack(f"<{count}q", *(_cents(paid) for _, _, _, paid in rows)),
+        ),
+    )
+
+
+def unpack_schedule(blob: bytes) -> PackedSchedule:
+    version, count = _HEADER.unpack_from(blob)
+    if version != PACKED_SCHEDULE_VERSION:
+        raise ValueError(f"Versão de cronograma empacotado desconhecida: {version}.")
+    offset = _HEADER.size
+    numbers = struct.unpack_from(f"<{count}H", blob, offset)
+    offset += 2 * count
+    due = struct.unpack_from(f"<{count}i", blob, offset)
+    offset += 4 * count
+    amounts = struct.unpack_from(f"<{count}q", blob, offset)
+    paid = struct.unpack_from(f"<{count}q", blob, offset + 8 * count)
+    return PackedSchedule(installment_numbers=numbers, due_ordinals=due, amount_cents=amounts, paid_cents=paid)
+
+
+def _installment_rows(loan_ids: Iterable[UUID]) -> Dict[UUID, List[Tuple[int, date, Decimal, Decimal]]]:
+    grouped: Dict[UUID, List[Tuple[int, date, Decimal, Decimal]]] = {}
+    rows = (
+        Installment.objects.filter(loan_id__in=list(loan_ids))
+        .order_by("loan_id", "installment_number")
+        .values_list("loan_id", "installment_number", "due_date", "amount_due", "amount_paid")
+    )
+    for loan_id, *row in rows:
+        grouped.setdefault(loan_id, []).append(tuple(row))
+    return grouped
+
+
+def refresh_packed_schedules(tenant_id: TenantIdentifier, loan_ids: Iterable[UUID]) -> int:
+    """
+    Reempacota o cronograma dos empréstimos a partir de ``Installment`` (uma leitura e
+    um ``bulk_update``). Chamado pelos sinais de parcela e pelos fluxos em lote.
+    """
+    ids = {UUID(str(loan_id)) for loan_id in loan_ids}
+    if not ids:
+        return 0
+    with use_tenant(tenant_id), transaction.atomic():
+        grouped = _installment_rows(ids)
+        now = timezone.now()
+        loans = [
+            Loan(id=loan_id, packed_schedule=pack_schedule(grouped.get(loan_id, [])), updated_at=now)
+            for loan_id in sorted(ids)
+        ]
+        Loan.objects.bulk_update(loans, ["packed_schedule", "updated_at"])
+    return len(loans)
+
+
+_pending = threading.local()
+
+
+def refresh_packed_schedule_on_commit(tenant_id: TenantIdentifier, loan_id: UUID) -> None:
+    """
+    Agenda o reempacotamento do empréstimo para o commit da transação corrente.
+
+    Várias parcelas do mesmo empréstimo salvas na mesma transação resultam em um único
+    reempacotamento, e os empréstimos pendentes saem juntos em um ``bulk_update`` por
+    tenant. Fora de transação o ``on_commit`` roda na hora.
+    """
+    if not transaction.get_connection().run_on_commit:
+        # Sem callbacks registrados a transação é nova: o que sobrou de uma que foi
+        # desfeita não precisa mais ser reempacotado.
+        _pending.loans = {}
+    loans: Dict[str, set] = _pending.__dict__.setdefault("loans", {})
+    loans.setdefault(str(tenant_id), set()).add(loan_id)
+    # Um callback por chamada: se um savepoint for desfeito e levar o seu, outro
+    # registrado depois ainda esvazia o conjunto; os excedentes não fazem nada.
+    transaction.on_commit(_flush_pending_refreshes)
+
+
+def _flush_pending_refreshes() -> None:
+    loans: Dict[str, set] = _pending.__dict__.get("loans", {})
+    while loans:
+        tenant_id, loan_ids = loans.popitem()
+        refresh_packed_schedules(tenant_id, loan_ids)
+
+
+def read_schedule(tenant_id: TenantIdentifier, loan_id: UUID) -> Optional[PackedSchedule]:
+    """
+    Cronograma completo em uma leitura de linha. Empréstimos ainda sem a coluna
+    (criados por ``bulk_create``) são empacotados na leitura.
+    """
+    with use_tenant(tenant_id):
+        row = Loan.objects.filter(id=loan_id).values_list("packed_schedule", flat=True).first()
+        if row is None:
+            if not Loan.objects.filter(id=loan_id).exists():
+                return None
+            refresh_packed_schedules(tenant_id, [loan_id])
+            row = Loan.objects.filter(id=loan_id).values_list("packed_schedule", flat=True).get()
+    return unpack_schedule(bytes(row))
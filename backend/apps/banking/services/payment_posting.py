@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, List, Sequence
+from uuid import UUID
+
+import structlog
+from django.db import transaction
+from django.utils import timezone
+
+from backend.apps.banking.models import FinancialTransaction, Installment
+from backend.apps.banking.services.cash_flow_rollup import refresh_cash_flow_days
+from backend.apps.banking.services.packed_schedule import refresh_packed_schedules
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_POSTING_CHUNK_SIZE = 500
+_INSTALLMENT_FIELDS = ["amount_paid", "payment_date", "status", "updated_at"]
+
+
+@dataclass(slots=True)
+class PostingResult:
+    posted: List[UUID] = field(default_factory=list)
+    already_posted: List[UUID] = field(default_factory=list)
+    deferred: List[UUID] = field(default_factory=list)
+    ignored: List[UUID] = field(default_factory=list)
+    installments_updated: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "posted": len(self.posted),
+            "already_posted": len(self.already_posted),
+            "deferred": len(self.deferred),
+            "ignored": len(self.ignored),
+            "installments_updated": self.installments_updated,
+        }
+
+
+def _apply_payment(installment: Installment, amount: Decimal, paid_on: date) -> None:
+    installment.amount_paid = (installment.amount_paid or Decimal("0")) + amount
+    if installment.payment_date is None or paid_on > installment.payment_date:
+        installment.payment_date = paid_on
+    installment.status = (
+        Installment.Status.PAID if installment.amount_paid >= installment.amount_due else Installment.Status.PARTIALLY_PAID
+    )
+
+
+def _apply_payments(
+    payments: Sequence[FinancialTransaction],
+    installments: dict[UUID, Installment],
+    now: datetime,
+) -> dict[UUID, Installment]:
+    touched: dict[UUID, Installment] = {}
+    for payment in payments:
+        installment = installments[payment.installment_id]
+        _apply_payment(installment, payment.amount, payment.payment_date or payment.transaction_date)
+        installment.updated_at = now
+        touched[installment.id] = installment
+    return touched
+
+
+class PaymentPostingService:
+    """
+    Aplica recebimentos (``FinancialTransaction`` de entrada) nas parcelas vinculadas.
+
+    Cada chunk trava transações e parcelas com ``FOR UPDATE SKIP LOCKED`` e grava tudo
+    com um ``bulk_update``. Postadores concorrentes nunca esperam um pelo outro:
+    o que estiver travado volta em ``deferred`` para nova tentativa. ``posted_at`` é
+    gravado na mesma transação, então cada transação é aplicada no máximo uma vez.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_POSTING_CHUNK_SIZE) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size da baixa de pagamentos deve ser positivo.")
+        self.chunk_size = chunk_size
+
+    def post(self, tenant_id: TenantIdentifier, transaction_ids: Iterable[UUID]) -> PostingResult:
+        ordered = sorted({UUID(str(value)) for value in transaction_ids})
+        result = PostingResult()
+        with use_tenant(tenant_id):
+            for start in range(0, len(ordered), self.chunk_size):
+                self._post_chunk(tenant_id, ordered[start : start + self.chunk_size], result)
+        logger.info("banking_payment_posting", tenant_id=str(tenant_id), **result.as_dict())
+        return result
+
+    def _classify(self, chunk: Sequence[UUID], result: PostingResult) -> List[UUID]:
+        rows = FinancialTransaction.objects.filter(id__in=chunk).values_list(
+            "id",
+            "posted_at",
+            "installment_id",
+            "type",
+        )
+        candidates: list[UUID] = []
+        found: set[UUID] = set()
+        for tx_id, posted_at, installment_id, tx_type in rows:
+            found.add(tx_id)
+            if posted_at is not None:
+                result.already_posted.append(tx_id)
+            elif installment_id is None or tx_type != FinancialTransaction.TransactionType.INCOME:
+                result.ignored.append(tx_id)
+            else:
+                candidates.append(tx_id)
+        result.ignored.extend(tx_id for tx_id in chunk if tx_id not in found)
+        return candidates
+
+    def _lock(self, candidates: Sequence[UUID]) -> tuple[List[FinancialTransaction], dict[UUID, Installment]]:
+        payments = list(
+            FinancialTransaction.objects.select_for_update(skip_locked=True)
+            .filter(id__in=candidates, posted_at__isnull=True)
+            .order_by("transaction_date", "id"),
+        )
+        installments = {
+            installment.id: installment
+            for installment in Installment.objects.select_for_update(skip_locked=True)
+            .filter(id__in={payment.installment_id for payment in payments})
+            .order_by("id")
+        }
+        return payments, installments
+
+    def _post_chunk(self, tenant_id: TenantIdentifier, chunk: Sequence[UUID], result: PostingResult) -> None:
+        candidates = self._classify(chunk, result)
+        if not candidates:
+            return
+        with transaction.atomic():
+            payments, installments = self._lock(candidates)
+            applicable = [payment for payment in payments if payment.installment_id in installments]
+            now = timezone.now()
+            touched = _apply_payments(applicable, installments, now)
+            Installment.objects.bulk_update(list(touched.values()), _INSTALLMENT_FIELDS)
+            refresh_cash_flow_days(tenant_id, {installment.due_date for installment in touched.values()})
+            refresh_packed_schedules(tenant_id, {installment.loan_id for installment in touched.values()})
+            posted_ids = [payment.id for payment in applicable]
+            FinancialTransaction.objects.filter(id__in=posted_ids).update(posted_at=now, updated_at=now)
+
+        posted = set(posted_ids)
+        result.posted.extend(posted_ids)
+        result.deferred.extend(tx_id for tx_id in candidates if tx_id not in posted)
+        result.installments_updated += len(touched)
+
+
+def post_payments(
+    tenant_id: TenantIdentifier,
+    transaction_ids: Iterable[UUID],
+    *,
+    chunk_size: int = DEFAULT_POSTING_CHUNK_SIZE,
+) -> PostingResult:
+    return PaymentPostingService(chunk_size=chunk_size).post(tenant_id, transaction_ids)
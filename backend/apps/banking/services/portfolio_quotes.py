@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from typing import Iterable, List
+
+from backend.apps.banking.services.financial_calculations import (
+    InstallmentQuote,
+    LoanInput,
+    generate_installments,
+)
+from backend.apps.banking.services.month_calendar import calendar_for_schedule
+
+_CENT = Decimal("0.01")
+_RATE_SCALE = 10_000  # taxa mensal em centésimos de ponto percentual (0,0001)
+_IOF_DENOMINATOR = 50_000  # 1,04% + n * 0,002% == (520 + n) / 50000
+
+
+@dataclass(slots=True)
+class PortfolioQuote:
+    """
+    Cotação colunar de uma carteira: valores em centavos e datas em ordinais.
+
+    O cronograma segue layout CSR: as datas do empréstimo ``i`` ficam em
+    ``due_date_ordinals[schedule_offsets[i]:schedule_offsets[i + 1]]``.
+    """
+
+    principal_cents: array
+    iof_cents: array
+    payment_cents: array
+    monthly_rate_bp: array
+    installment_counts: array
+    schedule_offsets: array
+    due_date_ordinals: array
+
+    def __len__(self) -> int:
+        return len(self.payment_cents)
+
+    def payment(self, index: int) -> Decimal:
+        return _from_cents(self.payment_cents[index])
+
+    def iof(self, index: int) -> Decimal:
+        return _from_cents(self.iof_cents[index])
+
+    def due_dates(self, index: int) -> List[date]:
+        start, end = self.schedule_offsets[index], self.schedule_offsets[index + 1]
+        return [date.fromordinal(ordinal) for ordinal in self.due_date_ordinals[start:end]]
+
+    def installments(self, index: int) -> List[InstallmentQuote]:
+        amount = self.payment(index)
+        return [
+            InstallmentQuote(number=number, due_date=due_date, amount=amount)
+            for number, due_date in enumerate(self.due_dates(index), start=1)
+        ]
+
+
+def _from_cents(value: int) -> Decimal:
+    return Decimal(value).scaleb(-2)
+
+
+def _to_cents(value: Decimal) -> int:
+    cents = value.scaleb(2)
+    if cents != cents.to_integral_value():
+        raise ValueError("principal_amount deve ter no máximo 2 casas decimais para cotação em lote.")
+    return int(cents)
+
+
+def _div_half_up(numerator: int, denominator: int) -> tuple[int, bool]:
+    """
+    Divisão inteira com arredondamento HALF_UP; indica se houve empate exato.
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice = remainder * 2
+    if twice > denominator:
+        return quotient + 1, False
+    if twice == denominator:
+        return quotient + 1, True
+    return quotient, False
+
+
+@lru_cache(maxsize=4096)
+def _monthly_rate_bp(annual_rate_pct: Decimal) -> int:
+    monthly = (annual_rate_pct / Decimal("12")).quantize(_CENT, rounding=ROUND_HALF_UP)
+    return int(monthly.scaleb(2))
+
+
+@lru_cache(maxsize=4096)
+def _annuity_factor(rate_bp: int, installments: int) -> tuple[int, int]:
+    """
+    Fator exato da Tabela Price como fração inteira: payment = total * num / den.
+
+    r / (1 - (1 + r)^-n) com r = bp / 10000 equivale a
+    bp * B^n / (10000 * (B^n - 10000^n)), onde B = 10000 + bp.
+    """
+    growth = (_RATE_SCALE + rate_bp) ** installments
+    return rate_bp * growth, _RATE_SCALE * (growth - _RATE_SCALE**installments)
+
+
+@lru_cache(maxsize=4096)
+def _schedule_ordinals(first_installment_date: date, installments: int) -> array:
+    """
+    Cronograma (ordinais) compartilhado por empréstimos com mesma primeira data e prazo.
+    """
+    month_calendar = calendar_for_schedule(first_installment_date, installments)
+    return month_calendar.schedule_ordinals(first_installment_date, installments)
+
+
+def _payment_cents(total_cents: int, rate_bp: int, installments: int) -> tuple[int, bool]:
+    if rate_bp == 0:
+        # Divisão por n: o Decimal representa empates exatamente, então HALF_UP coincide.
+        payment, _ = _div_half_up(total_cents, installments)
+        return payment, False
+    numerator, denominator = _annuity_factor(rate_bp, installments)
+    return _div_half_up(total_cents * numerator, denominator)
+
+
+def quote_loan_cents(request: LoanInput) -> tuple[int, int, int, int]:
+    """
+    Cotação inteira de um empréstimo: (principal, IOF, taxa mensal em bp, parcela), em centavos.
+    """
+    installments = request.number_of_installments
+    if installments < 1:
+        raise ValueError("number_of_installments deve ser pelo menos 1.")
+
+    principal = _to_cents(request.principal_amount)
+    iof, _ = _div_half_up(principal * (520 + installments), _IOF_DENOMINATOR)
+    rate_bp = _monthly_rate_bp(request.annual_rate_pct)
+    payment, tie = _payment_cents(principal + iof, rate_bp, installments)
+    if tie:
+        # Empates exatos dependem da precisão do contexto Decimal; delega ao escalar.
+        payment = _to_cents(generate_installments(request)[0].amount)
+    return principal, iof, rate_bp, payment
+
+
+def quote_portfolio(inputs: Iterable[LoanInput]) -> PortfolioQuote:
+    """
+    Cota uma carteira inteira (parcela, IOF e cronograma) em aritmética inteira de centavos.
+
+    Os resultados batem centavo a centavo com ``generate_installments``/``calculate_iof``;
+    fatores de anuidade são reaproveitados entre empréstimos com mesma taxa e prazo.
+    """
+    principal_cents = array("q")
+    iof_cents = array("q")
+    payment_cents = array("q")
+    monthly_rate_bp = array("l")
+    installment_counts = array("l")
+    schedule_offsets = array("q", [0])
+    due_date_ordinals = array("l")
+
+    for request in inputs:
+        principal, iof, rate_bp, payment = quote_loan_cents(request)
+        installments = request.number_of_installments
+
+        principal_cents.append(principal)
+        iof_cents.append(iof)
+        payment_cents.append(payment)
+        monthly_rate_bp.append(rate_bp)
+        installment_counts.append(installments)
+        due_date_ordinals.extend(_schedule_ordinals(request.first_installment_date, installments))
+        schedule_offsets.append(len(due_date_ordinals))
+
+    return PortfolioQuote(
+        principal_cents=principal_cents,
+        iof_cents=iof_cents,
+        payment_cents=payment_cents,
+        monthly_rate_bp=monthly_rate_bp,
+        installment_counts=installment_counts,
+        schedule_offsets=schedule_offsets,
+        due_date_ordinals=due_date_ordinals,
+    )
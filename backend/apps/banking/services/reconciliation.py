@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import DefaultDict, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import structlog
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from backend.apps.banking.models import FinancialTransaction, Installment
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_WINDOW_DAYS = 5
+DEFAULT_WRITE_BATCH_SIZE = 1000
+
+# Chave do hash join: (valor em centavos, cliente). O cliente do extrato vem da conta
+# bancária; o da parcela, do empréstimo.
+MatchKey = Tuple[int, UUID]
+
+
+def _cents(amount: Decimal) -> int:
+    return int((amount * 100).to_integral_value())
+
+
+@dataclass(frozen=True, slots=True)
+class StatementRow:
+    id: UUID
+    key: MatchKey
+    paid_on: date
+
+
+@dataclass(frozen=True, slots=True)
+class OpenInstallment:
+    id: UUID
+    key: MatchKey
+    due_date: date
+
+
+@dataclass(frozen=True, slots=True)
+class AmbiguousMatch:
+    transaction_id: UUID
+    candidate_installment_ids: Tuple[UUID, ...]
+    reason: str
+
+
+@dataclass(slots=True)
+class ReconciliationReport:
+    matched: List[Tuple[UUID, UUID]] = field(default_factory=list)
+    ambiguous: List[AmbiguousMatch] = field(default_factory=list)
+    unmatched: List[UUID] = field(default_factory=list)
+    skipped: List[UUID] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "matched": len(self.matched),
+            "ambiguous": len(self.ambiguous),
+            "unmatched": len(self.unmatched),
+            "skipped": len(self.skipped),
+        }
+
+    def rows(self) -> Iterable[Tuple[str, str, str, str]]:
+        """
+        Linhas do relatório (status, transação, parcelas, motivo) para exportação.
+        """
+        for transaction_id, installment_id in self.matched:
+            yield "matched", str(transaction_id), str(installment_id), ""
+        for item in self.ambiguous:
+            yield "ambiguous", str(item.transaction_id), " ".join(map(str, item.candidate_installment_ids)), item.reason
+        for transaction_id in self.unmatched:
+            yield "unmatched", str(transaction_id), "", "sem parcela em aberto compatível"
+        for transaction_id in self.skipped:
+            yield "skipped", str(transaction_id), "", "transação vinculada durante a conciliação"
+
+
+class InstallmentIndex:
+    """
+    Índice em memória das parcelas em aberto: hash por (centavos, cliente) e, dentro
+    de cada chave, baldes de ``window_days`` dias pela data de vencimento.
+
+    Uma consulta olha só o balde da data e os dois vizinhos, então o custo de
+    casar ``n`` transações contra ``m`` parcelas é O(n + m) em vez de O(n·m).
+    """
+
+    def __init__(self, installments: Iterable[OpenInstallment], window_days: int) -> None:
+        self.window_days = window_days
+        self._buckets: DefaultDict[MatchKey, DefaultDict[int, List[OpenInstallment]]] = defaultdict(lambda: defaultdict(list))
+        for installment in installments:
+            self._buckets[installment.key][self._bucket(installment.due_date)].append(installment)
+
+    def _bucket(self, value: date) -> int:
+        return value.toordinal() // self.window_days
+
+    def candidates(self, row: StatementRow) -> List[OpenInstallment]:
+        by_bucket = self._buckets.get(row.key)
+        if not by_bucket:
+            return []
+        bucket = self._bucket(row.paid_on)
+        return [
+            installment
+            for offset in (-1, 0, 1)
+            for installment in by_bucket.get(bucket + offset, ())
+            if abs((installment.due_date - row.paid_on).days) <= self.window_days
+        ]
+
+
+def match_rows(
+    rows: Sequence[StatementRow],
+    installments: Iterable[OpenInstallment],
+    window_days: int = DEFAULT_WINDOW_DAYS,
+) -> ReconciliationReport:
+    """
+    Casa extratos e parcelas sem tocar o banco.
+
+    Um vínculo só é aceito quando a transação tem exatamente uma parcela candidata e
+    essa parcela não é disputada por outra transação; o resto vai para o relatório.
+    """
+    index = InstallmentIndex(installments, window_days)
+    candidates: Dict[UUID, List[OpenInstallment]] = {row.id: index.candidates(row) for row in rows}
+    claims: DefaultDict[UUID, int] = defaultdict(int)
+    for found in candidates.values():
+        for installment in found:
+            claims[installment.id] += 1
+
+    report = ReconciliationReport()
+    for row in rows:
+        found = candidates[row.id]
+        if not found:
+            report.unmatched.append(row.id)
+        elif len(found) > 1:
+            report.ambiguous.append(AmbiguousMatch(row.id, tuple(item.id for item in found), "várias parcelas candidatas"))
+        elif claims[found[0].id] > 1:
+            report.ambiguous.append(AmbiguousMatch(row.id, (found[0].id,), "parcela disputada por outras transações"))
+        else:
+            report.matched.append((row.id, found[0].id))
+    return report
+
+
+class ReconciliationService:
+    """
+    Vincula recebimentos de extrato (``FinancialTransaction`` de entrada, pagos e sem
+    parcela) às parcelas em aberto do mesmo cliente com o mesmo valor, dentro de uma
+    janela de datas. Os vínculos são gravados com ``bulk_update``; a baixa nas
+    parcelas continua com ``post_payments``.
+    """
+
+    def __init__(self, window_days: int = DEFAULT_WINDOW_DAYS, batch_size: int = DEFAULT_WRITE_BATCH_SIZE) -> None:
+        if window_days < 1:
+            raise ValueError("window_days da conciliação deve ser positivo.")
+        if batch_size < 1:
+            raise ValueError("batch_size da conciliação deve ser positivo.")
+        self.window_days = window_days
+        self.batch_size = batch_size
+
+    def _statement_rows(self, transaction_ids: Optional[Sequence[UUID]]) -> List[StatementRow]:
+        queryset = FinancialTransaction.objects.filter(
+            type=FinancialTransaction.TransactionType.INCOME,
+            is_paid=True,
+            installment__isnull=True,
+            posted_at__isnull=True,
+            bank_account__isnull=False,
+        )
+        if transaction_ids is not None:
+            queryset = queryset.filter(id__in=list(transaction_ids))
+        rows = queryset.annotate(paid_on=Coalesce("payment_date", "transaction_date")).values_list(
+            "id",
+            "amount",
+            "bank_account__customer_id",
+            "paid_on",
+        )
+        return [StatementRow(tx_id, (_cents(amount), customer_id), paid_on) for tx_id, amount, customer_id, paid_on in rows]
+
+    def _open_installments(self, rows: Sequence[StatementRow]) -> Iterable[OpenInstallment]:
+        window = timedelta(days=self.window_days)
+        dates = [row.paid_on for row in rows]
+        queryset = (
+            Installment.objects.exclude(status=Installment.Status.PAID)
+            .filter(
+                due_date__gte=min(dates) - window,
+                due_date__lte=max(dates) + window,
+                loan__customer_id__in={row.key[1] for row in rows},
+            )
+            .annotate(open_amount=F("amount_due") - F("amount_paid"))
+            .values_list("id", "open_amount", "loan__customer_id", "due_date")
+        )
+        for installment_id, open_amount, customer_id, due_date in queryset.iterator(chunk_size=5000):
+            yield OpenInstallment(installment_id, (_cents(open_amount), customer_id), due_date)
+
+    def reconcile(
+        self,
+        tenant_id: TenantIdentifier,
+        transaction_ids: Optional[Sequence[UUID]] = None,
+        *,
+        dry_run: bool = False,
+    ) -> ReconciliationReport:
+        with use_tenant(tenant_id):
+            rows = self._statement_rows(transaction_ids)
+            if not rows:
+                return ReconciliationReport()
+            report = match_rows(rows, self._open_installments(rows), self.window_days)
+            if report.matched and not dry_run:
+                self._write_links(report)
+        logger.info("banking_reconciliation", tenant_id=str(tenant_id), dry_run=dry_run, **report.as_dict())
+        return report
+
+    def _write_links(self, report: ReconciliationReport) -> None:
+        links = dict(report.matched)
+        with transaction.atomic():
+            # Só grava o que continua sem parcela; o restante foi vinculado por outro fluxo.
+            free = set(
+                FinancialTransaction.objects.select_for_update(skip_locked=True)
+                .filter(id__in=list(links), installment__isnull=True)
+                .values_list("id", flat=True),
+            )
+            now = timezone.now()
+            updates = [
+                FinancialTransaction(id=tx_id, installment_id=installment_id, updated_at=now)
+                for tx_id, installment_id in links.items()
+                if tx_id in free
+            ]
+            FinancialTransaction.objects.bulk_update(updates, ["installment", "updated_at"], batch_size=self.batch_size)
+        report.skipped.extend(tx_id for tx_id in links if tx_id not in free)
+        report.matched = [(tx_id, installment_id) for tx_id, installment_id in report.matched if tx_id in free]
+
+
+def reconcile_transactions(
+    tenant_id: TenantIdentifier,
+    transaction_ids: Optional[Sequence[UUID]] = None,
+    *,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    dry_run: bool = False,
+) -> ReconciliationReport:
+    return ReconciliationService(window_days=window_days).reconcile(tenant_id, transaction_ids, dry_run=dry_run)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+DEFAULT_SCHEDULE_CACHE_SIZE = 4096
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AmortizationScheduleCache:
+    """
+    LRU limitado e thread-safe para cotações de amortização (cronograma, IOF e CET).
+
+    As chaves são tuplas normalizadas do ``LoanInput``; ``Decimal`` compara e faz hash
+    por valor, então ``10000`` e ``10000.00`` caem na mesma entrada.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SCHEDULE_CACHE_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize do cache de cronogramas não pode ser negativo.")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self._maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict_overflow()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # O cálculo fica fora do lock; em corrida, o último resultado prevalece (valores idênticos).
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize do cache de cronogramas não pode ser negativo.")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict_overflow()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> ScheduleCacheStats:
+        with self._lock:
+            return ScheduleCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self._maxsize,
+            )
+
+    def _evict_overflow(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+_schedule_cache: Optional[AmortizationScheduleCache] = None
+_schedule_cache_lock = threading.Lock()
+
+
+def _configured_size() -> int:
+    try:
+        from django.conf import settings
+
+        return int(getattr(settings, "BANKING_SCHEDULE_CACHE_SIZE", DEFAULT_SCHEDULE_CACHE_SIZE))
+    except Exception:  # pragma: no cover - uso fora do Django (scripts/benchmarks)
+        return DEFAULT_SCHEDULE_CACHE_SIZE
+
+
+def get_schedule_cache() -> AmortizationScheduleCache:
+    """
+    Cache de processo compartilhado por factories, serviços e jobs de recálculo.
+    """
+    global _schedule_cache
+    if _schedule_cache is None:
+        with _schedule_cache_lock:
+            if _schedule_cache is None:
+                _schedule_cache = AmortizationScheduleCache(_configured_size())
+    return _schedule_cache
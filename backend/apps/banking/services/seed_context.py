@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import string
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Iterable, List, Optional
+
+from backend.apps.foundation.services.seed_utils import VaultTransitFPEClient, derive_factory_seed
+
+
+# Linhas por shard: cada (entidade, shard) tem um fluxo próprio, então o valor de uma
+# linha depende só da entidade, do índice e do seed — não do chunk nem da ordem de escrita.
+SEED_SHARD_SIZE = 1024
+
+
+@dataclass(slots=True)
+class SeedStream:
+    """
+    Fluxo pseudoaleatório de uma (entidade, shard), semeado uma única vez. Os sorteios
+    são em lote, uma coluna inteira por chamada; a ordem das chamadas faz parte do
+    contrato de reprodutibilidade.
+    """
+
+    seed: int
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _strings(self, alphabet: str, count: int, length: int) -> List[str]:
+        pool = "".join(self._rng.choices(alphabet, k=count * length))
+        return [pool[start : start + length] for start in range(0, count * length, length)]
+
+    def digits(self, count: int, length: int) -> List[str]:
+        return self._strings(string.digits, count, length)
+
+    def letters(self, count: int, length: int) -> List[str]:
+        return self._strings(string.ascii_uppercase, count, length)
+
+    def decimals(self, count: int, min_value: Decimal, max_value: Decimal, places: int = 2) -> List[Decimal]:
+        span = max_value - min_value
+        quantize = Decimal(1).scaleb(-places)
+        draw = self._rng.random
+        return [(min_value + span * Decimal(draw())).quantize(quantize, rounding=ROUND_HALF_UP) for _ in range(count)]
+
+
+@dataclass(slots=True)
+class FactoryContext:
+    """
+    Contexto determinístico das factories e do materializador de seeds: os valores
+    derivam só de tenant, ambiente, versão do manifesto e versão do salt.
+
+    Os métodos ``deterministic_*`` semeiam um gerador por rótulo (uso pontual nas
+    factories); volumes grandes usam ``stream`` por (entidade, shard).
+    """
+
+    tenant_id: str
+    environment: str
+    manifest_version: str
+    salt_version: str
+    reference_date: date = date(2025, 1, 1)
+    _factory_seed: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _fpe_client: Optional[VaultTransitFPEClient] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def tenant_uuid(self) -> uuid.UUID:
+        return uuid.UUID(str(self.tenant_id))
+
+    @property
+    def tenant_slug(self) -> str:
+        return str(self.tenant_uuid).split("-")[0]
+
+    @property
+    def factory_seed(self) -> int:
+        if self._factory_seed is None:
+            self._factory_seed = derive_factory_seed(
+                str(self.tenant_id),
+                self.environment,
+                self.manifest_version,
+                self.salt_version,
+            )
+        return self._factory_seed
+
+    @property
+    def fpe_client(self) -> VaultTransitFPEClient:
+        # Um cliente (e o seu memo) por contexto; ``with_overrides`` cria outro.
+        if self._fpe_client is None:
+            self._fpe_client = VaultTransitFPEClient(transit_path=f"transit/seeds/{self.environment}/{self.tenant_id}")
+        return self._fpe_client
+
+    def _seed(self, label: str) -> int:
+        payload = f"{label}|{self.factory_seed}"
+        digest = hashlib.sha256(payload.encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def stream(self, entity: str, shard: int) -> SeedStream:
+        digest = hashlib.sha256(f"{entity}|shard-{shard}|{self.factory_seed}".encode()).digest()
+        return SeedStream(int.from_bytes(digest[:8], "big"))
+
+    def mask(self, value: str) -> str:
+        return self.fpe_client.mask(value, salt_version=self.salt_version)
+
+    def mask_many(self, values: Iterable[str]) -> List[str]:
+        return self.fpe_client.mask_many(values, salt_version=self.salt_version)
+
+    def masked_emails(self, prefix: str, suffixes: Iterable[str]) -> List[str]:
+        local_parts = self.mask_many(f"{prefix}-{suffix or '0'}" for suffix in suffixes)
+        return [f"{local_part}@masked.test" for local_part in local_parts]
+
+    def deterministic_digits(self, label: str, length: int) -> str:
+        rng = random.Random(self._seed(label))
+        return "".join(str(rng.randint(0, 9)) for _ in range(length))
+
+    def deterministic_letters(self, label: str, length: int) -> str:
+        rng = random.Random(self._seed(label))
+        return "".join(rng.choice(string.ascii_uppercase) for _ in range(length))
+
+    def deterministic_decimal(self, label: str, min_value: Decimal, max_value: Decimal, places: int = 2) -> Decimal:
+        rng = random.Random(self._seed(label))
+        span = max_value - min_value
+        quantize = Decimal("0." + ("0" * (places - 1)) + "1")
+        value = min_value + span * Decimal(rng.random())
+        return value.quantize(quantize, rounding=ROUND_HALF_UP)
+
+    def masked_digits(self, label: str, length: int) -> str:
+        return self.mask(self.deterministic_digits(label, length))
+
+    def masked_email(self, prefix: str, suffix: str = "") -> str:
+        local_part = f"{prefix}-{suffix or '0'}"
+        return f"{self.mask(local_part)}@masked.test"
+
+    def with_overrides(self, **kwargs: Any) -> "FactoryContext":
+        return replace(self, **kwargs)
+
+    @classmethod
+    def default(cls) -> "FactoryContext":
+        return cls(
+            tenant_id="00000000-0000-0000-0000-000000000000",
+            environment="dev",
+            manifest_version="0.0.0",
+            salt_version="v1",
+        )
@@ -0,0 +1,832 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import structlog
+from django.contrib.auth import get_user_model
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from backend.apps.banking.models import (
+    AccountCategory,
+    Address,
+    BankAccount,
+    Consultant,
+    Contract,
+    CreditLimit,
+    Customer,
+    FinancialTransaction,
+    Installment,
+    Loan,
+    Supplier,
+)
+from backend.apps.banking.services.account_balances import rebuild_daily_balances
+from backend.apps.banking.services.cash_flow_rollup import rebuild_tenant_cash_flow
+from backend.apps.banking.services.cet_solver import solve_cet
+from backend.apps.banking.services.financial_calculations import LoanInput, calculate_cet, generate_installments
+from backend.apps.banking.services.seed_context import SEED_SHARD_SIZE, FactoryContext
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import SeedBatch, SeedCheckpoint, SeedDataset, SeedRun
+from backend.apps.tenancy.services.seed_manifest_validator import SeedManifestValidator
+from backend.apps.tenancy.services.seed_rate_limit import SeedRateLimiter
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SEED_CHUNK_SIZE = 5000
+# Teto de parcelas por empréstimo sintético (``number_of_installments`` é smallint e os
+# cronogramas reais do produto vão até 420 meses).
+MAX_SEED_INSTALLMENTS_PER_LOAN = 420
+_TRANSACTION_DATE_SPREAD_DAYS = 90
+_BIRTH_DATE_ORIGIN = date(1960, 1, 1)
+_CENT = Decimal("0.01")
+# Shards sorteados mantidos por plano; o acesso é quase sempre sequencial por entidade.
+_SHARD_CACHE_SIZE = 32
+_GENERATOR_VERSION = "stream-v1"
+
+# Colunas sorteadas por shard, na ordem em que saem do fluxo da entidade: mudar a ordem
+# ou os parâmetros muda os valores gerados (ver notas de migração no runbook de seeds).
+_Draw = Tuple[str, str, Tuple[Any, ...]]
+_DRAWS: Dict[str, Tuple[_Draw, ...]] = {
+    "customers": (("birth", "digits", (4,)), ("document", "digits", (11,)), ("phone", "digits", (11,))),
+    "addresses": (
+        ("zip", "digits", (8,)),
+        ("street", "digits", (6,)),
+        ("number", "digits", (4,)),
+        ("neighborhood", "letters", (3,)),
+        ("city", "letters", (4,)),
+        ("state", "letters", (2,)),
+    ),
+    "bank_accounts": (("agency", "digits", (10,)), ("number", "digits", (20,))),
+    "suppliers": (("document", "digits", (14,)),),
+    "loans": (
+        ("principal", "decimals", (Decimal("5000"), Decimal("15000"))),
+        ("annual_rate", "decimals", (Decimal("10.00"), Decimal("18.00"))),
+    ),
+    "financial_transactions": (("code", "digits", (4,)), ("amount", "decimals", (Decimal("10"), Decimal("500")))),
+    "limits": (("current", "decimals", (Decimal("2000"), Decimal("8000"))),),
+}
+# Colunas mascaradas por FPE no shard inteiro, num único ``mask_many`` por coluna.
+_MASKED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "customers": ("document", "phone"),
+    "addresses": ("zip", "street"),
+    "bank_accounts": ("agency", "number"),
+    "suppliers": ("document",),
+}
+# Entidades com e-mail mascarado (coluna ``email``), pelo prefixo do local-part.
+_EMAIL_PREFIXES: Dict[str, str] = {"customers": "customer", "tenant_users": "tenant-user"}
+
+
+class SeedMaterializationError(RuntimeError):
+    """Batch que não pode ser materializado (entidade desconhecida ou sem entidade-mãe)."""
+
+
+@dataclass(slots=True)
+class _Plan:
+    """
+    Estado compartilhado pelos geradores de linha de um seed run. Os ids são derivados
+    de (entidade, índice) e do seed do contexto, então filhos apontam para as mães sem
+    consultar o banco e a mesma execução gera sempre as mesmas linhas. Os valores
+    sorteados saem em lote do fluxo da (entidade, shard) e ficam em cache no plano.
+    """
+
+    context: FactoryContext
+    caps: Dict[str, int]
+    now: datetime
+    row_seed: int
+    user_ids: List[int] = field(default_factory=list)
+    shards: Dict[Tuple[str, int], Dict[str, List[Any]]] = field(default_factory=dict)
+
+    def row_id(self, entity: str, index: int) -> uuid.UUID:
+        digest = hashlib.sha256(f"{entity}|{index}|{self.row_seed}".encode()).digest()
+        return uuid.UUID(bytes=digest[:16], version=4)
+
+    def draw(self, entity: str, column: str, index: int) -> Any:
+        """Valor sorteado de ``column`` para a linha ``index``, a partir do shard da linha."""
+        shard, offset = divmod(index, SEED_SHARD_SIZE)
+        columns = self.shards.get((entity, shard))
+        if columns is None:
+            if len(self.shards) >= _SHARD_CACHE_SIZE:
+                self.shards.pop(next(iter(self.shards)))
+            columns = self._draw_shard(entity, shard)
+            self.shards[(entity, shard)] = columns
+        return columns[column][offset]
+
+    def _draw_shard(self, entity: str, shard: int) -> Dict[str, List[Any]]:
+        stream = self.context.stream(entity, shard)
+        columns = {name: getattr(stream, method)(SEED_SHARD_SIZE, *args) for name, method, args in _DRAWS.get(entity, ())}
+        for name in _MASKED_COLUMNS.get(entity, ()):
+            columns[name] = self.context.mask_many(columns[name])
+        if entity in _EMAIL_PREFIXES:
+            first = shard * SEED_SHARD_SIZE
+            suffixes = (str(index) for index in range(first, first + SEED_SHARD_SIZE))
+            columns["email"] = self.context.masked_emails(_EMAIL_PREFIXES[entity], suffixes)
+        return columns
+
+    def parent_index(self, entity: str, index: int) -> int:
+        cap = self.caps.get(entity, 0)
+        if cap < 1:
+            raise SeedMaterializationError(f"Manifesto sem volumetria de {entity}, exigida pelas entidades filhas.")
+        return index % cap
+
+    def parent_id(self, entity: str, index: int) -> uuid.UUID:
+        return self.row_id(entity, self.parent_index(entity, index))
+
+    @property
+    def installments_per_loan(self) -> int:
+        loans = max(1, self.caps.get("loans", 0))
+        per_loan = -(-self.caps.get("installments", 0) // loans)
+        return min(MAX_SEED_INSTALLMENTS_PER_LOAN, max(1, per_loan))
+
+
+@dataclass(frozen=True, slots=True)
+class _EntitySpec:
+    model: Type[models.Model]
+    fields: Tuple[str, ...]
+    build_row: Callable[[_Plan, int], Tuple[Any, ...]]
+    tenant_scoped: bool = True
+
+    def copy_sql(self) -> str:
+        columns = tuple(self.model._meta.get_field(name).column for name in self.fields)
+        if self.tenant_scoped:
+            columns = ("id", "tenant_id", *columns, "created_at", "updated_at")
+        return f"COPY {self.model._meta.db_table} ({', '.join(columns)}) FROM STDIN"
+
+    def full_row(self, plan: _Plan, entity: str, index: int) -> Tuple[Any, ...]:
+        values = self.build_row(plan, index)
+        if not self.tenant_scoped:
+            return values
+        return (plan.row_id(entity, index), plan.context.tenant_uuid, *values, plan.now, plan.now)
+
+
+@dataclass(slots=True)
+class MaterializationResult:
+    entity: str
+    rows: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    throttled_seconds: float = 0.0
+    resumed_from: int = 0
+    skipped: bool = False
+
+    @property
+    def total_rows(self) -> int:
+        """Linhas da entidade no banco ao fim do batch, somando as gravadas antes do resume."""
+        return self.resumed_from + self.rows
+
+    @property
+    def rows_per_second(self) -> Decimal:
+        if self.elapsed_seconds <= 0:
+            return Decimal("0.00")
+        return Decimal(self.rows / self.elapsed_seconds).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "entity": self.entity,
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "resumed_from": self.resumed_from,
+            "rows_per_second": str(self.rows_per_second),
+            "skipped": self.skipped,
+        }
+
+
+def _username_prefix(context: FactoryContext) -> str:
+    return f"seed-{context.tenant_slug}-{context.environment}-"
+
+
+def _loan_request(plan: _Plan, index: int) -> LoanInput:
+    context = plan.context
+    return LoanInput(
+        principal_amount=plan.draw("loans", "principal", index),
+        annual_rate_pct=plan.draw("loans", "annual_rate", index),
+        number_of_installments=plan.installments_per_loan,
+        contract_date=context.reference_date,
+        first_installment_date=context.reference_date + timedelta(days=30),
+    )
+
+
+def _tenant_user_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    context = plan.context
+    return (
+        "!",  # senha inutilizável: usuários de seed não fazem login
+        False,
+        f"{_username_prefix(context)}{index:06d}",
+        "Seed",
+        f"{index:06d}",
+        plan.draw("tenant_users", "email", index),
+        False,
+        True,
+        plan.now,
+    )
+
+
+def _customer_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    context = plan.context
+    birth_offset = int(plan.draw("customers", "birth", index))
+    return (
+        f"Customer-{context.tenant_slug}-{index:06d}",
+        plan.draw("customers", "document", index),
+        _BIRTH_DATE_ORIGIN + timedelta(days=birth_offset),
+        plan.draw("customers", "email", index),
+        plan.draw("customers", "phone", index),
+        Customer.Status.ACTIVE,
+    )
+
+
+def _address_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    return (
+        plan.parent_id("customers", index),
+        plan.draw("addresses", "zip", index),
+        f"Rua {plan.draw('addresses', 'street', index)}",
+        plan.draw("addresses", "number", index),
+        None,
+        f"Bairro {plan.draw('addresses', 'neighborhood', index)}",
+        f"Cidade {plan.draw('addresses', 'city', index)}",
+        plan.draw("addresses", "state", index),
+        # Primeira volta sobre os clientes: um endereço principal por cliente.
+        index < plan.caps.get("customers", 0),
+    )
+
+
+def _consultant_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    if not plan.user_ids:
+        raise SeedMaterializationError("consultants exige tenant_users materializados antes.")
+    return (plan.user_ids[index % len(plan.user_ids)], Decimal("0.00"))
+
+
+def _bank_account_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    return (
+        plan.parent_id("customers", index),
+        f"Conta {index:06d}",
+        plan.draw("bank_accounts", "agency", index),
+        plan.draw("bank_accounts", "number", index),
+        Decimal("1000.00"),
+        BankAccount.AccountType.CHECKING,
+        BankAccount.Status.ACTIVE,
+    )
+
+
+def _account_category_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    return (f"C{index:05d}", f"Categoria C{index:05d}", index == 0)
+
+
+def _supplier_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    context = plan.context
+    return (
+        f"Fornecedor {context.tenant_slug}-{index:06d}",
+        plan.draw("suppliers", "document", index),
+        Supplier.Status.ACTIVE,
+    )
+
+
+def _loan_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    request = _loan_request(plan, index)
+    breakdown = calculate_cet(request)
+    cet = solve_cet(request)
+    return (
+        plan.parent_id("customers", index),
+        plan.parent_id("consultants", index),
+        request.principal_amount,
+        (request.annual_rate_pct / Decimal("12")).quantize(_CENT, rounding=ROUND_HALF_UP),
+        request.number_of_installments,
+        request.contract_date,
+        request.first_installment_date,
+        Loan.Status.IN_PROGRESS,
+        breakdown.iof_amount,
+        cet.cet_annual_rate,
+        cet.cet_monthly_rate,
+    )
+
+
+def _installment_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    loan_index, position = divmod(index, plan.installments_per_loan)
+    # O cronograma sai do cache de processo: uma cotação por empréstimo, não por parcela.
+    quote = generate_installments(_loan_request(plan, loan_index))[position]
+    return (
+        plan.parent_id("loans", loan_index),
+        quote.number,
+        quote.due_date,
+        quote.amount,
+        Decimal("0.00"),
+        None,
+        Installment.Status.PENDING,
+    )
+
+
+def _financial_transaction_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    context = plan.context
+    transaction_date = context.reference_date - timedelta(days=index % _TRANSACTION_DATE_SPREAD_DAYS)
+    return (
+        f"Transacao {plan.draw('financial_transactions', 'code', index)}",
+        plan.draw("financial_transactions", "amount", index),
+        transaction_date,
+        True,
+        transaction_date,
+        FinancialTransaction.TransactionType.EXPENSE,
+        plan.parent_id("bank_accounts", index),
+        plan.parent_id("account_categories", index),
+        plan.parent_id("suppliers", index),
+        plan.parent_id("installments", index),
+        None,
+    )
+
+
+def _credit_limit_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    current_limit = plan.draw("limits", "current", index)
+    return (
+        plan.parent_id("bank_accounts", index),
+        current_limit,
+        (current_limit * Decimal("0.10")).quantize(_CENT),
+        CreditLimit.Status.ACTIVE,
+        plan.context.reference_date,
+        plan.context.reference_date + timedelta(days=365),
+    )
+
+
+def _contract_row(plan: _Plan, index: int) -> Tuple[Any, ...]:
+    context = plan.context
+    account_index = plan.parent_index("bank_accounts", index)
+    customer_index = plan.parent_index("customers", account_index)
+    body = {
+        "tenant": str(context.tenant_uuid),
+        "sequence": index,
+        "account_ref": str(plan.row_id("bank_accounts", account_index)),
+        "customer_ref": str(plan.row_id("customers", customer_index)),
+        "masked_account_number": plan.draw("bank_accounts", "number", account_index),
+        "masked_document": plan.draw("customers", "document", customer_index),
+    }
+    payload = json.dumps(body, sort_keys=True)
+    return (
+        plan.row_id("bank_accounts", account_index),
+        plan.row_id("customers", customer_index),
+        payload,
+        hashlib.sha256(payload.encode()).hexdigest(),
+        "1.0.0",
+        datetime.combine(context.reference_date, datetime.min.time(), tzinfo=dt_timezone.utc),
+        Contract.Status.ACTIVE,
+        True,
+    )
+
+
+ENTITY_SPECS: Dict[str, _EntitySpec] = {
+    "tenant_users": _EntitySpec(
+        model=get_user_model(),
+        fields=(
+            "password",
+            "is_superuser",
+            "username",
+            "first_name",
+            "last_name",
+            "email",
+            "is_staff",
+            "is_active",
+            "date_joined",
+        ),
+        build_row=_tenant_user_row,
+        tenant_scoped=False,
+    ),
+    "customers": _EntitySpec(
+        model=Customer,
+        fields=("name", "document_number", "birth_date", "email", "phone", "status"),
+        build_row=_customer_row,
+    ),
+    "addresses": _EntitySpec(
+        model=Address,
+        fields=(
+            "customer",
+            "zip_code",
+            "street",
+            "number",
+            "complement",
+            "neighborhood",
+            "city",
+            "state",
+            "is_primary",
+        ),
+        build_row=_address_row,
+    ),
+    "consultants": _EntitySpec(
+        model=Consultant,
+        fields=("user", "balance"),
+        build_row=_consultant_row,
+    ),
+    "bank_accounts": _EntitySpec(
+        model=BankAccount,
+        fields=("customer", "name", "agency", "account_number", "initial_balance", "type", "status"),
+        build_row=_bank_account_row,
+    ),
+    "account_categories": _EntitySpec(
+        model=AccountCategory,
+        fields=("code", "description", "is_default"),
+        build_row=_account_category_row,
+    ),
+    "suppliers": _EntitySpec(
+        model=Supplier,
+        fields=("name", "document_number", "status"),
+        build_row=_supplier_row,
+    ),
+    "loans": _EntitySpec(
+        model=Loan,
+        fields=(
+            "customer",
+            "consultant",
+            "principal_amount",
+            "interest_rate",
+            "number_of_installments",
+            "contract_date",
+            "first_installment_date",
+            "status",
+            "iof_amount",
+            "cet_annual_rate",
+            "cet_monthly_rate",
+        ),
+        build_row=_loan_row,
+    ),
+    "installments": _EntitySpec(
+        model=Installment,
+        fields=(
+            "loan",
+            "installment_number",
+            "due_date",
+            "amount_due",
+            "amount_paid",
+            "payment_date",
+            "status",
+        ),
+        build_row=_installment_row,
+    ),
+    "financial_transactions": _EntitySpec(
+        model=FinancialTransaction,
+        fields=(
+            "description",
+            "amount",
+            "transaction_date",
+            "is_paid",
+            "payment_date",
+            "type",
+            "bank_account",
+            "category",
+            "supplier",
+            "installment",
+            "posted_at",
+        ),
+        build_row=_financial_transaction_row,
+    ),
+    "limits": _EntitySpec(
+        model=CreditLimit,
+        fields=(
+            "bank_account",
+            "current_limit",
+            "used_amount",
+            "status",
+            "effective_from",
+            "effective_through",
+        ),
+        build_row=_credit_limit_row,
+    ),
+    "contracts": _EntitySpec(
+        model=Contract,
+        fields=(
+            "bank_account",
+            "customer",
+            "body",
+            "etag_payload",
+            "version",
+            "signed_at",
+            "status",
+            "pii_redacted",
+        ),
+        build_row=_contract_row,
+    ),
+}
+
+# ``COPY`` não dispara os sinais que mantêm as projeções; elas são recalculadas de uma
+# vez depois das entidades de origem.
+_REBUILDS: Dict[str, Tuple[Callable[[uuid.UUID], int], ...]] = {
+    "installments": (rebuild_tenant_cash_flow,),
+    "financial_transactions": (rebuild_daily_balances, rebuild_tenant_cash_flow),
+}
+
+
+def entity_dependencies() -> Dict[str, Tuple[str, ...]]:
+    """
+    DAG das entidades de seed (entidade -> entidades-mãe) derivado das FKs dos models:
+    uma entidade só pode ser gravada depois das entidades que ela referencia.
+    """
+    entity_by_model = {spec.model: entity for entity, spec in ENTITY_SPECS.items()}
+    graph: Dict[str, Tuple[str, ...]] = {}
+    for entity, spec in ENTITY_SPECS.items():
+        parents = [
+            entity_by_model[field.related_model]
+            for field in spec.model._meta.concrete_fields
+            if field.is_relation and entity_by_model.get(field.related_model, entity) != entity
+        ]
+        graph[entity] = tuple(dict.fromkeys(parents))
+    return graph
+
+
+def _checkpoint_hash(entity: str, next_index: int, row_seed: int) -> str:
+    # A versão do gerador entra no hash: checkpoints de outro layout de sorteio não são retomados.
+    return hashlib.sha256(f"{entity}|{next_index}|{row_seed}|{_GENERATOR_VERSION}".encode()).hexdigest()
+
+
+def last_sealed_checkpoint(batch: SeedBatch) -> Optional[SeedCheckpoint]:
+    """Checkpoint selado mais avançado da entidade do batch no seed run."""
+    with use_tenant(batch.tenant_id):
+        return (
+            SeedCheckpoint.objects.filter(seed_run_id=batch.seed_run_id, entity=batch.entity, sealed=True)
+            .order_by("-percentual_concluido", "-created_at")
+            .first()
+        )
+
+
+def _materialized_rows(batch: SeedBatch) -> int:
+    checkpoint = last_sealed_checkpoint(batch)
+    if checkpoint is None:
+        return 0
+    return int(json.loads(bytes(checkpoint.resume_token)).get("next_index", 0))
+
+
+def _with_dependents(entities: Iterable[str]) -> List[str]:
+    """Entidades pedidas e as que dependem delas no DAG, das filhas para as mães."""
+    graph = entity_dependencies()
+    ordered: List[str] = []
+
+    def visit(entity: str) -> None:
+        if entity in ordered:
+            return
+        for child, parents in graph.items():
+            if entity in parents:
+                visit(child)
+        ordered.append(entity)
+
+    for entity in entities:
+        visit(entity)
+    return ordered
+
+
+def _delete_seed_rows(plan: _Plan, entity: str, count: int) -> int:
+    spec = ENTITY_SPECS[entity]
+    if spec.tenant_scoped:
+        column, keys = "id", [plan.row_id(entity, index) for index in range(count)]
+    else:
+        column, keys = "username", [f"{_username_prefix(plan.context)}{index:06d}" for index in range(count)]
+    deleted = 0
+    with connection.cursor() as cursor:
+        for start in range(0, count, DEFAULT_SEED_CHUNK_SIZE):
+            cursor.execute(
+                f"DELETE FROM {spec.model._meta.db_table} WHERE {column} = ANY(%s)",
+                [keys[start : start + DEFAULT_SEED_CHUNK_SIZE]],
+            )
+            deleted += cursor.rowcount
+    return deleted
+
+
+def _batches_to_reset(seed_run: SeedRun, entities: Optional[Iterable[str]]) -> Dict[str, SeedBatch]:
+    locked = {batch.entity: batch for batch in SeedBatch.objects.select_for_update().filter(seed_run_id=seed_run.id)}
+    batches = {entity: locked[entity] for entity in _with_dependents(entities or locked) if entity in locked}
+    busy = [entity for entity, batch in batches.items() if batch.status == SeedBatch.Status.PROCESSING]
+    if busy:
+        raise SeedMaterializationError(f"Batches em processamento não podem ser desfeitos: {', '.join(busy)}.")
+    return batches
+
+
+def reset_seed_batches(seed_run: SeedRun, entities: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Desfaz o que os batches do seed run gravaram para que recomecem do índice 0: apaga
+    as linhas ``_Plan.row_id(entidade, i)`` para ``i`` até o ``next_index`` do
+    checkpoint selado mais avançado, apaga os checkpoints da entidade e volta o batch
+    para ``pending``, tudo numa transação. Entidades dependentes entram junto (as
+    filhas antes das mães), já que apontam para as linhas apagadas.
+
+    Serve para reprocessar batches de um gerador anterior e para rodar de novo um
+    manifesto já materializado no tenant, cujas linhas têm os mesmos ids. Retorna as
+    linhas apagadas por entidade.
+    """
+    with use_tenant(seed_run.tenant_id), transaction.atomic():
+        batches = _batches_to_reset(seed_run, entities)
+        context = context_for_seed_run(seed_run)
+        plan = _Plan(context=context, caps={}, now=timezone.now(), row_seed=context.factory_seed)
+        deleted = {entity: _delete_seed_rows(plan, entity, _materialized_rows(batch)) for entity, batch in batches.items()}
+        SeedCheckpoint.objects.filter(seed_run_id=seed_run.id, entity__in=list(batches)).delete()
+        SeedBatch.objects.filter(id__in=[batch.id for batch in batches.values()]).update(
+            status=SeedBatch.Status.PENDING,
+            next_retry_at=None,
+            updated_at=plan.now,
+        )
+        # Como no ``COPY``, o ``DELETE`` direto não passa pelos sinais das projeções.
+        for rebuild in dict.fromkeys(rebuild for entity in batches for rebuild in _REBUILDS.get(entity, ())):
+            rebuild(seed_run.tenant_id)
+    logger.info("seed_batches_reset", seed_run_id=str(seed_run.id), deleted=deleted)
+    return deleted
+
+
+def _seal_chunk(batch: SeedBatch, plan: _Plan, next_index: int, target: int) -> SeedCheckpoint:
+    """
+    Sela o checkpoint do chunk gravado. O token guarda a posição do gerador: como as
+    linhas derivam só de (entidade, índice, seed), ``next_index`` basta para retomar.
+    """
+    percentual = Decimal(100)
+    if target:
+        percentual = (Decimal(next_index * 100) / target).quantize(_CENT, rounding=ROUND_DOWN)
+    token = {"entity": batch.entity, "next_index": next_index, "target": target, "row_seed": plan.row_seed}
+    return SeedCheckpoint.objects.create(
+        tenant_id=batch.tenant_id,
+        seed_run_id=batch.seed_run_id,
+        entity=batch.entity,
+        hash_estado=_checkpoint_hash(batch.entity, next_index, plan.row_seed),
+        resume_token=json.dumps(token, sort_keys=True).encode(),
+        percentual_concluido=percentual,
+        sealed=True,
+    )
+
+
+def context_for_seed_run(seed_run: SeedRun) -> FactoryContext:
+    profile = seed_run.seed_profile
+    return FactoryContext(
+        tenant_id=str(seed_run.tenant_id),
+        environment=seed_run.environment,
+        manifest_version=profile.version,
+        salt_version=profile.salt_version,
+        reference_date=seed_run.reference_datetime.date(),
+    )
+
+
+def _row_limit(entity: str, plan: _Plan, requested: int) -> int:
+    if entity == "limits":
+        # Um limite por conta (``unique_together`` tenant/conta).
+        return min(requested, plan.caps.get("bank_accounts", 0))
+    if entity == "installments":
+        return min(requested, max(1, plan.caps.get("loans", 0)) * plan.installments_per_loan)
+    return requested
+
+
+class SeedMaterializer:
+    """
+    Gera as linhas de cada entidade de um ``SeedBatch`` a partir do ``FactoryContext``
+    determinístico do seed run e grava com ``COPY FROM STDIN`` em chunks de
+    ``chunk_size``, até o cap da volumetria do manifesto. Cada chunk consome uma
+    requisição do ``rate_limit`` do manifesto e é gravado na mesma transação que sela
+    o seu ``SeedCheckpoint``; um batch que falhou retoma do último checkpoint selado
+    sem regerar os chunks já gravados. O checkpoint de 100% libera as entidades
+    dependentes no DAG.
+
+    Ao fim do batch registra em ``SeedDataset`` a volumetria prevista e a real, o
+    drift entre elas e a vazão da entidade em linhas por segundo.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_SEED_CHUNK_SIZE, *, sleep: Callable[[float], None] = time.sleep) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size da materialização de seed deve ser positivo.")
+        self.chunk_size = chunk_size
+        self.sleep = sleep
+
+    def materialize_batch(self, batch: SeedBatch) -> MaterializationResult:
+        seed_run = batch.seed_run
+        # Retry agendado e liberação pelo DAG podem entregar o mesmo batch duas vezes.
+        if seed_run.dry_run or batch.status == SeedBatch.Status.COMPLETED:
+            return MaterializationResult(entity=batch.entity, skipped=True)
+        spec = ENTITY_SPECS.get(batch.entity)
+        if spec is None:
+            raise SeedMaterializationError(f"Entidade de seed sem materializador: {batch.entity}.")
+
+        plan = self._plan(seed_run, batch.entity)
+        target = _row_limit(batch.entity, plan, batch.batch_size)
+        start = self._resume_index(batch, plan, target)
+        self._mark_started(batch)
+        try:
+            result = self._write(spec, plan, batch, (start, target), SeedRateLimiter(seed_run.seed_profile, sleep=self.sleep))
+        except Exception:
+            self._set_batch_status(batch, SeedBatch.Status.FAILED)
+            raise
+        for rebuild in _REBUILDS.get(batch.entity, ()):
+            rebuild(seed_run.tenant_id)
+        self._record_dataset(batch, result)
+        self._mark_completed(batch)
+        logger.info("seed_batch_materialized", seed_run_id=str(seed_run.id), **result.as_dict())
+        return result
+
+    def _plan(self, seed_run: SeedRun, entity: str) -> _Plan:
+        context = context_for_seed_run(seed_run)
+        plan = _Plan(
+            context=context,
+            caps=SeedManifestValidator.extract_caps({"volumetry": seed_run.seed_profile.volumetry}),
+            now=timezone.now(),
+            row_seed=context.factory_seed,
+        )
+        if entity == "consultants":
+            plan.user_ids = list(
+                get_user_model()
+                .objects.filter(username__startswith=_username_prefix(context))
+                .order_by("username")
+                .values_list("id", flat=True),
+            )
+        return plan
+
+    @staticmethod
+    def _resume_index(batch: SeedBatch, plan: _Plan, target: int) -> int:
+        checkpoint = last_sealed_checkpoint(batch)
+        if checkpoint is None:
+            return 0
+        token = json.loads(bytes(checkpoint.resume_token))
+        next_index = int(token.get("next_index", 0))
+        if checkpoint.hash_estado != _checkpoint_hash(batch.entity, next_index, plan.row_seed):
+            raise SeedMaterializationError(
+                f"Checkpoint {checkpoint.id} de {batch.entity} não corresponde ao gerador do seed run; retomada abortada.",
+            )
+        return min(next_index, target)
+
+    def _write(
+        self,
+        spec: _EntitySpec,
+        plan: _Plan,
+        batch: SeedBatch,
+        bounds: Tuple[int, int],
+        rate_limiter: SeedRateLimiter,
+    ) -> MaterializationResult:
+        start, target = bounds
+        entity = batch.entity
+        result = MaterializationResult(entity=entity, resumed_from=start)
+        sql = spec.copy_sql()
+        started = time.perf_counter()
+        with use_tenant(plan.context.tenant_uuid):
+            if target == 0:
+                _seal_chunk(batch, plan, 0, 0)
+            for chunk_start in range(start, target, self.chunk_size):
+                stop = min(target, chunk_start + self.chunk_size)
+                result.throttled_seconds += rate_limiter.acquire()
+                with transaction.atomic():
+                    with connection.cursor() as cursor, cursor.copy(sql) as copy:
+                        for index in range(chunk_start, stop):
+                            copy.write_row(spec.full_row(plan, entity, index))
+                    _seal_chunk(batch, plan, stop, target)
+                result.rows += stop - chunk_start
+                result.chunks += 1
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+    def _record_dataset(self, batch: SeedBatch, result: MaterializationResult) -> None:
+        profile = batch.seed_run.seed_profile
+        expected = batch.batch_size
+        drift = Decimal(0)
+        if expected:
+            drift = (Decimal(abs(expected - result.total_rows)) * 100 / expected).quantize(_CENT, rounding=ROUND_HALF_UP)
+        with use_tenant(batch.tenant_id):
+            SeedDataset.objects.update_or_create(
+                tenant_id=batch.tenant_id,
+                seed_run=batch.seed_run,
+                entity=batch.entity,
+                defaults={
+                    "volumetria_prevista": expected,
+                    "volumetria_real": result.total_rows,
+                    "throughput_rows_per_second": result.rows_per_second,
+                    "slo_target_p95": profile.slo_p95_ms,
+                    "slo_target_p99": profile.slo_p99_ms,
+                    "drift_percentual": drift,
+                },
+            )
+
+    def _mark_started(self, batch: SeedBatch) -> None:
+        self._set_batch_status(batch, SeedBatch.Status.PROCESSING)
+        with use_tenant(batch.tenant_id):
+            SeedRun.objects.filter(id=batch.seed_run_id, started_at__isnull=True).update(
+                status=SeedRun.Status.RUNNING,
+                started_at=timezone.now(),
+            )
+
+    def _mark_completed(self, batch: SeedBatch) -> None:
+        with use_tenant(batch.tenant_id), transaction.atomic():
+            self._set_batch_status(batch, SeedBatch.Status.COMPLETED)
+            pending = SeedBatch.objects.filter(seed_run_id=batch.seed_run_id).exclude(status=SeedBatch.Status.COMPLETED)
+            if not pending.exists():
+                SeedRun.objects.filter(id=batch.seed_run_id).update(
+                    status=SeedRun.Status.SUCCEEDED,
+                    finished_at=timezone.now(),
+                )
+
+    @staticmethod
+    def _set_batch_status(batch: SeedBatch, status: str) -> None:
+        batch.status = status
+        with use_tenant(batch.tenant_id):
+            SeedBatch.objects.filter(id=batch.id).update(status=status, updated_at=timezone.now())
+
+
+def materialize_seed_batch(batch_id: uuid.UUID | str, *, chunk_size: int = DEFAULT_SEED_CHUNK_SIZE) -> Optional[MaterializationResult]:
+    batch = (
+        SeedBatch.objects.unscoped()
+        .select_related("seed_run", "seed_run__seed_profile")
+        .filter(id=batch_id)
+        .first()
+    )
+    if batch is None:
+        return None
+    return SeedMaterializer(chunk_size=chunk_size).materialize_batch(batch)
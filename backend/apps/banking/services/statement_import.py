@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import csv
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
+from uuid import UUID
+
+import structlog
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backend.apps.banking.models import BankAccount, FinancialTransaction
+from backend.apps.banking.services.account_balances import apply_balance_delta
+from backend.apps.tenancy.managers import TenantIdentifier, use_tenant
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+STATEMENT_FORMATS = ("csv", "ofx")
+WRITE_METHODS = ("copy", "bulk_create")
+
+_DESCRIPTION_MAX_LENGTH = FinancialTransaction._meta.get_field("description").max_length
+_AMOUNT_FIELD = FinancialTransaction._meta.get_field("amount")
+_AMOUNT_LIMIT = Decimal(10) ** (_AMOUNT_FIELD.max_digits - _AMOUNT_FIELD.decimal_places)
+_CENT = Decimal("0.01")
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d")
+_COPY_SQL = (
+    "COPY banking_financial_transaction "
+    "(id, tenant_id, description, amount, transaction_date, is_paid, payment_date, type, bank_account_id, created_at, updated_at) "
+    "FROM STDIN"
+)
+
+
+class StatementImportError(RuntimeError):
+    """
+    Falha no meio da importação; ``offset`` é o último byte já confirmado no banco,
+    ponto de retomada com ``start_offset``.
+    """
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(message)
+        self.offset = offset
+
+
+@dataclass(frozen=True, slots=True)
+class StatementRecord:
+    """Registro bruto do arquivo e o byte logo após ele."""
+
+    end_offset: int
+    values: Dict[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class StatementEntry:
+    transaction_date: date
+    description: str
+    amount: Decimal
+    type: str
+
+    @property
+    def signed_amount(self) -> Decimal:
+        return self.amount if self.type == FinancialTransaction.TransactionType.INCOME else -self.amount
+
+
+@dataclass(slots=True)
+class ImportResult:
+    rows_imported: int = 0
+    rows_rejected: int = 0
+    chunks: int = 0
+    next_offset: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "rows_imported": self.rows_imported,
+            "rows_rejected": self.rows_rejected,
+            "chunks": self.chunks,
+            "next_offset": self.next_offset,
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "errors": list(self.errors),
+        }
+
+
+def _lines(handle: BinaryIO) -> Iterator[tuple[int, str]]:
+    for raw in iter(handle.readline, b""):
+        yield handle.tell(), raw.decode("utf-8-sig").strip()
+
+
+def iter_csv_records(handle: BinaryIO, start_offset: int = 0) -> Iterator[StatementRecord]:
+    """
+    CSV com cabeçalho (``date``, ``description``, ``amount``), um registro por linha.
+    Valor negativo é saída; positivo, entrada.
+    """
+    header = handle.readline().decode("utf-8-sig")
+    names = [name.strip().lower() for name in next(csv.reader([header]), [])]
+    if start_offset > handle.tell():
+        handle.seek(start_offset)
+    for end_offset, line in _lines(handle):
+        if line:
+            yield StatementRecord(end_offset, dict(zip(names, next(csv.reader([line])))))
+
+
+def _ofx_tag(line: str) -> tuple[str, str]:
+    tag, _, value = line[1:].partition(">")
+    return tag.upper(), value.split("<", 1)[0].strip()
+
+
+def iter_ofx_records(handle: BinaryIO, start_offset: int = 0) -> Iterator[StatementRecord]:
+    """
+    OFX 1.x (SGML) com uma tag por linha; cada ``<STMTTRN>`` vira um registro.
+    """
+    handle.seek(start_offset)
+    current: Optional[Dict[str, str]] = None
+    for end_offset, line in _lines(handle):
+        tag, value = _ofx_tag(line) if line.startswith("<") else ("", "")
+        if tag == "STMTTRN":
+            current = {}
+        elif tag == "/STMTTRN" and current is not None:
+            yield StatementRecord(
+                end_offset,
+                {
+                    "date": current.get("DTPOSTED", "")[:8],
+                    "amount": current.get("TRNAMT", ""),
+                    "description": current.get("NAME") or current.get("MEMO", ""),
+                },
+            )
+            current = None
+        elif current is not None and tag:
+            current[tag] = value
+
+
+_PARSERS = {"csv": iter_csv_records, "ofx": iter_ofx_records}
+
+
+def _parse_date(value: str) -> date:
+    for pattern in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), pattern).date()
+        except ValueError:
+            continue
+    raise ValueError(f"data inválida: {value!r}")
+
+
+def _parse_amount(value: str) -> Decimal:
+    text = value.strip()
+    if "," in text and "." not in text:
+        text = text.replace(",", ".")
+    try:
+        amount = Decimal(text)
+    except InvalidOperation as exc:
+        raise ValueError(f"valor inválido: {value!r}") from exc
+    if not amount.is_finite() or amount == 0:
+        raise ValueError(f"valor inválido: {value!r}")
+    if amount != amount.quantize(_CENT):
+        raise ValueError(f"valor com mais de duas casas decimais: {value!r}")
+    if abs(amount) >= _AMOUNT_LIMIT:
+        raise ValueError(f"valor excede o limite da coluna: {value!r}")
+    return amount
+
+
+def validate_record(record: StatementRecord) -> StatementEntry:
+    """
+    Aplica as restrições de ``FinancialTransaction`` sem serializer: descrição dentro do
+    tamanho da coluna, valor positivo com duas casas (o sinal define o tipo) e data válida.
+    """
+    description = (record.values.get("description") or "").strip()
+    if not description:
+        raise ValueError("descrição vazia")
+    if len(description) > _DESCRIPTION_MAX_LENGTH:
+        raise ValueError(f"descrição com mais de {_DESCRIPTION_MAX_LENGTH} caracteres")
+    amount = _parse_amount(record.values.get("amount") or "")
+    return StatementEntry(
+        transaction_date=_parse_date(record.values.get("date") or ""),
+        description=description,
+        amount=abs(amount).quantize(_CENT),
+        type=FinancialTransaction.TransactionType.INCOME if amount > 0 else FinancialTransaction.TransactionType.EXPENSE,
+    )
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix not in STATEMENT_FORMATS:
+        raise ValueError(f"Formato de extrato não suportado: {suffix or path}.")
+    return suffix
+
+
+class StatementImporter:
+    """
+    Importa extratos em streaming: o arquivo é lido registro a registro e gravado em
+    chunks de ``chunk_size`` (``COPY`` ou ``bulk_create``), então a memória não cresce
+    com o tamanho do arquivo.
+
+    Cada chunk é uma transação e termina num limite de registro; ``next_offset`` (ou
+    ``StatementImportError.offset``) é o byte para retomar sem duplicar linhas. Os
+    lançamentos entram pagos, e os snapshots de saldo da conta são ajustados no mesmo
+    chunk.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE, method: str = "copy") -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size da importação de extrato deve ser positivo.")
+        if method not in WRITE_METHODS:
+            raise ValueError(f"Método de escrita inválido: {method}.")
+        self.chunk_size = chunk_size
+        self.method = method
+
+    def import_file(
+        self,
+        tenant_id: TenantIdentifier,
+        bank_account_id: UUID,
+        path: Union[str, Path],
+        *,
+        statement_format: Optional[str] = None,
+        start_offset: int = 0,
+    ) -> ImportResult:
+        parser = _PARSERS[statement_format or detect_format(path)]
+        result = ImportResult(next_offset=start_offset)
+        started = time.perf_counter()
+        with use_tenant(tenant_id), open(path, "rb") as handle:
+            if not BankAccount.objects.filter(id=bank_account_id).exists():
+                raise ValueError(f"Conta {bank_account_id} não encontrada no tenant.")
+            try:
+                self._run(tenant_id, bank_account_id, parser(handle, start_offset), result)
+            except Exception as exc:
+                raise StatementImportError(
+                    f"Importação interrompida; retome a partir do byte {result.next_offset}.",
+                    result.next_offset,
+                ) from exc
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info("banking_statement_import", tenant_id=str(tenant_id), **result.as_dict())
+        return result
+
+    def _run(self, tenant_id: TenantIdentifier, account_id: UUID, records: Iterator[StatementRecord], result: ImportResult) -> None:
+        chunk: List[StatementEntry] = []
+        end_offset = result.next_offset
+        for record in records:
+            end_offset = record.end_offset
+            try:
+                chunk.append(validate_record(record))
+            except ValueError as exc:
+                result.rows_rejected += 1
+                if len(result.errors) < MAX_REPORTED_ERRORS:
+                    result.errors.append(f"byte {record.end_offset}: {exc}")
+            if len(chunk) >= self.chunk_size:
+                self._commit(tenant_id, account_id, chunk, end_offset, result)
+                chunk = []
+        self._commit(tenant_id, account_id, chunk, end_offset, result)
+
+    def _commit(
+        self,
+        tenant_id: TenantIdentifier,
+        account_id: UUID,
+        entries: Sequence[StatementEntry],
+        end_offset: int,
+        result: ImportResult,
+    ) -> None:
+        if entries:
+            with transaction.atomic():
+                self._write(tenant_id, account_id, entries)
+                deltas: Dict[date, Decimal] = defaultdict(Decimal)
+                for entry in entries:
+                    deltas[entry.transaction_date] += entry.signed_amount
+                for day, delta in sorted(deltas.items()):
+                    apply_balance_delta(tenant_id, account_id, day, delta)
+            result.rows_imported += len(entries)
+            result.chunks += 1
+        result.next_offset = end_offset
+
+    def _write(self, tenant_id: TenantIdentifier, account_id: UUID, entries: Sequence[StatementEntry]) -> None:
+        now = timezone.now()
+        if self.method == "bulk_create":
+            FinancialTransaction.objects.bulk_create(
+                [
+                    FinancialTransaction(
+                        tenant_id=tenant_id,
+                        description=entry.description,
+                        amount=entry.amount,
+                        transaction_date=entry.transaction_date,
+                        is_paid=True,
+                        payment_date=entry.transaction_date,
+                        type=entry.type,
+                        bank_account_id=account_id,
+                    )
+                    for entry in entries
+                ],
+            )
+            return
+        with connection.cursor() as cursor, cursor.copy(_COPY_SQL) as copy:
+            for entry in entries:
+                copy.write_row(
+                    (
+                        uuid.uuid4(),
+                        str(tenant_id),
+                        entry.description,
+                        entry.amount,
+                        entry.transaction_date,
+                        True,
+                        entry.transaction_date,
+                        entry.type,
+                        account_id,
+                        now,
+                        now,
+                    ),
+                )
+
+
+def import_statement(
+    tenant_id: TenantIdentifier,
+    bank_account_id: UUID,
+    path: Union[str, Path],
+    *,
+    statement_format: Optional[str] = None,
+    start_offset: int = 0,
+    chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+    method: str = "copy",
+) -> ImportResult:
+    return StatementImporter(chunk_size=chunk_size, method=method).import_file(
+        tenant_id,
+        bank_account_id,
+        path,
+        statement_format=statement_format,
+        start_offset=start_offset,
+    )
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import structlog
+from django.utils import timezone
+
+from backend.apps.banking.models import Installment, Loan
+from backend.apps.tenancy.managers import TenantIdentifier
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CHUNK_PATHS = 250
+LOSS_QUANTILES = (0.50, 0.95, 0.99)
+CASH_FLOW_QUANTILES = (0.05, 0.50, 0.95)
+_OPEN_LOAN_STATUSES = (Loan.Status.IN_PROGRESS, Loan.Status.IN_COLLECTION)
+
+
+@dataclass(frozen=True, slots=True)
+class StressScenario:
+    """
+    Probabilidades mensais de default e de quitação antecipada, e a perda dado default.
+    """
+
+    monthly_default_probability: float = 0.02
+    monthly_prepayment_probability: float = 0.01
+    loss_given_default: float = 0.6
+
+    def __post_init__(self) -> None:
+        for name in ("monthly_default_probability", "monthly_prepayment_probability", "loss_given_default"):
+            value = getattr(self, name)
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} do cenário de estresse deve estar entre 0 e 1.")
+
+
+@dataclass(slots=True)
+class LoanBook:
+    """
+    Carteira em colunas (CSR): os fluxos do empréstimo ``i`` ocupam
+    ``flow_month/flow_amount[starts[i]:starts[i + 1]]`` em ordem de mês, e
+    ``remaining[k]`` é o saldo de ``k`` até o fim do empréstimo.
+    """
+
+    as_of: date
+    starts: array
+    flow_month: array
+    flow_amount: array
+    remaining: array
+
+    @property
+    def loans(self) -> int:
+        return len(self.starts) - 1
+
+    @property
+    def exposure(self) -> float:
+        return sum(self.remaining[self.starts[index]] for index in range(self.loans) if self.starts[index] < self.starts[index + 1])
+
+    @classmethod
+    def from_flows(cls, as_of: date, loans: Sequence[Sequence[Tuple[int, float]]]) -> "LoanBook":
+        starts, months, amounts, remaining = array("l", [0]), array("l"), array("d"), array("d")
+        for flows in loans:
+            ordered = sorted(flows)
+            months.extend(month for month, _ in ordered)
+            amounts.extend(amount for _, amount in ordered)
+            tail = 0.0
+            suffix = []
+            for _, amount in reversed(ordered):
+                tail += amount
+                suffix.append(tail)
+            remaining.extend(reversed(suffix))
+            starts.append(len(months))
+        return cls(as_of=as_of, starts=starts, flow_month=months, flow_amount=amounts, remaining=remaining)
+
+    @classmethod
+    def synthetic(cls, loans: int, installments: int = 24, amount: float = 500.0, seed: int = 0) -> "LoanBook":
+        rng = random.Random(seed)
+        book = []
+        for _ in range(loans):
+            elapsed = rng.randrange(installments)
+            book.append([(month, amount) for month in range(installments - elapsed)])
+        return cls.from_flows(date(2000, 1, 1), book)
+
+
+def _months_between(start: date, end: date) -> int:
+    return max((end.year - start.year) * 12 + end.month - start.month, 0)
+
+
+def load_loan_book(tenant_id: TenantIdentifier, as_of: Optional[date] = None) -> LoanBook:
+    """
+    Lê uma única vez as parcelas em aberto dos empréstimos ativos do tenant.
+    """
+    as_of = as_of or timezone.localdate()
+    rows = (
+        Installment.objects.scoped(tenant_id)
+        .filter(loan__status__in=_OPEN_LOAN_STATUSES)
+        .exclude(status=Installment.Status.PAID)
+        .order_by("loan_id", "due_date")
+        .values_list("loan_id", "due_date", "amount_due", "amount_paid")
+        .iterator(chunk_size=5000)
+    )
+    grouped: Dict[UUID, List[Tuple[int, float]]] = {}
+    for loan_id, due_date, amount_due, amount_paid in rows:
+        open_amount = float(amount_due - amount_paid)
+        if open_amount > 0:
+            grouped.setdefault(loan_id, []).append((_months_between(as_of, due_date), open_amount))
+    return LoanBook.from_flows(as_of, list(grouped.values()))
+
+
+def _log_survival(probability: float) -> float:
+    # log(1 - p) para sortear o mês do evento de forma geométrica: um número aleatório
+    # por empréstimo em vez de um por mês do prazo. 0 = nunca; -inf = no mês 0.
+    if probability <= 0:
+        return 0.0
+    if probability >= 1:
+        return -math.inf
+    return math.log(1.0 - probability)
+
+
+def _event_month(draw: float, log_survival: float) -> float:
+    if log_survival == 0.0:
+        return math.inf
+    return math.floor(math.log(1.0 - draw) / log_survival)
+
+
+def _simulate_paths(book: LoanBook, scenario: StressScenario, seed: int, paths: int) -> Tuple[List[float], List[float]]:
+    rng = random.Random(seed)
+    draw = rng.random
+    flow_month, remaining = book.flow_month, book.remaining
+    spans = [(book.starts[index], book.starts[index + 1]) for index in range(book.loans) if book.starts[index] < book.starts[index + 1]]
+    default_log = _log_survival(scenario.monthly_default_probability)
+    prepay_log = _log_survival(scenario.monthly_prepayment_probability)
+    lgd = scenario.loss_given_default
+    losses: List[float] = []
+    cash: List[float] = []
+    for _ in range(paths):
+        path_loss = 0.0
+        path_cash = 0.0
+        for first, last in spans:
+            default_at = _event_month(draw(), default_log)
+            prepay_at = _event_month(draw(), prepay_log)
+            cut = bisect_left(flow_month, min(default_at, prepay_at), first, last)
+            open_after = remaining[cut] if cut < last else 0.0
+            path_cash += remaining[first] - open_after
+            if default_at < prepay_at:
+                path_loss += open_after * lgd
+                open_after -= open_after * lgd
+            path_cash += open_after
+        losses.append(path_loss)
+        cash.append(path_cash)
+    return losses, cash
+
+
+_WORKER_STATE: Optional[Tuple[LoanBook, StressScenario]] = None
+
+
+def _init_worker(book: LoanBook, scenario: StressScenario) -> None:
+    # A carteira vai uma vez para cada processo; as tarefas levam só (semente, caminhos).
+    global _WORKER_STATE
+    _WORKER_STATE = (book, scenario)
+
+
+def _run_chunk(task: Tuple[int, int]) -> Tuple[List[float], List[float]]:
+    if _WORKER_STATE is None:
+        raise RuntimeError("Processo de simulação sem carteira: o pool deve usar _init_worker como initializer.")
+    book, scenario = _WORKER_STATE
+    return _simulate_paths(book, scenario, *task)
+
+
+def _quantile(ordered: Sequence[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+@dataclass(frozen=True, slots=True)
+class StressResult:
+    paths: int
+    loans: int
+    exposure: float
+    expected_loss: float
+    loss_quantiles: Dict[str, float]
+    cash_flow_quantiles: Dict[str, float]
+    elapsed_seconds: float
+
+    @property
+    def paths_per_second(self) -> float:
+        return self.paths / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "paths": self.paths,
+            "loans": self.loans,
+            "exposure": round(self.exposure, 2),
+            "expected_loss": round(self.expected_loss, 2),
+            "loss_quantiles": {key: round(value, 2) for key, value in self.loss_quantiles.items()},
+            "cash_flow_quantiles": {key: round(value, 2) for key, value in self.cash_flow_quantiles.items()},
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "paths_per_second": round(self.paths_per_second, 1),
+        }
+
+
+class StressSimulator:
+    """
+    Monte Carlo de default e quitação antecipada sobre a carteira inteira.
+
+    Os caminhos rodam em chunks de ``chunk_paths`` com semente própria (``seed + chunk``),
+    então o resultado é reprodutível e independe do número de processos. Com
+    ``workers > 1`` os chunks são distribuídos num ``ProcessPoolExecutor``. Os valores
+    são ``float``: a saída é estatística e dispensa a precisão de ``Decimal``.
+    """
+
+    def __init__(self, chunk_paths: int = DEFAULT_CHUNK_PATHS, workers: int = 1, seed: int = 0) -> None:
+        if chunk_paths < 1:
+            raise ValueError("chunk_paths do simulador de estresse deve ser positivo.")
+        if workers < 1:
+            raise ValueError("workers do simulador de estresse deve ser positivo.")
+        self.chunk_paths = chunk_paths
+        self.workers = workers
+        self.seed = seed
+
+    def _tasks(self, paths: int) -> Iterator[Tuple[int, int]]:
+        for chunk, start in enumerate(range(0, paths, self.chunk_paths)):
+            yield self.seed + chunk, min(self.chunk_paths, paths - start)
+
+    def _run(self, book: LoanBook, scenario: StressScenario, paths: int) -> Iterator[Tuple[List[float], List[float]]]:
+        if self.workers == 1:
+            for seed, size in self._tasks(paths):
+                yield _simulate_paths(book, scenario, seed, size)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(book, scenario)) as pool:
+            yield from pool.map(_run_chunk, self._tasks(paths))
+
+    def simulate(self, book: LoanBook, scenario: StressScenario, paths: int) -> StressResult:
+        if paths < 1:
+            raise ValueError("paths do simulador de estresse deve ser positivo.")
+        started = time.perf_counter()
+        losses: List[float] = []
+        cash: List[float] = []
+        for chunk_losses, chunk_cash in self._run(book, scenario, paths):
+            losses.extend(chunk_losses)
+            cash.extend(chunk_cash)
+        elapsed = time.perf_counter() - started
+
+        losses.sort()
+        cash.sort()
+        result = StressResult(
+            paths=paths,
+            loans=book.loans,
+            exposure=book.exposure,
+            expected_loss=sum(losses) / paths,
+            loss_quantiles={f"p{round(q * 100)}": _quantile(losses, q) for q in LOSS_QUANTILES},
+            cash_flow_quantiles={f"p{round(q * 100)}": _quantile(cash, q) for q in CASH_FLOW_QUANTILES},
+            elapsed_seconds=elapsed,
+        )
+        logger.info("banking_stress_simulation", workers=self.workers, **result.as_dict())
+        return result
+
+
+def simulate_tenant_stress(
+    tenant_id: TenantIdentifier,
+    scenario: StressScenario,
+    paths: int,
+    *,
+    as_of: Optional[date] = None,
+    workers: int = 1,
+    seed: int = 0,
+) -> StressResult:
+    return StressSimulator(workers=workers, seed=seed).simulate(load_loan_book(tenant_id, as_of), scenario, paths)
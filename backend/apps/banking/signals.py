@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from backend.apps.tenancy.models import Tenant
+
+from .models import FinancialTransaction, Installment, Loan
+from .services.account_balances import apply_transaction_change, transaction_effect
+from .services.cash_flow_rollup import refresh_cash_flow_days
+from .services.packed_schedule import refresh_packed_schedule_on_commit
+
+# Mantém ``BankAccountDailyBalance``, ``CashFlowDailyRollup`` e ``Loan.packed_schedule`` em
+# dia a cada registro salvo pelo ORM; o cronograma empacotado é refeito uma vez por
+# empréstimo, no commit. Operações em lote (``bulk_create``/``update``) não disparam sinais:
+# nesses fluxos chame o recálculo explicitamente ou use os comandos de reconstrução.
+
+
+def _removing_tenant(origin) -> bool:
+    # Exclusão em cascata do tenant leva junto os agregados; não há o que recalcular.
+    return isinstance(origin, Tenant)
+
+
+def _removing_loan(origin) -> bool:
+    return isinstance(origin, (Tenant, Loan))
+
+
+@receiver(pre_save, sender=FinancialTransaction)
+def remember_previous_transaction(sender, instance: FinancialTransaction, raw: bool = False, **kwargs) -> None:
+    instance._previous_balance_effect = None
+    instance._previous_cash_flow_day = None
+    if raw or instance._state.adding:
+        return
+    previous = FinancialTransaction.objects.scoped(instance.tenant_id).filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._previous_balance_effect = transaction_effect(previous)
+        instance._previous_cash_flow_day = previous.transaction_date
+
+
+@receiver(post_save, sender=FinancialTransaction)
+def apply_transaction_on_save(sender, instance: FinancialTransaction, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    before = getattr(instance, "_previous_balance_effect", None)
+    apply_transaction_change(instance.tenant_id, before, transaction_effect(instance))
+    refresh_cash_flow_days(
+        instance.tenant_id,
+        [getattr(instance, "_previous_cash_flow_day", None), instance.transaction_date],
+    )
+    instance._previous_balance_effect = None
+    instance._previous_cash_flow_day = None
+
+
+@receiver(post_delete, sender=FinancialTransaction)
+def revert_transaction_on_delete(sender, instance: FinancialTransaction, origin=None, **kwargs) -> None:
+    if _removing_tenant(origin):
+        return
+    apply_transaction_change(instance.tenant_id, transaction_effect(instance), None)
+    refresh_cash_flow_days(instance.tenant_id, [instance.transaction_date])
+
+
+@receiver(pre_save, sender=Installment)
+def remember_previous_due_date(sender, instance: Installment, raw: bool = False, **kwargs) -> None:
+    instance._previous_cash_flow_day = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_cash_flow_day = (
+        Installment.objects.scoped(instance.tenant_id).filter(pk=instance.pk).values_list("due_date", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Installment)
+def refresh_installment_aggregates_on_save(sender, instance: Installment, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    refresh_cash_flow_days(instance.tenant_id, [getattr(instance, "_previous_cash_flow_day", None), instance.due_date])
+    refresh_packed_schedule_on_commit(instance.tenant_id, instance.loan_id)
+    instance._previous_cash_flow_day = None
+
+
+@receiver(post_delete, sender=Installment)
+def refresh_installment_aggregates_on_delete(sender, instance: Installment, origin=None, **kwargs) -> None:
+    if _removing_tenant(origin):
+        return
+    refresh_cash_flow_days(instance.tenant_id, [instance.due_date])
+    if not _removing_loan(origin):
+        refresh_packed_schedule_on_commit(instance.tenant_id, instance.loan_id)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Optional
+
+import structlog
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from backend.apps.banking.services.commission_ledger import fold_commission_ledger
+from backend.apps.banking.services.delinquency import (
+    DEFAULT_DELINQUENCY_CHUNK_SIZE,
+    DEFAULT_DELINQUENCY_THRESHOLD_DAYS,
+    DelinquencyClassifier,
+)
+from backend.apps.banking.services.interest_accrual import (
+    DEFAULT_ACCRUAL_CHUNK_SIZE,
+    DEFAULT_ACCRUAL_WORKERS,
+    accrue_interest,
+)
+from backend.apps.banking.services.overdue_sweeper import DEFAULT_SWEEP_CHUNK_SIZE, OverdueSweeper
+from backend.apps.tenancy.models import Tenant
+
+logger = structlog.get_logger(__name__)
+
+
+@shared_task(
+    name="banking.sweep_overdue_installments",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    queue="banking.maintenance",
+)
+def sweep_overdue_installments(
+    self,
+    run_date: Optional[str] = None,
+    tenant_ids: Optional[list[str]] = None,
+    max_chunks: Optional[int] = None,
+) -> dict[str, object]:
+    """
+    Task periódica: percorre os tenants ativos marcando parcelas vencidas como OVERDUE.
+
+    Tenants que esgotarem ``max_chunks`` ficam com o cursor salvo e são retomados no
+    próximo disparo do beat.
+    """
+    sweeper = OverdueSweeper(
+        chunk_size=int(getattr(settings, "BANKING_OVERDUE_SWEEP_CHUNK_SIZE", DEFAULT_SWEEP_CHUNK_SIZE)),
+        max_chunks=max_chunks if max_chunks is not None else getattr(settings, "BANKING_OVERDUE_SWEEP_MAX_CHUNKS", None),
+    )
+    reference = date.fromisoformat(run_date) if run_date else None
+    tenants = Tenant.objects.exclude(status=Tenant.Status.DECOMMISSIONED).order_by("slug")
+    if tenant_ids:
+        tenants = tenants.filter(id__in=tenant_ids)
+
+    results = [sweeper.sweep(tenant, reference) for tenant in tenants]
+    pending = [result.tenant_id for result in results if not result.completed]
+    if pending:
+        logger.info("banking_overdue_sweep_pending", tenant_ids=pending)
+    return {
+        "rows_updated": sum(result.rows_updated for result in results),
+        "tenants": [result.as_dict() for result in results],
+        "pending_tenants": pending,
+    }
+
+
+@shared_task(
+    name="banking.fold_commission_ledger",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    queue="banking.maintenance",
+)
+def fold_commission_ledgers(self, tenant_ids: Optional[list[str]] = None) -> dict[str, object]:
+    """
+    Task periódica: consolida o ledger de comissões de cada tenant em um comando agrupado.
+    """
+    tenants = Tenant.objects.exclude(status=Tenant.Status.DECOMMISSIONED).order_by("slug")
+    if tenant_ids:
+        tenants = tenants.filter(id__in=tenant_ids)
+    results = [fold_commission_ledger(tenant.id) for tenant in tenants]
+    return {
+        "entries": sum(result.entries for result in results),
+        "consultants": sum(result.consultants for result in results),
+    }
+
+
+@shared_task(
+    name="banking.classify_delinquency",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    queue="banking.maintenance",
+)
+def classify_delinquency(
+    self,
+    run_date: Optional[str] = None,
+    tenant_ids: Optional[list[str]] = None,
+) -> dict[str, object]:
+    """
+    Task diária: reclassifica clientes pelo atraso e publica as faixas de aging.
+    """
+    classifier = DelinquencyClassifier(
+        chunk_size=int(getattr(settings, "BANKING_DELINQUENCY_CHUNK_SIZE", DEFAULT_DELINQUENCY_CHUNK_SIZE)),
+        threshold_days=int(getattr(settings, "BANKING_DELINQUENCY_THRESHOLD_DAYS", DEFAULT_DELINQUENCY_THRESHOLD_DAYS)),
+    )
+    reference = date.fromisoformat(run_date) if run_date else None
+    tenants = Tenant.objects.exclude(status=Tenant.Status.DECOMMISSIONED).order_by("slug")
+    if tenant_ids:
+        tenants = tenants.filter(id__in=tenant_ids)
+    results = [classifier.classify(tenant, reference) for tenant in tenants]
+    return {
+        "marked_delinquent": sum(result.marked_delinquent for result in results),
+        "restored_active": sum(result.restored_active for result in results),
+        "tenants": [result.as_dict() for result in results],
+    }
+
+
+@shared_task(
+    name="banking.accrue_loan_interest",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    queue="banking.maintenance",
+)
+def accrue_loan_interest(
+    self,
+    accrual_date: Optional[str] = None,
+    tenant_ids: Optional[list[str]] = None,
+    workers: Optional[int] = None,
+) -> dict[str, object]:
+    """
+    Task noturna: apropria os juros do dia anterior (ou de ``accrual_date``). Reexecutar
+    a mesma data não duplica linhas.
+    """
+    reference = date.fromisoformat(accrual_date) if accrual_date else timezone.localdate() - timedelta(days=1)
+    results = accrue_interest(
+        reference,
+        tenant_ids,
+        workers=workers or int(getattr(settings, "BANKING_INTEREST_ACCRUAL_WORKERS", DEFAULT_ACCRUAL_WORKERS)),
+        chunk_size=int(getattr(settings, "BANKING_INTEREST_ACCRUAL_CHUNK_SIZE", DEFAULT_ACCRUAL_CHUNK_SIZE)),
+    )
+    return {
+        "accrual_date": reference.isoformat(),
+        "rows_inserted": sum(result.rows_inserted for result in results),
+        "tenants": [result.as_dict() for result in results],
+    }
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.contrib.auth import get_user_model
+
+from backend.apps.banking.models import Consultant, Customer, Installment, Loan
+from backend.apps.banking.services.financial_calculations import LoanInput, calculate_iof, generate_installments
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+
+def create_tenant(slug: str) -> Tenant:
+    return Tenant.objects.create(
+        slug=slug,
+        display_name=f"Tenant {slug}",
+        primary_domain=f"{slug}.iabank.test",
+        status=Tenant.Status.PILOT,
+        pii_policy_version="1.0.0",
+    )
+
+
+def create_borrower(tenant: Tenant, document_number: str = "12345678900") -> tuple[Customer, Consultant]:
+    with use_tenant(tenant.id):
+        customer = Customer.objects.create(
+            tenant_id=tenant.id,
+            name=f"Cliente {tenant.slug}",
+            document_number=document_number,
+        )
+        user = get_user_model().objects.create(username=f"consultor-{tenant.slug}-{document_number}")
+        consultant = Consultant.objects.create(tenant_id=tenant.id, user=user)
+    return customer, consultant
+
+
+def create_loan(
+    tenant: Tenant,
+    customer: Customer,
+    consultant: Consultant,
+    *,
+    principal: str = "10000.00",
+    monthly_rate: str = "1.50",
+    installments: int = 12,
+    contract_date: date = date(2025, 1, 10),
+    first_installment_date: date = date(2025, 2, 10),
+    status: str = Loan.Status.IN_PROGRESS,
+) -> Loan:
+    """
+    Persiste empréstimo e cronograma com os mesmos cálculos das factories.
+    """
+    monthly = Decimal(monthly_rate)
+    request = LoanInput(
+        principal_amount=Decimal(principal),
+        annual_rate_pct=(monthly * Decimal("12")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+        number_of_installments=installments,
+        contract_date=contract_date,
+        first_installment_date=first_installment_date,
+    )
+    with use_tenant(tenant.id):
+        loan = Loan.objects.create(
+            tenant_id=tenant.id,
+            customer=customer,
+            consultant=consultant,
+            principal_amount=request.principal_amount,
+            interest_rate=monthly,
+            number_of_installments=installments,
+            contract_date=contract_date,
+            first_installment_date=first_installment_date,
+            status=status,
+            iof_amount=calculate_iof(request),
+            cet_annual_rate=Decimal("0"),
+            cet_monthly_rate=Decimal("0"),
+        )
+        Installment.objects.bulk_create(
+            [
+                Installment(
+                    tenant_id=tenant.id,
+                    loan=loan,
+                    installment_number=quote.number,
+                    due_date=quote.due_date,
+                    amount_due=quote.amount,
+                )
+                for quote in generate_installments(request)
+            ],
+        )
+    return loan
@@ -2,10 +2,6 @@ from __future__ import annotations
 
 import hashlib
 import json
-import random
-import string
-import uuid
-from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Any, Iterable
@@ -27,84 +23,14 @@ from backend.apps.banking.models import (
     Supplier,
     TenantBaseModel,
 )
+from backend.apps.banking.services.cet_solver import solve_cet
 from backend.apps.banking.services.financial_calculations import LoanInput, calculate_cet, generate_installments
-from backend.apps.foundation.services.seed_utils import VaultTransitFPEClient, derive_factory_seed
+from backend.apps.banking.services.seed_context import FactoryContext
 from backend.apps.tenancy.models import Tenant
 
 User = get_user_model()
 
 
-@dataclass(slots=True)
-class FactoryContext:
-    tenant_id: str
-    environment: str
-    manifest_version: str
-    salt_version: str
-    reference_date: date = date(2025, 1, 1)
-
-    @property
-    def tenant_uuid(self) -> uuid.UUID:
-        return uuid.UUID(str(self.tenant_id))
-
-    @property
-    def tenant_slug(self) -> str:
-        return str(self.tenant_uuid).split("-")[0]
-
-    @property
-    def factory_seed(self) -> int:
-        return derive_factory_seed(
-            str(self.tenant_id),
-            self.environment,
-            self.manifest_version,
-            self.salt_version,
-        )
-
-    @property
-    def fpe_client(self) -> VaultTransitFPEClient:
-        return VaultTransitFPEClient(transit_path=f"transit/seeds/{self.environment}/{self.tenant_id}")
-
-    def _seed(self, label: str) -> int:
-        payload = f"{label}|{self.factory_seed}"
-        digest = hashlib.sha256(payload.encode()).digest()
-        return int.from_bytes(digest[:8], "big")
-
-    def deterministic_digits(self, label: str, length: int) -> str:
-        rng = random.Random(self._seed(label))
-        return "".join(str(rng.randint(0, 9)) for _ in range(length))
-
-    def deterministic_letters(self, label: str, length: int) -> str:
-        rng = random.Random(self._seed(label))
-        return "".join(rng.choice(string.ascii_uppercase) for _ in range(length))
-
-    def deterministic_decimal(self, label: str, min_value: Decimal, max_value: Decimal, places: int = 2) -> Decimal:
-        rng = random.Random(self._seed(label))
-        span = max_value - min_value
-        quantize = Decimal("0." + ("0" * (places - 1)) + "1")
-        value = min_value + span * Decimal(rng.random())
-        return value.quantize(quantize, rounding=ROUND_HALF_UP)
-
-    def masked_digits(self, label: str, length: int) -> str:
-        raw = self.deterministic_digits(label, length)
-        return self.fpe_client.mask(raw, salt_version=self.salt_version)
-
-    def masked_email(self, prefix: str, suffix: str = "") -> str:
-        local_part = f"{prefix}-{suffix or '0'}"
-        masked_local = self.fpe_client.mask(local_part, salt_version=self.salt_version)
-        return f"{masked_local}@masked.test"
-
-    def with_overrides(self, **kwargs: Any) -> "FactoryContext":
-        return replace(self, **kwargs)
-
-    @classmethod
-    def default(cls) -> "FactoryContext":
-        return cls(
-            tenant_id="00000000-0000-0000-0000-000000000000",
-            environment="dev",
-            manifest_version="0.0.0",
-            salt_version="v1",
-        )
-
-
 class BaseBankingFactory(factory.Factory):
     class Meta:
         abstract = True
@@ -287,12 +213,12 @@ class LoanFactory(BaseBankingFactory):
     @factory.lazy_attribute
     def cet_annual_rate(self) -> Decimal:
         request, _ = _loan_request_for_stub(self)
-        return calculate_cet(request).cet_annual_rate
+        return solve_cet(request).cet_annual_rate
 
     @factory.lazy_attribute
     def cet_monthly_rate(self) -> Decimal:
         request, _ = _loan_request_for_stub(self)
-        return calculate_cet(request).cet_monthly_rate
+        return solve_cet(request).cet_monthly_rate
 
 
 class InstallmentFactory(BaseBankingFactory):
@@ -303,8 +229,7 @@ class InstallmentFactory(BaseBankingFactory):
     loan = factory.SubFactory(LoanFactory, factory_context=factory.SelfAttribute("..factory_context"))
     installment_number = factory.Sequence(lambda n: n + 1)
 
-    @factory.lazy_attribute
-    def due_date(self) -> date:
+    def _scheduled(self):
         annual_rate = (self.loan.interest_rate * Decimal("12")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
         request = LoanInput(
             principal_amount=self.loan.principal_amount,
@@ -313,23 +238,18 @@ class InstallmentFactory(BaseBankingFactory):
             contract_date=self.loan.contract_date,
             first_installment_date=self.loan.first_installment_date,
         )
+        # O cronograma vem do cache de processo: uma cotação por empréstimo, não por parcela.
         schedule = generate_installments(request)
         index = max(0, self.installment_number - 1)
-        return schedule[index % len(schedule)].due_date
+        return schedule[index % len(schedule)]
+
+    @factory.lazy_attribute
+    def due_date(self) -> date:
+        return InstallmentFactory._scheduled(self).due_date
 
     @factory.lazy_attribute
     def amount_due(self) -> Decimal:
-        annual_rate = (self.loan.interest_rate * Decimal("12")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        request = LoanInput(
-            principal_amount=self.loan.principal_amount,
-            annual_rate_pct=annual_rate,
-            number_of_installments=self.loan.number_of_installments,
-            contract_date=self.loan.contract_date,
-            first_installment_date=self.loan.first_installment_date,
-        )
-        schedule = generate_installments(request)
-        index = max(0, self.installment_number - 1)
-        return schedule[index % len(schedule)].amount
+        return InstallmentFactory._scheduled(self).amount
 
     amount_paid = Decimal("0.00")
     payment_date = None
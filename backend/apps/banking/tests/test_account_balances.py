@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from backend.apps.banking.models import BankAccount, BankAccountDailyBalance, FinancialTransaction
+from backend.apps.banking.services.account_balances import balance_at, check_daily_balances, rebuild_daily_balances
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+
+class AccountDailyBalanceTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-saldo")
+        customer, _ = create_borrower(self.tenant)
+        with use_tenant(self.tenant.id):
+            self.account = BankAccount.objects.create(
+                customer=customer,
+                name="Conta",
+                agency="0001",
+                account_number="98765",
+                initial_balance=Decimal("1000.00"),
+                type=BankAccount.AccountType.CHECKING,
+            )
+
+    def _post(self, amount: str, day: date, kind: str = FinancialTransaction.TransactionType.INCOME, **extra) -> FinancialTransaction:
+        with use_tenant(self.tenant.id):
+            return FinancialTransaction.objects.create(
+                description="Lançamento",
+                amount=Decimal(amount),
+                transaction_date=day,
+                is_paid=extra.pop("is_paid", True),
+                payment_date=extra.pop("payment_date", day),
+                type=kind,
+                bank_account=self.account,
+                **extra,
+            )
+
+    def _balance(self, day: date) -> Decimal:
+        return balance_at(self.tenant.id, self.account.id, day)
+
+    def test_snapshots_follow_posted_transactions(self) -> None:
+        self._post("200.00", date(2025, 3, 10))
+        self._post("50.00", date(2025, 3, 5), FinancialTransaction.TransactionType.EXPENSE)
+        self._post("30.00", date(2025, 3, 10))
+
+        self.assertEqual(self._balance(date(2025, 3, 1)), Decimal("1000.00"))
+        self.assertEqual(self._balance(date(2025, 3, 5)), Decimal("950.00"))
+        self.assertEqual(self._balance(date(2025, 3, 8)), Decimal("950.00"))
+        self.assertEqual(self._balance(date(2025, 3, 10)), Decimal("1180.00"))
+        self.assertEqual(self._balance(date(2026, 1, 1)), Decimal("1180.00"))
+        with use_tenant(self.tenant.id):
+            self.assertEqual(BankAccountDailyBalance.objects.filter(bank_account=self.account).count(), 2)
+        self.assertEqual(check_daily_balances(self.tenant.id), [])
+
+    def test_paying_moving_and_deleting_transactions_adjust_snapshots(self) -> None:
+        pending = self._post("100.00", date(2025, 3, 1), is_paid=False, payment_date=None)
+        self._post("10.00", date(2025, 3, 20))
+        self.assertEqual(self._balance(date(2025, 3, 31)), Decimal("1010.00"))
+
+        with use_tenant(self.tenant.id):
+            pending.is_paid = True
+            pending.payment_date = date(2025, 3, 15)
+            pending.save()
+        self.assertEqual(self._balance(date(2025, 3, 14)), Decimal("1000.00"))
+        self.assertEqual(self._balance(date(2025, 3, 31)), Decimal("1110.00"))
+
+        with use_tenant(self.tenant.id):
+            pending.payment_date = date(2025, 3, 2)
+            pending.save()
+            self.assertEqual(self._balance(date(2025, 3, 14)), Decimal("1100.00"))
+            pending.delete()
+        self.assertEqual(self._balance(date(2025, 3, 31)), Decimal("1010.00"))
+        self.assertEqual(check_daily_balances(self.tenant.id), [])
+
+    def test_checker_reports_drift_and_rebuild_repairs_it(self) -> None:
+        self._post("200.00", date(2025, 3, 10))
+        self._post("40.00", date(2025, 3, 12), FinancialTransaction.TransactionType.EXPENSE)
+        with use_tenant(self.tenant.id):
+            FinancialTransaction.objects.filter(amount=Decimal("200.00")).update(amount=Decimal("250.00"))
+
+        drifts = check_daily_balances(self.tenant.id)
+        self.assertEqual([(drift.balance_date, drift.expected, drift.stored) for drift in drifts], [
+            (date(2025, 3, 10), Decimal("1250.00"), Decimal("1200.00")),
+            (date(2025, 3, 12), Decimal("1210.00"), Decimal("1160.00")),
+        ])
+        with self.assertRaises(CommandError):
+            call_command("rebuild_account_balances", tenant=[self.tenant.slug], check=True, stdout=StringIO())
+
+        self.assertEqual(rebuild_daily_balances(self.tenant.id, [self.account.id]), 2)
+        self.assertEqual(check_daily_balances(self.tenant.id), [])
+        self.assertEqual(self._balance(date(2025, 3, 31)), Decimal("1210.00"))
+        call_command("rebuild_account_balances", tenant=[self.tenant.slug], check=True, stdout=StringIO())
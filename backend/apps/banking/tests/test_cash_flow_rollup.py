@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from backend.apps.banking.models import CashFlowDailyRollup, FinancialTransaction, Installment
+from backend.apps.banking.services.cash_flow_rollup import (
+    cash_flow_projection,
+    rebuild_tenant_cash_flow,
+    refresh_cash_flow_days,
+)
+from backend.apps.banking.services.payment_posting import post_payments
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+START = date(2025, 2, 1)
+
+
+def _rollups(tenant) -> dict[date, tuple[Decimal, int, Decimal, Decimal]]:
+    with use_tenant(tenant.id):
+        return {
+            row[0]: row[1:]
+            for row in CashFlowDailyRollup.objects.order_by("rollup_date").values_list(
+                "rollup_date",
+                "receivables",
+                "open_installments",
+                "expected_income",
+                "expected_expense",
+            )
+        }
+
+
+class CashFlowRollupTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-caixa")
+        customer, consultant = create_borrower(self.tenant)
+        self.loan = create_loan(self.tenant, customer, consultant, installments=3)
+
+    def _transaction(self, amount: str, day: date, kind: str, **extra) -> FinancialTransaction:
+        with use_tenant(self.tenant.id):
+            return FinancialTransaction.objects.create(
+                description="Previsto",
+                amount=Decimal(amount),
+                transaction_date=day,
+                type=kind,
+                **extra,
+            )
+
+    def test_rebuild_aggregates_open_installments_and_planned_transactions(self) -> None:
+        self._transaction("300.00", date(2025, 2, 10), FinancialTransaction.TransactionType.EXPENSE)
+        with use_tenant(self.tenant.id):
+            CashFlowDailyRollup.objects.all().delete()
+            first = Installment.objects.get(loan=self.loan, installment_number=1)
+
+        self.assertEqual(rebuild_tenant_cash_flow(self.tenant.id), 3)
+
+        rollups = _rollups(self.tenant)
+        self.assertEqual(list(rollups), [date(2025, 2, 10), date(2025, 3, 10), date(2025, 4, 10)])
+        self.assertEqual(rollups[date(2025, 2, 10)], (first.amount_due, 1, Decimal("0.00"), Decimal("300.00")))
+
+    def test_signals_refresh_only_the_changed_days(self) -> None:
+        rebuild_tenant_cash_flow(self.tenant.id)
+        with use_tenant(self.tenant.id):
+            installment = Installment.objects.get(loan=self.loan, installment_number=2)
+            installment.amount_paid = Decimal("100.00")
+            installment.status = Installment.Status.PARTIALLY_PAID
+            installment.save()
+        self.assertEqual(_rollups(self.tenant)[date(2025, 3, 10)][:2], (installment.amount_due - Decimal("100.00"), 1))
+
+        with use_tenant(self.tenant.id):
+            installment.due_date = date(2025, 3, 20)
+            installment.save()
+        rollups = _rollups(self.tenant)
+        self.assertNotIn(date(2025, 3, 10), rollups)
+        self.assertEqual(rollups[date(2025, 3, 20)][1], 1)
+
+        planned = self._transaction("80.00", date(2025, 3, 20), FinancialTransaction.TransactionType.INCOME)
+        linked = self._transaction("999.00", date(2025, 3, 20), FinancialTransaction.TransactionType.INCOME, installment=installment)
+        self.assertEqual(_rollups(self.tenant)[date(2025, 3, 20)][2], Decimal("80.00"))
+
+        with use_tenant(self.tenant.id):
+            linked.delete()
+            planned.is_paid = True
+            planned.payment_date = date(2025, 3, 20)
+            planned.save()
+            installment.delete()
+        self.assertNotIn(date(2025, 3, 20), _rollups(self.tenant))
+
+    def test_payment_posting_refreshes_installment_days(self) -> None:
+        rebuild_tenant_cash_flow(self.tenant.id)
+        with use_tenant(self.tenant.id):
+            first = Installment.objects.get(loan=self.loan, installment_number=1)
+        payment = self._transaction(
+            str(first.amount_due),
+            date(2025, 2, 9),
+            FinancialTransaction.TransactionType.INCOME,
+            installment=first,
+            is_paid=True,
+            payment_date=date(2025, 2, 9),
+        )
+
+        post_payments(self.tenant.id, [payment.id])
+
+        self.assertNotIn(date(2025, 2, 10), _rollups(self.tenant))
+
+    def test_projection_is_one_range_query_with_dense_days(self) -> None:
+        rebuild_tenant_cash_flow(self.tenant.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            projection = cash_flow_projection(self.tenant.id, START)
+
+        reads = [query for query in queries.captured_queries if "banking_cash_flow_daily_rollup" in query["sql"]]
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(len(projection), 180)
+        self.assertEqual(projection[-1].day, START + timedelta(days=179))
+        busy = [day for day in projection if day.open_installments]
+        self.assertEqual([day.day for day in busy], [date(2025, 2, 10), date(2025, 3, 10), date(2025, 4, 10)])
+        self.assertEqual(sum(day.net for day in projection), sum(day.receivables for day in busy))
+        with self.assertRaises(ValueError):
+            cash_flow_projection(self.tenant.id, START, days=0)
+
+
+class CashFlowParallelRebuildTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_command_rebuilds_tenants_in_parallel(self) -> None:
+        tenants = []
+        for slug, document in (("tenant-caixa-a", "11111111111"), ("tenant-caixa-b", "22222222222")):
+            tenant = create_tenant(slug)
+            customer, consultant = create_borrower(tenant, document)
+            create_loan(tenant, customer, consultant, installments=2 if slug.endswith("a") else 4)
+            tenants.append(tenant)
+
+        stdout = StringIO()
+        call_command("rebuild_cash_flow_rollups", tenant=[tenant.slug for tenant in tenants], workers=2, stdout=stdout)
+
+        self.assertEqual([len(_rollups(tenant)) for tenant in tenants], [2, 4])
+        self.assertIn("4 dias reconstruídos", stdout.getvalue())
+
+
+class CashFlowConcurrentRefreshTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_concurrent_postings_on_the_same_day_keep_both_contributions(self) -> None:
+        tenant = create_tenant("tenant-caixa-concorrente")
+        customer, consultant = create_borrower(tenant)
+        loans = [create_loan(tenant, customer, consultant, installments=2) for _ in range(2)]
+        day = date(2025, 2, 10)
+        rebuild_tenant_cash_flow(tenant.id)
+        first_ready, release, second_done = threading.Event(), threading.Event(), threading.Event()
+
+        def post(loan, before_commit) -> None:
+            # Mesmo caminho da baixa em lote: UPDATE sem sinais e recálculo do dia na
+            # transação do lançador.
+            try:
+                with use_tenant(tenant.id), transaction.atomic():
+                    Installment.objects.filter(loan=loan, due_date=day).update(amount_paid=Decimal("100.00"))
+                    refresh_cash_flow_days(tenant.id, [day])
+                    before_commit()
+            finally:
+                connection.close()
+
+        def hold() -> None:
+            first_ready.set()
+            release.wait(timeout=10)
+
+        first = threading.Thread(target=post, args=(loans[0], hold))
+        second = threading.Thread(target=post, args=(loans[1], second_done.set))
+        first.start()
+        self.assertTrue(first_ready.wait(timeout=10))
+        second.start()
+        try:
+            # O segundo lançador espera a trava do dia enquanto o primeiro não confirma.
+            self.assertFalse(second_done.wait(timeout=0.5))
+        finally:
+            release.set()
+            first.join()
+            second.join()
+
+        with use_tenant(tenant.id):
+            due = sum(Installment.objects.filter(due_date=day).values_list("amount_due", flat=True), Decimal("0"))
+        self.assertEqual(_rollups(tenant)[day][0], due - Decimal("200.00"))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from backend.apps.banking.services import cet_solver
+from backend.apps.banking.services.cet_solver import solve_cet, solve_cet_batch
+from backend.apps.banking.services.financial_calculations import LoanInput, calculate_cet, generate_installments
+from backend.apps.banking.services.schedule_cache import get_schedule_cache
+from backend.apps.banking.tests.factories import FactoryContext, LoanFactory
+
+
+def _loan(principal: str, annual_rate: str, installments: int) -> LoanInput:
+    return LoanInput(
+        principal_amount=Decimal(principal),
+        annual_rate_pct=Decimal(annual_rate),
+        number_of_installments=installments,
+        contract_date=date(2025, 1, 10),
+        first_installment_date=date(2025, 2, 10),
+    )
+
+
+def _npv(request: LoanInput, annual_rate_pct: Decimal) -> Decimal:
+    growth = Decimal(1) + annual_rate_pct / Decimal(100)
+    present_value = sum(
+        installment.amount / growth ** (Decimal((installment.due_date - request.contract_date).days) / Decimal(365))
+        for installment in generate_installments(request)
+    )
+    return present_value - request.principal_amount
+
+
+class CETSolverTest(SimpleTestCase):
+    def test_solution_zeroes_contract_cash_flow(self) -> None:
+        request = _loan("10000.00", "12.50", 12)
+        solution = solve_cet(request)
+
+        self.assertEqual(solution.method, "newton")
+        self.assertLessEqual(solution.iterations, cet_solver.MAX_NEWTON_ITERATIONS)
+        # Arredondamento em 4 casas: VPL residual precisa ficar abaixo de um centavo.
+        self.assertLess(abs(_npv(request, solution.cet_annual_rate)), Decimal("0.01"))
+
+    def test_cet_includes_financed_iof_above_nominal_rate(self) -> None:
+        request = _loan("10000.00", "12.50", 12)
+        solution = solve_cet(request)
+        nominal = calculate_cet(request)
+
+        self.assertGreater(solution.cet_annual_rate, nominal.cet_annual_rate)
+        self.assertEqual(solution.cet_annual_rate, Decimal("15.5691"))
+        self.assertEqual(solution.cet_monthly_rate, Decimal("1.2131"))
+
+    def test_zero_rate_loan_still_has_positive_cet(self) -> None:
+        solution = solve_cet(_loan("1000.00", "0", 3))
+        self.assertGreater(solution.cet_annual_rate, Decimal("0"))
+
+    def test_batch_matches_single_loan_solutions(self) -> None:
+        requests = [
+            _loan("500.00", "10.00", 1),
+            _loan("10000.00", "18.00", 24),
+            _loan("250000.00", "35.99", 420),
+        ]
+        batch = solve_cet_batch(requests)
+        self.assertEqual(batch, [solve_cet(request) for request in requests])
+
+    def test_falls_back_to_bisection_when_newton_is_capped(self) -> None:
+        request = _loan("10000.00", "12.50", 12)
+        get_schedule_cache().clear()
+        with patch.object(cet_solver, "MAX_NEWTON_ITERATIONS", 1):
+            solution = solve_cet(request)
+        get_schedule_cache().clear()
+
+        self.assertEqual(solution.method, "bisection")
+        self.assertLessEqual(solution.iterations, 1 + cet_solver.MAX_BISECTION_ITERATIONS)
+        self.assertEqual(solution.cet_annual_rate, solve_cet(request).cet_annual_rate)
+
+    def test_loan_factory_uses_real_cet(self) -> None:
+        context = FactoryContext.default()
+        loan = LoanFactory.build(factory_context=context)
+        request = LoanInput(
+            principal_amount=loan.principal_amount,
+            annual_rate_pct=context.deterministic_decimal("loan-annual-rate", Decimal("10.00"), Decimal("18.00")),
+            number_of_installments=loan.number_of_installments,
+            contract_date=loan.contract_date,
+            first_installment_date=loan.first_installment_date,
+        )
+        solution = solve_cet(request)
+
+        self.assertEqual(loan.cet_annual_rate, solution.cet_annual_rate)
+        self.assertEqual(loan.cet_monthly_rate, solution.cet_monthly_rate)
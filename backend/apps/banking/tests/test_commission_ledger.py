@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from backend.apps.banking.models import CommissionLedgerEntry, Consultant
+from backend.apps.banking.services.commission_ledger import (
+    CommissionAccrual,
+    balance_as_of,
+    balances_as_of,
+    fold_commission_ledger,
+    record_commissions,
+)
+from backend.apps.banking.tasks import fold_commission_ledgers
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+T0 = datetime(2025, 3, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class CommissionLedgerTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-comissao")
+        customer, self.consultant = create_borrower(self.tenant, "11111111111")
+        _, self.other_consultant = create_borrower(self.tenant, "22222222222")
+        self.loan = create_loan(self.tenant, customer, self.consultant)
+
+    def _balance(self, consultant: Consultant) -> Decimal:
+        with use_tenant(self.tenant.id):
+            return Consultant.objects.get(id=consultant.id).balance
+
+    def _accrue(self, consultant: Consultant, amount: str, minutes: int) -> None:
+        record_commissions(
+            self.tenant.id,
+            [CommissionAccrual(consultant.id, Decimal(amount), self.loan.id, occurred_at=T0 + timedelta(minutes=minutes))],
+        )
+
+    def test_fold_applies_one_grouped_update_per_consultant(self) -> None:
+        for minutes in range(5):
+            self._accrue(self.consultant, "10.00", minutes)
+        self._accrue(self.other_consultant, "7.50", 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = fold_commission_ledger(self.tenant.id, until=T0 + timedelta(hours=1))
+
+        self.assertEqual((result.consultants, result.entries), (2, 6))
+        updates = [query["sql"] for query in queries.captured_queries if "UPDATE banking_consultant" in query["sql"]]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self._balance(self.consultant), Decimal("50.00"))
+        self.assertEqual(self._balance(self.other_consultant), Decimal("7.50"))
+
+        again = fold_commission_ledger(self.tenant.id, until=T0 + timedelta(hours=1))
+        self.assertEqual((again.consultants, again.entries), (0, 0))
+        self.assertEqual(self._balance(self.consultant), Decimal("50.00"))
+
+    def test_fold_leaves_entries_after_cutoff_pending(self) -> None:
+        self._accrue(self.consultant, "10.00", 0)
+        self._accrue(self.consultant, "5.00", 120)
+
+        fold_commission_ledger(self.tenant.id, until=T0 + timedelta(hours=1))
+
+        self.assertEqual(self._balance(self.consultant), Decimal("10.00"))
+        with use_tenant(self.tenant.id):
+            self.assertEqual(CommissionLedgerEntry.objects.filter(folded_at__isnull=True).count(), 1)
+
+    def test_balance_as_of_combines_folded_balance_and_ledger_tail(self) -> None:
+        self._accrue(self.consultant, "10.00", 0)
+        self._accrue(self.consultant, "20.00", 30)
+        fold_commission_ledger(self.tenant.id, until=T0 + timedelta(hours=1))
+        self._accrue(self.consultant, "-5.00", 90)
+        self._accrue(self.consultant, "8.00", 200)
+
+        self.assertEqual(balance_as_of(self.tenant.id, self.consultant.id, T0 + timedelta(minutes=10)), Decimal("10.00"))
+        self.assertEqual(balance_as_of(self.tenant.id, self.consultant.id, T0 + timedelta(minutes=100)), Decimal("25.00"))
+        self.assertEqual(balance_as_of(self.tenant.id, self.consultant.id, T0 + timedelta(days=1)), Decimal("33.00"))
+
+        with CaptureQueriesContext(connection) as queries:
+            balances = balances_as_of(self.tenant.id, [self.consultant.id, self.other_consultant.id], T0 - timedelta(minutes=1))
+        self.assertEqual(balances, {self.consultant.id: Decimal("0.00"), self.other_consultant.id: Decimal("0.00")})
+        reads = [query for query in queries.captured_queries if "banking_consultant" in query["sql"]]
+        self.assertEqual(len(reads), 1)
+
+    def test_periodic_task_folds_every_tenant(self) -> None:
+        self._accrue(self.consultant, "3.00", 0)
+
+        summary = fold_commission_ledgers.apply(kwargs={"tenant_ids": [str(self.tenant.id)]}).get()
+
+        self.assertEqual(summary, {"entries": 1, "consultants": 1})
+        self.assertEqual(self._balance(self.consultant), Decimal("3.00"))
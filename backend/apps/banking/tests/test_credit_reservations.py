@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from backend.apps.banking.models import BankAccount, CreditLimit, CreditLimitShard, Customer
+from backend.apps.banking.services.credit_reservations import CreditLimitReservations
+from backend.apps.banking.tests.db_fixtures import create_tenant
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import Tenant
+
+
+class CreditLimitReservationsTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-limite")
+        with use_tenant(self.tenant.id):
+            customer = Customer.objects.create(name="Cliente", document_number="12345678900")
+            account = BankAccount.objects.create(
+                customer=customer,
+                name="Conta",
+                agency="0001",
+                account_number="12345",
+                type=BankAccount.AccountType.CHECKING,
+            )
+            self.limit = CreditLimit.objects.create(
+                bank_account=account,
+                current_limit=Decimal("1000.00"),
+                used_amount=Decimal("100.00"),
+            )
+        self.service = CreditLimitReservations(self.tenant.id)
+
+    def _used(self) -> Decimal:
+        with use_tenant(self.tenant.id):
+            return CreditLimit.objects.get(id=self.limit.id).used_amount
+
+    def test_reserve_is_guarded_by_current_limit(self) -> None:
+        self.assertTrue(self.service.reserve(self.limit.id, Decimal("900.00")))
+        self.assertFalse(self.service.reserve(self.limit.id, Decimal("0.01")))
+        self.assertEqual(self._used(), Decimal("1000.00"))
+
+    def test_release_never_goes_negative(self) -> None:
+        self.assertFalse(self.service.release(self.limit.id, Decimal("100.01")))
+        self.assertTrue(self.service.release(self.limit.id, Decimal("100.00")))
+        self.assertEqual(self._used(), Decimal("0.00"))
+
+    def test_inactive_limit_rejects_reservations(self) -> None:
+        with use_tenant(self.tenant.id):
+            CreditLimit.objects.filter(id=self.limit.id).update(status=CreditLimit.Status.FROZEN)
+        self.assertFalse(self.service.reserve(self.limit.id, Decimal("1.00")))
+
+    def test_rejects_non_positive_amount(self) -> None:
+        with self.assertRaises(ValueError):
+            self.service.reserve(self.limit.id, Decimal("0"))
+        with self.assertRaises(ValueError):
+            self.service.enable_sharding(self.limit.id, 0)
+
+    def test_sharding_moves_headroom_out_of_parent(self) -> None:
+        self.assertEqual(self.service.enable_sharding(self.limit.id, 4), 4)
+        self.assertEqual(self.service.enable_sharding(self.limit.id, 8), 4)
+
+        with use_tenant(self.tenant.id):
+            capacities = list(
+                CreditLimitShard.objects.filter(credit_limit=self.limit).order_by("shard_index").values_list("capacity", flat=True),
+            )
+        self.assertEqual(capacities, [Decimal("225.00")] * 4)
+        self.assertEqual(self._used(), Decimal("1000.00"))
+        self.assertFalse(self.service.reserve(self.limit.id, Decimal("1.00")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("100.00"))
+
+    def test_sharded_reserve_spreads_when_no_single_shard_fits(self) -> None:
+        self.service.enable_sharding(self.limit.id, 3)
+
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("200.00"), hint=0))
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("500.00"), hint=1))
+        self.assertFalse(self.service.reserve_sharded(self.limit.id, Decimal("200.01")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("800.00"))
+
+        self.assertTrue(self.service.release_sharded(self.limit.id, Decimal("600.00")))
+        self.assertFalse(self.service.release_sharded(self.limit.id, Decimal("100.01")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("200.00"))
+
+    def test_frozen_sharded_limit_rejects_reservations(self) -> None:
+        self.service.enable_sharding(self.limit.id, 3)
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("50.00")))
+        with use_tenant(self.tenant.id):
+            CreditLimit.objects.filter(id=self.limit.id).update(status=CreditLimit.Status.FROZEN)
+
+        self.assertFalse(self.service.reserve_sharded(self.limit.id, Decimal("10.00"), hint=0))
+        self.assertFalse(self.service.reserve_sharded(self.limit.id, Decimal("700.00")))
+        self.assertTrue(self.service.release_sharded(self.limit.id, Decimal("50.00")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("100.00"))
+
+    def test_sharded_release_falls_back_to_amount_reserved_before_sharding(self) -> None:
+        self.service.enable_sharding(self.limit.id, 2)
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("30.00")))
+
+        self.assertTrue(self.service.release_sharded(self.limit.id, Decimal("100.00")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("30.00"))
+        # O restante no pai é a folga dos shards, que não pode ser liberada por ali.
+        self.assertFalse(self.service.release_sharded(self.limit.id, Decimal("30.01")))
+        self.assertTrue(self.service.release_sharded(self.limit.id, Decimal("30.00")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("0.00"))
+
+    def test_collapse_returns_unused_headroom(self) -> None:
+        self.service.enable_sharding(self.limit.id, 2)
+        self.service.reserve_sharded(self.limit.id, Decimal("50.00"))
+
+        self.service.collapse_shards(self.limit.id)
+
+        self.assertEqual(self._used(), Decimal("150.00"))
+        with use_tenant(self.tenant.id):
+            self.assertFalse(CreditLimitShard.objects.filter(credit_limit=self.limit).exists())
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("850.00")))
+        self.assertEqual(self._used(), Decimal("1000.00"))
+
+    def test_sharding_never_creates_empty_shards(self) -> None:
+        self.assertTrue(self.service.reserve(self.limit.id, Decimal("899.97")))
+        self.assertEqual(self.service.enable_sharding(self.limit.id, 8), 3)
+        self.service.collapse_shards(self.limit.id)
+
+        self.assertTrue(self.service.reserve(self.limit.id, Decimal("0.03")))
+        with self.assertRaises(ValueError):
+            self.service.enable_sharding(self.limit.id, 2)
+        with use_tenant(self.tenant.id):
+            self.assertFalse(CreditLimitShard.objects.filter(credit_limit=self.limit).exists())
+
+    def test_sharded_reserve_rereads_count_changed_by_another_instance(self) -> None:
+        other = CreditLimitReservations(self.tenant.id)
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("10.00")))
+
+        other.enable_sharding(self.limit.id, 2)
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("10.00")))
+        self.assertEqual(self.service.usage(self.limit.id), Decimal("120.00"))
+
+        other.collapse_shards(self.limit.id)
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("10.00")))
+        self.assertTrue(self.service.release_sharded(self.limit.id, Decimal("30.00")))
+        self.assertEqual(self._used(), Decimal("100.00"))
+
+    def test_spread_touches_updated_at(self) -> None:
+        self.service.enable_sharding(self.limit.id, 2)
+        with use_tenant(self.tenant.id):
+            before = dict(CreditLimitShard.objects.filter(credit_limit=self.limit).values_list("shard_index", "updated_at"))
+
+        self.assertTrue(self.service.reserve_sharded(self.limit.id, Decimal("800.00")))
+
+        with use_tenant(self.tenant.id):
+            after = dict(CreditLimitShard.objects.filter(credit_limit=self.limit).values_list("shard_index", "updated_at"))
+        self.assertTrue(all(after[index] > before[index] for index in before))
+
+
+class CreditReservationBenchmarkCommandTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_concurrent_writers_never_oversubscribe(self) -> None:
+        stdout = StringIO()
+        call_command("benchmark_credit_reservations", writers=4, reservations=5, shards=2, stdout=stdout)
+        report = json.loads(stdout.getvalue())
+
+        for mode in ("plain", "sharded"):
+            self.assertEqual(report[mode]["accepted"], 20)
+            self.assertEqual(Decimal(report[mode]["effective_usage"]), Decimal("20.00"))
+            self.assertGreater(report[mode]["reservations_per_second"], 0)
+        self.assertFalse(Tenant.objects.filter(slug__startswith="bench-credit-").exists())
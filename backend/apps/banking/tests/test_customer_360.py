@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.apps.banking.models import Address, BankAccount, CreditLimit, Installment, Loan
+from backend.apps.banking.services.customer_360 import (
+    CUSTOMER_360_QUERY_BUDGET,
+    NEXT_INSTALLMENTS_PER_LOAN,
+    load_customer_360,
+)
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+
+class Customer360Test(TestCase):
+    def setUp(self) -> None:
+        self.tenant = create_tenant("visao-360")
+        self.customer, self.consultant = create_borrower(self.tenant)
+        self.url = f"/api/v1/tenants/{self.tenant.slug}/customers/{self.customer.id}/360"
+        self._add_children(suffix="0")
+        self.loan = create_loan(self.tenant, self.customer, self.consultant, installments=6)
+
+    def _add_children(self, suffix: str) -> None:
+        with use_tenant(self.tenant.id):
+            Address.objects.create(
+                tenant_id=self.tenant.id,
+                customer=self.customer,
+                zip_code="01000-000",
+                street=f"Rua {suffix}",
+                number=suffix,
+                neighborhood="Centro",
+                city="São Paulo",
+                state="SP",
+                is_primary=suffix == "0",
+            )
+            account = BankAccount.objects.create(
+                tenant_id=self.tenant.id,
+                customer=self.customer,
+                name=f"Conta {suffix}",
+                agency="0001",
+                account_number=f"1000{suffix}",
+                type=BankAccount.AccountType.CHECKING,
+            )
+            CreditLimit.objects.create(tenant_id=self.tenant.id, bank_account=account, current_limit=Decimal("5000.00"))
+
+    def _get(self, **headers):
+        return self.client.get(self.url, HTTP_X_TENANT_ID=self.tenant.slug, **headers)
+
+    def test_returns_aggregate_with_next_open_installments(self) -> None:
+        with use_tenant(self.tenant.id):
+            first = Installment.objects.get(loan=self.loan, installment_number=1)
+            first.status = Installment.Status.PAID
+            first.amount_paid = first.amount_due
+            first.save()
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["document_number"], self.customer.document_number)
+        self.assertEqual([item["street"] for item in body["addresses"]], ["Rua 0"])
+        self.assertEqual(body["bank_accounts"][0]["credit_limit"]["current_limit"], "5000.00")
+        loan = body["loans"][0]
+        self.assertEqual(loan["id"], str(self.loan.id))
+        self.assertEqual(
+            [item["installment_number"] for item in loan["next_installments"]],
+            list(range(2, 2 + NEXT_INSTALLMENTS_PER_LOAN)),
+        )
+        self.assertEqual(response["ETag"], load_customer_360(self.tenant, self.customer.id).etag)
+
+    def test_query_count_does_not_grow_with_fan_out(self) -> None:
+        with self.assertNumQueries(CUSTOMER_360_QUERY_BUDGET):
+            load_customer_360(self.tenant, self.customer.id)
+
+        for suffix in "123":
+            self._add_children(suffix)
+            create_loan(self.tenant, self.customer, self.consultant, installments=24)
+
+        # +1: resolução do tenant pelo slug na view.
+        with self.assertNumQueries(CUSTOMER_360_QUERY_BUDGET + 1):
+            response = self._get()
+        body = response.json()
+        self.assertEqual(len(body["addresses"]), 4)
+        self.assertEqual(len(body["bank_accounts"]), 4)
+        self.assertEqual(len(body["loans"]), 4)
+        self.assertTrue(all(len(loan["next_installments"]) == NEXT_INSTALLMENTS_PER_LOAN for loan in body["loans"]))
+
+    def test_etag_round_trip_and_invalidation(self) -> None:
+        etag = self._get()["ETag"]
+
+        with self.assertNumQueries(3):  # tenant, GUC e a linha do cliente com o carimbo
+            cached = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+
+        with use_tenant(self.tenant.id):
+            Installment.objects.filter(loan=self.loan, installment_number=3).update(
+                amount_paid=Decimal("1.00"),
+                updated_at=timezone.now(),
+            )
+        changed = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+        with use_tenant(self.tenant.id):
+            Address.objects.filter(customer=self.customer).delete()
+        self.assertNotEqual(self._get()["ETag"], changed["ETag"])
+
+    def test_if_none_match_accepts_lists_weak_tags_and_wildcard(self) -> None:
+        etag = self._get()["ETag"]
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+
+        for header in (f'"outra", {etag}', f"W/{etag}", "*"):
+            with self.subTest(header=header):
+                cached = self._get(HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached["ETag"], etag)
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag.strip('"')).status_code, 200)
+
+    def test_unknown_customer_and_missing_header(self) -> None:
+        missing = self.client.get(
+            f"/api/v1/tenants/{self.tenant.slug}/customers/{uuid.uuid4()}/360",
+            HTTP_X_TENANT_ID=self.tenant.slug,
+        )
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+        other = create_tenant("visao-360-b")
+        foreign = self.client.get(
+            f"/api/v1/tenants/{other.slug}/customers/{self.customer.id}/360",
+            HTTP_X_TENANT_ID=other.slug,
+        )
+        self.assertEqual(foreign.status_code, 404)
+        self.assertEqual(Loan.objects.scoped(self.tenant.id).count(), 1)
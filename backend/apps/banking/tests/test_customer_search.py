@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from prometheus_client import REGISTRY
+
+from backend.apps.banking.models import Customer
+from backend.apps.banking.services.customer_search import (
+    CustomerSearchError,
+    decode_cursor,
+    encode_cursor,
+    normalize_document,
+    search_customers,
+)
+from backend.apps.banking.tests.db_fixtures import create_tenant
+from backend.apps.foundation.services.seed_utils import VaultTransitFPEClient
+from backend.apps.tenancy.managers import use_tenant
+
+
+class CursorTest(SimpleTestCase):
+    def test_round_trip_and_mode_check(self) -> None:
+        customer_id = uuid.uuid4()
+        cursor = encode_cursor("name", "Ana Souza", customer_id)
+
+        self.assertEqual(decode_cursor(cursor, "name"), ("Ana Souza", customer_id))
+        with self.assertRaises(CustomerSearchError):
+            decode_cursor(cursor, "document")
+        with self.assertRaises(CustomerSearchError):
+            decode_cursor("não-é-base64", "name")
+
+    def test_normalize_document_keeps_masked_values(self) -> None:
+        masked = VaultTransitFPEClient(transit_path="transit/test").mask("12345678900", salt_version="v1")
+
+        self.assertEqual(normalize_document("123.456.789-00"), "12345678900")
+        self.assertEqual(normalize_document(masked), masked)
+
+
+class CustomerSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.tenant = create_tenant("busca-a")
+        self.other = create_tenant("busca-b")
+        self.masked = VaultTransitFPEClient(transit_path="transit/test").mask("98765432100", salt_version="v1")
+        rows = [
+            ("Ana Souza", "12345678900"),
+            ("Mariana Alves", "12345000011"),
+            ("Juliana Costa", "55544433322"),
+            ("Bruno Lima", self.masked),
+        ]
+        with use_tenant(self.tenant.id):
+            for name, document in rows:
+                Customer.objects.create(tenant_id=self.tenant.id, name=name, document_number=document)
+        with use_tenant(self.other.id):
+            Customer.objects.create(tenant_id=self.other.id, name="Ana Outra", document_number="12345999999")
+
+    def _names(self, page) -> list[str]:
+        return [hit.name for hit in page.results]
+
+    def test_name_matches_anywhere_case_insensitive(self) -> None:
+        page = search_customers(self.tenant, name="ANA")
+
+        self.assertEqual(self._names(page), ["Ana Souza", "Juliana Costa", "Mariana Alves"])
+        self.assertIsNone(page.next_cursor)
+
+    def test_document_prefix_ignores_punctuation_and_other_tenants(self) -> None:
+        page = search_customers(self.tenant, document="123.45")
+
+        self.assertEqual([hit.document_number for hit in page.results], ["12345000011", "12345678900"])
+
+    def test_masked_document_matches_exactly(self) -> None:
+        page = search_customers(self.tenant, document=self.masked)
+
+        self.assertEqual(self._names(page), ["Bruno Lima"])
+        self.assertEqual(page.results[0].document_number, self.masked)
+
+    def test_keyset_pages_cover_results_once(self) -> None:
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = search_customers(self.tenant, name="ana", limit=1, cursor=cursor)
+            seen.extend(self._names(page))
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, ["Ana Souza", "Juliana Costa", "Mariana Alves"])
+
+    def test_rejects_short_terms_and_bad_parameters(self) -> None:
+        with self.assertRaises(CustomerSearchError):
+            search_customers(self.tenant, name="an")
+        with self.assertRaises(CustomerSearchError):
+            search_customers(self.tenant, name="ana", limit=0)
+        with self.assertRaises(CustomerSearchError):
+            search_customers(self.tenant, name="ana", status="UNKNOWN")
+
+    def test_records_latency_histogram(self) -> None:
+        labels = {"tenant_slug": self.tenant.slug, "mode": "document"}
+        before = REGISTRY.get_sample_value("banking_customer_search_seconds_count", labels) or 0
+
+        search_customers(self.tenant, document="555")
+
+        self.assertEqual(REGISTRY.get_sample_value("banking_customer_search_seconds_count", labels), before + 1)
+
+    def test_indexes_exist_for_search_paths(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'banking_customer'")
+            indexes = {row[0] for row in cursor.fetchall()}
+
+        self.assertTrue({"banking_cust_name_idx", "banking_cust_doc_prefix_idx"} <= indexes)
+
+    def test_name_predicate_is_served_by_trigram_index(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'banking_cust_name_trgm_idx'")
+            if cursor.fetchone() is None:
+                self.skipTest("pg_trgm indisponível neste servidor; índice trigram não criado.")
+            # Sem varredura sequencial nem index scan em btree, só sobra o bitmap do
+            # trigram: se ele não servir ao predicado do icontains, o plano cai no seq scan.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            plan = Customer.objects.unscoped().filter(name__icontains="ana").explain()
+
+        self.assertIn("banking_cust_name_trgm_idx", plan)
+
+    def test_api_returns_page_and_validates_header(self) -> None:
+        url = f"/api/v1/tenants/{self.tenant.slug}/customers/search"
+
+        response = self.client.get(url, {"name": "ana", "limit": 2}, HTTP_X_TENANT_ID=self.tenant.slug)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([item["name"] for item in body["results"]], ["Ana Souza", "Juliana Costa"])
+        self.assertIsNotNone(body["next_cursor"])
+
+        follow = self.client.get(url, {"name": "ana", "cursor": body["next_cursor"]}, HTTP_X_TENANT_ID=self.tenant.slug)
+        self.assertEqual([item["name"] for item in follow.json()["results"]], ["Mariana Alves"])
+
+        self.assertEqual(self.client.get(url, {"name": "ana"}).status_code, 400)
+        bad = self.client.get(url, {"name": "ana", "limit": "x"}, HTTP_X_TENANT_ID=self.tenant.slug)
+        self.assertEqual(bad.status_code, 400)
+
+    def test_benchmark_command_reports_percentiles(self) -> None:
+        out = StringIO()
+        call_command(
+            "benchmark_customer_search",
+            tenant=self.tenant.slug,
+            name=["ana"],
+            iterations=3,
+            seed_rows=50,
+            p95_target_ms=10_000,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["samples"], 3)
+        self.assertEqual(Customer.objects.scoped(self.tenant.id).count(), 54)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from prometheus_client import REGISTRY
+
+from backend.apps.banking.models import Customer, Installment
+from backend.apps.banking.services.delinquency import DelinquencyClassifier
+from backend.apps.banking.tasks import classify_delinquency
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+RUN_DATE = date(2025, 5, 15)
+
+
+class DelinquencyClassifierTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-inadimplencia")
+        # Vencimentos 10/02 a 10/07: em 15/05 há atrasos de 94, 66, 35 e 5 dias.
+        self.late, consultant = create_borrower(self.tenant, "11111111111")
+        create_loan(self.tenant, self.late, consultant, installments=6)
+        # Primeira parcela em 01/05: 14 dias de atraso, abaixo do limite.
+        self.recent, _ = create_borrower(self.tenant, "22222222222")
+        create_loan(self.tenant, self.recent, consultant, installments=3, first_installment_date=date(2025, 5, 1))
+        self.cured, _ = create_borrower(self.tenant, "33333333333")
+        self.blocked, _ = create_borrower(self.tenant, "44444444444")
+        create_loan(self.tenant, self.blocked, consultant, installments=2)
+        with use_tenant(self.tenant.id):
+            Customer.objects.filter(id=self.cured.id).update(status=Customer.Status.DELINQUENT)
+            Customer.objects.filter(id=self.blocked.id).update(status=Customer.Status.BLOCKED)
+
+    def _status(self, customer: Customer) -> str:
+        with use_tenant(self.tenant.id):
+            return Customer.objects.get(id=customer.id).status
+
+    def test_classifies_by_worst_days_past_due_in_grouped_chunks(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            result = DelinquencyClassifier(chunk_size=3).classify(self.tenant, RUN_DATE)
+
+        self.assertEqual((result.customers_scanned, result.chunks), (4, 2))
+        self.assertEqual((result.marked_delinquent, result.restored_active, result.delinquent_customers), (1, 1, 1))
+        self.assertEqual(self._status(self.late), Customer.Status.DELINQUENT)
+        self.assertEqual(self._status(self.recent), Customer.Status.ACTIVE)
+        self.assertEqual(self._status(self.cured), Customer.Status.ACTIVE)
+        self.assertEqual(self._status(self.blocked), Customer.Status.BLOCKED)
+        reads = [query for query in queries.captured_queries if "LEFT JOIN LATERAL" in query["sql"]]
+        self.assertEqual(len(reads), 2)
+
+        counts = {label: bucket.installments for label, bucket in result.buckets.items()}
+        self.assertEqual(counts, {"0-30": 2, "31-60": 1, "61-90": 2, "90+": 2})
+
+    def test_paid_installments_do_not_count(self) -> None:
+        with use_tenant(self.tenant.id):
+            Installment.objects.filter(loan__customer=self.late, due_date__lt=date(2025, 4, 10)).update(
+                status=Installment.Status.PAID,
+            )
+
+        result = DelinquencyClassifier().classify(self.tenant, RUN_DATE)
+
+        self.assertEqual(self._status(self.late), Customer.Status.DELINQUENT)
+        self.assertEqual(result.buckets["90+"].installments, 1)
+
+        again = DelinquencyClassifier(threshold_days=40).classify(self.tenant, RUN_DATE)
+        self.assertEqual(again.restored_active, 1)
+        self.assertEqual(self._status(self.late), Customer.Status.ACTIVE)
+
+    def test_rejects_invalid_configuration(self) -> None:
+        with self.assertRaises(ValueError):
+            DelinquencyClassifier(chunk_size=0)
+        with self.assertRaises(ValueError):
+            DelinquencyClassifier(threshold_days=-1)
+
+    def test_task_publishes_aging_gauges(self) -> None:
+        summary = classify_delinquency.apply(
+            kwargs={"run_date": RUN_DATE.isoformat(), "tenant_ids": [str(self.tenant.id)]},
+        ).get()
+
+        self.assertEqual((summary["marked_delinquent"], summary["restored_active"]), (1, 1))
+        labels = {"tenant_slug": self.tenant.slug, "bucket": "61-90"}
+        self.assertEqual(REGISTRY.get_sample_value("banking_delinquency_aging_installments", labels), 2.0)
+        self.assertGreater(REGISTRY.get_sample_value("banking_delinquency_aging_amount", labels), 0)
+        self.assertEqual(REGISTRY.get_sample_value("banking_delinquent_customers", {"tenant_slug": self.tenant.slug}), 1.0)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import csv
+import math
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from backend.apps.banking.models import Installment, Loan
+from backend.apps.banking.services.early_settlement import (
+    CSV_HEADER,
+    SINGLE_LOAN_P95_TARGET_MS,
+    discount_remaining,
+    quote_early_settlement,
+    quote_tenant_settlements,
+    stream_settlement_csv,
+)
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+
+class DiscountRemainingTest(SimpleTestCase):
+    def test_overdue_installments_are_not_discounted(self) -> None:
+        outstanding, settlement = discount_remaining(
+            Decimal("2.00"),
+            [date(2025, 1, 10), date(2025, 2, 10)],
+            [Decimal("100.00"), Decimal("50.25")],
+            date(2025, 2, 10),
+        )
+        self.assertEqual((outstanding, settlement), (15025, 15025))
+
+    def test_future_installments_discount_pro_rata_at_contract_rate(self) -> None:
+        outstanding, settlement = discount_remaining(
+            Decimal("1.50"),
+            [date(2025, 3, 12), date(2025, 4, 11)],
+            [Decimal("1000.00"), Decimal("1000.00")],
+            date(2025, 2, 10),
+        )
+        expected = 100000 / 1.015 + 100000 / 1.015**2
+        self.assertEqual(outstanding, 200000)
+        self.assertEqual(settlement, round(expected))
+
+    def test_zero_rate_settles_at_face_value(self) -> None:
+        _, settlement = discount_remaining(Decimal("0"), [date(2026, 1, 1)], [Decimal("10.00")], date(2025, 1, 1))
+        self.assertEqual(settlement, 1000)
+
+
+class EarlySettlementQuoteTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-quitacao")
+        customer, consultant = create_borrower(self.tenant)
+        self.loan = create_loan(self.tenant, customer, consultant, installments=12)
+        self.other_loan = create_loan(self.tenant, customer, consultant, principal="2500.00", installments=6)
+        self.closed_loan = create_loan(self.tenant, customer, consultant, status=Loan.Status.PAID_OFF)
+
+    def _pay(self, loan: Loan, *numbers: int, partial: Decimal | None = None) -> None:
+        with use_tenant(self.tenant.id):
+            for installment in Installment.objects.filter(loan=loan, installment_number__in=numbers):
+                installment.amount_paid = partial if partial is not None else installment.amount_due
+                installment.save(update_fields=["amount_paid"])
+
+    def test_quote_discounts_only_unpaid_balances(self) -> None:
+        self._pay(self.loan, 1, 2)
+        self._pay(self.loan, 3, partial=Decimal("100.00"))
+        quote = quote_early_settlement(self.tenant.id, self.loan.id, date(2025, 4, 10))
+
+        with use_tenant(self.tenant.id):
+            open_rows = list(
+                Installment.objects.filter(loan=self.loan, installment_number__gte=3).order_by("installment_number"),
+            )
+        residuals = [row.amount_due - row.amount_paid for row in open_rows]
+        present_value = sum(
+            float(residual) / 1.015 ** (max(0, (row.due_date - date(2025, 4, 10)).days) / 30)
+            for row, residual in zip(open_rows, residuals)
+        )
+
+        self.assertEqual(quote.open_installments, 10)
+        self.assertEqual(quote.outstanding_amount, sum(residuals))
+        self.assertAlmostEqual(float(quote.settlement_amount), present_value, delta=0.01)
+        self.assertEqual(quote.discount_amount, quote.outstanding_amount - quote.settlement_amount)
+        self.assertGreater(quote.discount_amount, Decimal("0"))
+
+    def test_single_loan_quote_uses_one_query(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            quote_early_settlement(self.tenant.id, self.loan.id, date(2025, 1, 10))
+        statements = [query["sql"] for query in queries.captured_queries if "banking_installment" in query["sql"]]
+        self.assertEqual(len(statements), 1)
+
+    def test_unknown_or_closed_loan_returns_zero_quote(self) -> None:
+        for loan_id in (uuid.uuid4(), self.closed_loan.id):
+            quote = quote_early_settlement(self.tenant.id, loan_id, date(2025, 1, 10))
+            self.assertEqual(quote.open_installments, 0)
+            self.assertEqual(quote.settlement_amount, Decimal("0.00"))
+
+    def test_tenant_quotes_match_single_loan_quotes(self) -> None:
+        settlement_date = date(2025, 6, 1)
+        quotes = quote_tenant_settlements(self.tenant.id, settlement_date)
+
+        self.assertEqual({quote.loan_id for quote in quotes}, {self.loan.id, self.other_loan.id})
+        for quote in quotes:
+            self.assertEqual(quote, quote_early_settlement(self.tenant.id, quote.loan_id, settlement_date))
+
+    def test_csv_stream_has_header_and_one_row_per_open_loan(self) -> None:
+        lines = list(stream_settlement_csv(self.tenant.id, date(2025, 6, 1), chunk_size=1))
+        rows = list(csv.reader(lines))
+
+        self.assertEqual(tuple(rows[0]), CSV_HEADER)
+        self.assertEqual(sorted(row[0] for row in rows[1:]), sorted([str(self.loan.id), str(self.other_loan.id)]))
+
+    def test_single_loan_p95_within_target(self) -> None:
+        samples = []
+        for _ in range(40):
+            started = time.perf_counter()
+            quote_early_settlement(self.tenant.id, self.loan.id, date(2025, 3, 1))
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[math.ceil(0.95 * len(samples)) - 1]
+        self.assertLess(p95, SINGLE_LOAN_P95_TARGET_MS)
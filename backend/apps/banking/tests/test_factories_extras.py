@@ -23,6 +23,21 @@ class BankingFactoriesEdgeCasesTest(SimpleTestCase):
         default_ctx = FactoryContext.default()
         self.assertEqual(default_ctx.tenant_slug, "00000000")
         self.assertIsInstance(default_ctx.factory_seed, int)
+        self.assertIs(default_ctx.fpe_client, default_ctx.fpe_client)
+        self.assertIsNot(default_ctx.with_overrides(salt_version="v2").fpe_client, default_ctx.fpe_client)
+
+    def test_seed_streams_are_reproducible_per_entity_and_shard(self) -> None:
+        first = self.context.stream("customers", 0)
+        digits, letters = first.digits(4, 11), first.letters(4, 2)
+        amounts = first.decimals(4, Decimal("10"), Decimal("500"))
+
+        again = FactoryContext.default().stream("customers", 0)
+        self.assertEqual((again.digits(4, 11), again.letters(4, 2)), (digits, letters))
+        self.assertEqual(again.decimals(4, Decimal("10"), Decimal("500")), amounts)
+        self.assertTrue(all(len(value) == 11 and value.isdigit() for value in digits))
+        self.assertTrue(all(Decimal("10") <= amount <= Decimal("500") for amount in amounts))
+        self.assertNotEqual(self.context.stream("customers", 1).digits(4, 11), digits)
+        self.assertNotEqual(self.context.with_overrides(salt_version="v2").stream("customers", 0).digits(4, 11), digits)
 
     def test_construct_instance_requires_factory_context_type(self) -> None:
         with self.assertRaises(TypeError):
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import calendar
+import itertools
+import random
+from datetime import date
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from backend.apps.banking.services import month_calendar
+from backend.apps.banking.services.financial_calculations import LoanInput, _add_months, generate_installments
+from backend.apps.banking.services.installment_stream import InstallmentRow, iter_installments
+from backend.apps.banking.services.month_calendar import MonthEndCalendar, get_month_calendar
+
+
+def _loan(principal: str, annual_rate: str, installments: int, first_installment_date: date) -> LoanInput:
+    return LoanInput(
+        principal_amount=Decimal(principal),
+        annual_rate_pct=Decimal(annual_rate),
+        number_of_installments=installments,
+        contract_date=date(2025, 1, 10),
+        first_installment_date=first_installment_date,
+    )
+
+
+class MonthEndCalendarTest(SimpleTestCase):
+    def test_matches_monthrange_clamping(self) -> None:
+        table = MonthEndCalendar(1999, 2030)
+        for year in range(1999, 2031):
+            for month in range(1, 13):
+                last_day = calendar.monthrange(year, month)[1]
+                for day in (1, 28, 29, 30, 31):
+                    expected = date(year, month, min(day, last_day)).toordinal()
+                    self.assertEqual(table.due_ordinal(year * 12 + month - 1, day), expected)
+
+    def test_add_months_crosses_year_boundaries(self) -> None:
+        table = MonthEndCalendar(2023, 2026)
+        self.assertEqual(table.add_months(date(2023, 12, 31), 2), date(2024, 2, 29))
+        self.assertEqual(table.add_months(date(2024, 3, 31), -1), date(2024, 2, 29))
+        self.assertEqual(table.add_months(date(2025, 1, 15), 23), date(2026, 12, 15))
+
+    def test_rejects_invalid_year_range(self) -> None:
+        with self.assertRaises(ValueError):
+            MonthEndCalendar(2030, 2020)
+
+    def test_shared_calendar_widens_for_long_schedules(self) -> None:
+        previous = month_calendar._calendar
+        self.addCleanup(setattr, month_calendar, "_calendar", previous)
+        month_calendar._calendar = None
+
+        default = get_month_calendar()
+        self.assertTrue(default.covers(month_calendar.DEFAULT_FIRST_YEAR, month_calendar.DEFAULT_LAST_YEAR))
+        self.assertIs(get_month_calendar(2000, 2050), default)
+
+        widened = get_month_calendar(2090, 2140)
+        self.assertTrue(widened.covers(month_calendar.DEFAULT_FIRST_YEAR, 2140))
+        self.assertEqual(_add_months(date(2139, 1, 31), 1), date(2139, 2, 28))
+
+
+class IterInstallmentsTest(SimpleTestCase):
+    def test_rows_match_generate_installments(self) -> None:
+        rng = random.Random(2024)
+        loans = [
+            (
+                index,
+                _loan(
+                    f"{rng.randint(10_000, 50_000_000) / 100:.2f}",
+                    f"{rng.randint(0, 6000) / 100:.2f}",
+                    rng.randint(1, 420),
+                    date(2024, 1, 1) + (date(2026, 12, 31) - date(2024, 1, 1)) * rng.random(),
+                ),
+            )
+            for index in range(40)
+        ]
+        expected = [
+            InstallmentRow(loan_ref, quote.number, quote.due_date, quote.amount)
+            for loan_ref, request in loans
+            for quote in generate_installments(request)
+        ]
+        self.assertEqual(list(iter_installments(loans)), expected)
+
+    def test_is_lazy_over_unbounded_input(self) -> None:
+        request = _loan("1200.00", "18.00", 12, date(2025, 1, 31))
+        rows = iter_installments((loan_ref, request) for loan_ref in itertools.count())
+        head = list(itertools.islice(rows, 30))
+
+        self.assertEqual([row.loan_ref for row in head], [0] * 12 + [1] * 12 + [2] * 6)
+        self.assertEqual(head[1].due_date, date(2025, 2, 28))
+
+    def test_rows_are_plain_tuples(self) -> None:
+        row = next(iter_installments([("loan-1", _loan("500.00", "10.00", 1, date(2025, 2, 10)))]))
+        self.assertIsInstance(row, tuple)
+        self.assertFalse(hasattr(row, "__dict__"))
+        self.assertEqual(row, ("loan-1", 1, date(2025, 2, 10), generate_installments(_loan("500.00", "10.00", 1, date(2025, 2, 10)))[0].amount))
+
+    def test_invalid_installment_count_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_installments([(1, _loan("500.00", "10.00", 0, date(2025, 2, 10)))]))
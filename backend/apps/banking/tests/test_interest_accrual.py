@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.test import TestCase, TransactionTestCase
+from prometheus_client import REGISTRY
+
+from backend.apps.banking.models import Installment, Loan, LoanInterestAccrual
+from backend.apps.banking.services.interest_accrual import InterestAccrualEngine, accrue_interest
+from backend.apps.banking.tasks import accrue_loan_interest
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+DAY = date(2025, 4, 20)
+RATE = Decimal("0.015")
+DAILY_RATE = (Decimal(1.015 ** (1 / 30)) - 1).quantize(Decimal("1e-10"), rounding=ROUND_HALF_UP)
+
+
+def _remaining_present_value(amounts: list[Decimal]) -> Decimal:
+    """Valor presente das parcelas em aberto: é o saldo devedor que o cronograma amortiza."""
+    return sum(amount / (1 + RATE) ** position for position, amount in enumerate(amounts, start=1))
+
+
+class InterestAccrualTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-juros")
+        customer, consultant = create_borrower(self.tenant)
+        self.loans = [create_loan(self.tenant, customer, consultant) for _ in range(3)]
+        create_loan(self.tenant, customer, consultant, status=Loan.Status.PAID_OFF)
+        create_loan(self.tenant, customer, consultant, contract_date=date(2025, 5, 1), first_installment_date=date(2025, 6, 1))
+
+    def _accruals(self) -> dict:
+        with use_tenant(self.tenant.id):
+            return {row.loan_id: row for row in LoanInterestAccrual.objects.filter(accrual_date=DAY)}
+
+    def test_accrues_on_price_outstanding_principal_in_chunks(self) -> None:
+        with use_tenant(self.tenant.id):
+            Installment.objects.filter(loan=self.loans[0], installment_number__lte=2).update(status=Installment.Status.PAID)
+            open_amounts = list(
+                Installment.objects.filter(loan=self.loans[0], installment_number__gt=2)
+                .order_by("installment_number")
+                .values_list("amount_due", flat=True),
+            )
+            loans = Loan.objects.filter(id__in=[loan.id for loan in self.loans])
+            financed = {loan.id: loan.principal_amount + loan.iof_amount for loan in loans}
+
+        result = InterestAccrualEngine(chunk_size=2).accrue(self.tenant, DAY)
+
+        self.assertEqual((result.loans_scanned, result.rows_inserted, result.chunks), (3, 3, 2))
+        accruals = self._accruals()
+        self.assertEqual(set(accruals), {loan.id for loan in self.loans})
+        untouched = accruals[self.loans[1].id]
+        # Sem parcelas pagas o saldo é o valor financiado (principal + IOF), não só o principal.
+        self.assertGreater(financed[self.loans[1].id], Decimal("10000.00"))
+        self.assertEqual(untouched.outstanding_principal, financed[self.loans[1].id])
+        self.assertEqual(untouched.daily_rate, DAILY_RATE)
+        self.assertEqual(
+            untouched.amount,
+            (financed[self.loans[1].id] * DAILY_RATE).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+        )
+        amortized = accruals[self.loans[0].id]
+        # Arredondamento da parcela a centavos acumula poucos centavos em 10 parcelas.
+        self.assertAlmostEqual(amortized.outstanding_principal, _remaining_present_value(open_amounts), delta=Decimal("0.10"))
+        self.assertEqual(result.amount, sum(row.amount for row in accruals.values()))
+
+    def test_rerunning_a_date_does_not_duplicate(self) -> None:
+        first = InterestAccrualEngine().accrue(self.tenant, DAY)
+        again = InterestAccrualEngine().accrue(self.tenant, DAY)
+
+        self.assertEqual((first.rows_inserted, again.rows_inserted, again.loans_scanned), (3, 0, 3))
+        self.assertEqual(len(self._accruals()), 3)
+
+    def test_task_reports_throughput(self) -> None:
+        summary = accrue_loan_interest.apply(
+            kwargs={"accrual_date": DAY.isoformat(), "tenant_ids": [str(self.tenant.id)], "workers": 1},
+        ).get()
+
+        self.assertEqual(summary["rows_inserted"], 3)
+        self.assertIsNotNone(
+            REGISTRY.get_sample_value("banking_interest_accrual_loans_per_second", {"tenant_slug": self.tenant.slug}),
+        )
+
+    def test_rejects_invalid_configuration(self) -> None:
+        with self.assertRaises(ValueError):
+            InterestAccrualEngine(chunk_size=0)
+        with self.assertRaises(ValueError):
+            accrue_interest(DAY, workers=0)
+
+
+class InterestAccrualParallelTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_worker_pool_runs_tenants_concurrently(self) -> None:
+        tenants = []
+        for slug, document, loans in (("tenant-juros-a", "11111111111", 1), ("tenant-juros-b", "22222222222", 2)):
+            tenant = create_tenant(slug)
+            customer, consultant = create_borrower(tenant, document)
+            for _ in range(loans):
+                create_loan(tenant, customer, consultant)
+            tenants.append(tenant)
+
+        results = accrue_interest(DAY, [str(tenant.id) for tenant in tenants], workers=2)
+
+        self.assertEqual({result.tenant_id: result.rows_inserted for result in results}, {str(tenants[0].id): 1, str(tenants[1].id): 2})
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from prometheus_client import REGISTRY
+
+from backend.apps.banking.models import BatchJobCursor, Installment
+from backend.apps.banking.services.overdue_sweeper import OVERDUE_SWEEP_JOB, OverdueSweeper
+from backend.apps.banking.tasks import sweep_overdue_installments
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+
+class OverdueSweeperTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-sweep")
+        self.other_tenant = create_tenant("tenant-sweep-outro")
+        customer, consultant = create_borrower(self.tenant)
+        other_customer, other_consultant = create_borrower(self.other_tenant)
+        # Vencimentos 10/02 a 10/07 de 2025; em 15/05 quatro parcelas já venceram.
+        self.loans = [create_loan(self.tenant, customer, consultant, installments=6) for _ in range(3)]
+        create_loan(self.other_tenant, other_customer, other_consultant, installments=6)
+        self.run_date = date(2025, 5, 15)
+
+    def _statuses(self, tenant) -> dict[str, int]:
+        with use_tenant(tenant.id):
+            rows = Installment.objects.values_list("status", flat=True)
+            return {status: list(rows).count(status) for status in set(rows)}
+
+    def test_flips_only_past_due_pending_rows_of_the_tenant(self) -> None:
+        with use_tenant(self.tenant.id):
+            Installment.objects.filter(loan=self.loans[0], installment_number=1).update(
+                status=Installment.Status.PAID,
+            )
+
+        result = OverdueSweeper(chunk_size=5).sweep(self.tenant, self.run_date)
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.rows_updated, 11)
+        self.assertEqual(result.chunks, 3)
+        self.assertEqual(result.lag_days, (self.run_date - date(2025, 2, 10)).days)
+        self.assertEqual(self._statuses(self.tenant), {"OVERDUE": 11, "PAID": 1, "PENDING": 6})
+        self.assertEqual(self._statuses(self.other_tenant), {"PENDING": 6})
+
+    def test_resumes_from_persisted_cursor(self) -> None:
+        first = OverdueSweeper(chunk_size=4, max_chunks=1).sweep(self.tenant, self.run_date)
+        self.assertFalse(first.completed)
+        self.assertEqual(first.rows_updated, 4)
+
+        with use_tenant(self.tenant.id):
+            cursor = BatchJobCursor.objects.get(job=OVERDUE_SWEEP_JOB, run_date=self.run_date)
+        self.assertEqual(cursor.processed_rows, 4)
+        self.assertEqual(len(cursor.position["last_key"]), 3)
+
+        second = OverdueSweeper(chunk_size=4).sweep(self.tenant, self.run_date)
+        self.assertTrue(second.completed)
+        self.assertEqual(first.rows_updated + second.rows_updated, 12)
+
+        again = OverdueSweeper(chunk_size=4).sweep(self.tenant, self.run_date)
+        self.assertEqual((again.rows_updated, again.chunks), (0, 0))
+
+    def test_rejects_non_positive_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            OverdueSweeper(chunk_size=0)
+
+    def test_task_sweeps_every_tenant_and_reports_metrics(self) -> None:
+        summary = sweep_overdue_installments.apply(kwargs={"run_date": self.run_date.isoformat()}).get()
+
+        self.assertEqual(summary["rows_updated"], 16)
+        self.assertEqual(summary["pending_tenants"], [])
+        self.assertEqual(
+            REGISTRY.get_sample_value("banking_overdue_sweep_lag_days", {"tenant_slug": self.tenant.slug}),
+            float((self.run_date - date(2025, 2, 10)).days),
+        )
+        self.assertIsNotNone(
+            REGISTRY.get_sample_value("banking_overdue_sweep_rows_per_second", {"tenant_slug": self.tenant.slug}),
+        )
+
+    def test_task_reports_pending_tenants_when_budget_runs_out(self) -> None:
+        summary = sweep_overdue_installments.apply(
+            kwargs={"run_date": self.run_date.isoformat(), "tenant_ids": [str(self.tenant.id)], "max_chunks": 0},
+        ).get()
+        self.assertEqual(summary["pending_tenants"], [str(self.tenant.id)])
+
+
+class OverdueSweeperConcurrencyTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_locked_row_keeps_the_day_pending_until_it_is_swept(self) -> None:
+        tenant = create_tenant("tenant-sweep-concorrente")
+        customer, consultant = create_borrower(tenant)
+        loan = create_loan(tenant, customer, consultant, installments=6)
+        run_date = date(2025, 5, 15)
+        with use_tenant(tenant.id):
+            locked = Installment.objects.get(loan=loan, installment_number=1)
+
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_lock() -> None:
+            try:
+                with use_tenant(tenant.id), transaction.atomic():
+                    Installment.objects.select_for_update().get(id=locked.id)
+                    holding.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=hold_lock)
+        worker.start()
+        self.assertTrue(holding.wait(timeout=10))
+        try:
+            blocked = OverdueSweeper(chunk_size=2).sweep(tenant, run_date)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual(blocked.rows_updated, 3)
+        self.assertFalse(blocked.completed)
+        self.assertTrue(blocked.stalled)
+        with use_tenant(tenant.id):
+            self.assertEqual(Installment.objects.get(id=locked.id).status, Installment.Status.PENDING)
+            cursor = BatchJobCursor.objects.get(job=OVERDUE_SWEEP_JOB, run_date=run_date)
+        self.assertIsNone(cursor.completed_at)
+
+        retry = OverdueSweeper(chunk_size=2).sweep(tenant, run_date)
+
+        self.assertTrue(retry.completed)
+        self.assertEqual(retry.rows_updated, 1)
+        with use_tenant(tenant.id):
+            self.assertEqual(Installment.objects.get(id=locked.id).status, Installment.Status.OVERDUE)
+            self.assertFalse(
+                Installment.objects.filter(status=Installment.Status.PENDING, due_date__lt=run_date).exists(),
+            )
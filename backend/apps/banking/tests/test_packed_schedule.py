@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from backend.apps.banking.models import FinancialTransaction, Installment, Loan
+from backend.apps.banking.services.packed_schedule import pack_schedule, read_schedule, unpack_schedule
+from backend.apps.banking.services.payment_posting import post_payments
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+
+class PackedScheduleFormatTest(SimpleTestCase):
+    def test_round_trip_keeps_columns_and_is_compact(self) -> None:
+        rows = [
+            (1, date(2025, 2, 10), Decimal("916.80"), Decimal("916.80")),
+            (3, date(2025, 4, 10), Decimal("916.80"), Decimal("100.00")),
+            (4, date(2025, 5, 10), Decimal("916.79"), Decimal("0")),
+        ]
+
+        blob = pack_schedule(rows)
+        schedule = unpack_schedule(blob)
+
+        self.assertEqual(len(blob), 3 + 22 * len(rows))
+        self.assertEqual([tuple(row) for row in schedule.rows()], rows)
+        self.assertEqual(schedule.open_balance, Decimal("1733.59"))
+
+    def test_rejects_unknown_version(self) -> None:
+        with self.assertRaises(ValueError):
+            unpack_schedule(b"\x09\x00\x00")
+
+
+class PackedScheduleSyncTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-cronograma")
+        customer, consultant = create_borrower(self.tenant)
+        self.loan = create_loan(self.tenant, customer, consultant, installments=6)
+
+    def _installment(self, number: int) -> Installment:
+        with use_tenant(self.tenant.id):
+            return Installment.objects.get(loan=self.loan, installment_number=number)
+
+    def test_reader_packs_lazily_then_reads_one_row(self) -> None:
+        with use_tenant(self.tenant.id):
+            self.assertIsNone(Loan.objects.get(id=self.loan.id).packed_schedule)
+
+        first = read_schedule(self.tenant.id, self.loan.id)
+        with CaptureQueriesContext(connection) as queries:
+            second = read_schedule(self.tenant.id, self.loan.id)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(second), 6)
+        tables = [query["sql"] for query in queries.captured_queries if "banking_" in query["sql"]]
+        self.assertEqual(len(tables), 1)
+        self.assertNotIn("banking_installment", tables[0])
+
+    def test_installment_changes_and_payment_posting_keep_it_in_sync(self) -> None:
+        installment = self._installment(2)
+        with use_tenant(self.tenant.id), self.captureOnCommitCallbacks(execute=True):
+            installment.due_date = date(2025, 3, 20)
+            installment.save()
+        rows = list(read_schedule(self.tenant.id, self.loan.id).rows())
+        self.assertEqual(rows[1].due_date, date(2025, 3, 20))
+
+        first = self._installment(1)
+        with use_tenant(self.tenant.id):
+            payment = FinancialTransaction.objects.create(
+                description="Parcela 1",
+                amount=Decimal("50.00"),
+                transaction_date=date(2025, 2, 10),
+                is_paid=True,
+                payment_date=date(2025, 2, 10),
+                type=FinancialTransaction.TransactionType.INCOME,
+                installment=first,
+            )
+        post_payments(self.tenant.id, [payment.id])
+        rows = list(read_schedule(self.tenant.id, self.loan.id).rows())
+        self.assertEqual(rows[0].amount_paid, Decimal("50.00"))
+
+        with use_tenant(self.tenant.id), self.captureOnCommitCallbacks(execute=True):
+            self._installment(3).delete()
+        rows = list(read_schedule(self.tenant.id, self.loan.id).rows())
+        self.assertEqual([row.installment_number for row in rows], [1, 2, 4, 5, 6])
+
+    def test_bulk_saves_repack_each_loan_once_on_commit(self) -> None:
+        with use_tenant(self.tenant.id):
+            installments = list(Installment.objects.filter(loan=self.loan).order_by("installment_number"))
+        with CaptureQueriesContext(connection) as queries:
+            with use_tenant(self.tenant.id), self.captureOnCommitCallbacks(execute=True) as callbacks:
+                for installment in installments:
+                    installment.amount_paid = Decimal("1.00")
+                    installment.save()
+                repacks_before_commit = sum("packed_schedule" in query["sql"] for query in queries.captured_queries)
+
+        self.assertEqual(repacks_before_commit, 0)
+        self.assertEqual(len(callbacks), len(installments))
+        self.assertEqual(sum("packed_schedule" in query["sql"] for query in queries.captured_queries), 1)
+        self.assertTrue(all(row.amount_paid == Decimal("1.00") for row in read_schedule(self.tenant.id, self.loan.id).rows()))
+
+    def test_unknown_loan_returns_none(self) -> None:
+        self.assertIsNone(read_schedule(self.tenant.id, "00000000-0000-0000-0000-000000000000"))
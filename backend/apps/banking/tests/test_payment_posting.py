@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from backend.apps.banking.models import FinancialTransaction, Installment
+from backend.apps.banking.services.payment_posting import PaymentPostingService, post_payments
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+
+def _payment(tenant, target: Installment, amount: str, paid_on: date, **overrides) -> FinancialTransaction:
+    values = {
+        "tenant_id": tenant.id,
+        "description": f"Recebimento parcela {target.installment_number}",
+        "amount": Decimal(amount),
+        "transaction_date": paid_on,
+        "is_paid": True,
+        "payment_date": paid_on,
+        "type": FinancialTransaction.TransactionType.INCOME,
+        "installment": target,
+    }
+    values.update(overrides)
+    with use_tenant(tenant.id):
+        return FinancialTransaction.objects.create(**values)
+
+
+class PaymentPostingTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-baixa")
+        customer, consultant = create_borrower(self.tenant)
+        loan = create_loan(self.tenant, customer, consultant, installments=3)
+        with use_tenant(self.tenant.id):
+            self.installments = list(Installment.objects.filter(loan=loan).order_by("installment_number"))
+
+    def _reload(self, installment: Installment) -> Installment:
+        with use_tenant(self.tenant.id):
+            return Installment.objects.get(id=installment.id)
+
+    def test_applies_full_and_partial_payments(self) -> None:
+        first, second, _ = self.installments
+        full = _payment(self.tenant, first, str(first.amount_due), date(2025, 2, 9))
+        partial_a = _payment(self.tenant, second, "100.00", date(2025, 3, 1))
+        partial_b = _payment(self.tenant, second, "50.00", date(2025, 3, 5))
+
+        result = post_payments(self.tenant.id, [full.id, partial_a.id, partial_b.id])
+
+        self.assertEqual(sorted(result.posted), sorted([full.id, partial_a.id, partial_b.id]))
+        self.assertEqual(result.installments_updated, 2)
+        paid = self._reload(first)
+        self.assertEqual((paid.status, paid.amount_paid, paid.payment_date), ("PAID", first.amount_due, date(2025, 2, 9)))
+        partial = self._reload(second)
+        self.assertEqual(partial.status, Installment.Status.PARTIALLY_PAID)
+        self.assertEqual(partial.amount_paid, Decimal("150.00"))
+        self.assertEqual(partial.payment_date, date(2025, 3, 5))
+
+    def test_small_chunks_accumulate_on_the_same_installment(self) -> None:
+        target = self.installments[2]
+        payments = [_payment(self.tenant, target, "20.00", date(2025, 4, day)) for day in range(1, 6)]
+
+        result = post_payments(self.tenant.id, [payment.id for payment in payments], chunk_size=2)
+
+        self.assertEqual(len(result.posted), 5)
+        self.assertEqual(self._reload(target).amount_paid, Decimal("100.00"))
+        self.assertEqual(self._reload(target).payment_date, date(2025, 4, 5))
+
+    def test_is_idempotent_per_transaction(self) -> None:
+        payment = _payment(self.tenant, self.installments[0], "10.00", date(2025, 2, 1))
+
+        first = post_payments(self.tenant.id, [payment.id])
+        second = post_payments(self.tenant.id, [payment.id, payment.id])
+
+        self.assertEqual(first.posted, [payment.id])
+        self.assertEqual(second.posted, [])
+        self.assertEqual(second.already_posted, [payment.id])
+        self.assertEqual(self._reload(self.installments[0]).amount_paid, Decimal("10.00"))
+
+    def test_ignores_unknown_unlinked_and_expense_transactions(self) -> None:
+        expense = _payment(
+            self.tenant,
+            self.installments[0],
+            "10.00",
+            date(2025, 2, 1),
+            type=FinancialTransaction.TransactionType.EXPENSE,
+        )
+        unlinked = _payment(self.tenant, self.installments[0], "10.00", date(2025, 2, 1), installment=None)
+        missing = uuid.uuid4()
+
+        result = post_payments(self.tenant.id, [expense.id, unlinked.id, missing])
+
+        self.assertEqual(sorted(result.ignored), sorted([expense.id, unlinked.id, missing]))
+        self.assertEqual(self._reload(self.installments[0]).amount_paid, Decimal("0.00"))
+
+    def test_rejects_non_positive_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            PaymentPostingService(chunk_size=0)
+
+
+class PaymentPostingConcurrencyTest(TransactionTestCase):
+    databases = {"default"}
+
+    def test_locked_installments_are_deferred_without_waiting(self) -> None:
+        tenant = create_tenant("tenant-baixa-concorrente")
+        customer, consultant = create_borrower(tenant)
+        loan = create_loan(tenant, customer, consultant, installments=2)
+        with use_tenant(tenant.id):
+            locked, free = list(Installment.objects.filter(loan=loan).order_by("installment_number"))
+        blocked = _payment(tenant, locked, "10.00", date(2025, 2, 1))
+        applied = _payment(tenant, free, "10.00", date(2025, 2, 1))
+
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_lock() -> None:
+            try:
+                with use_tenant(tenant.id), transaction.atomic():
+                    Installment.objects.select_for_update().get(id=locked.id)
+                    holding.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=hold_lock)
+        worker.start()
+        self.assertTrue(holding.wait(timeout=10))
+        try:
+            result = post_payments(tenant.id, [blocked.id, applied.id])
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual(result.posted, [applied.id])
+        self.assertEqual(result.deferred, [blocked.id])
+
+        retry = post_payments(tenant.id, result.deferred)
+        self.assertEqual(retry.posted, [blocked.id])
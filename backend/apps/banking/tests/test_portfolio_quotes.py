@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from backend.apps.banking.services.financial_calculations import (
+    LoanInput,
+    calculate_iof,
+    generate_installments,
+)
+from backend.apps.banking.services import portfolio_quotes
+from backend.apps.banking.services.portfolio_quotes import quote_portfolio
+
+
+def _loan(principal: str, annual_rate: str, installments: int, first: date) -> LoanInput:
+    return LoanInput(
+        principal_amount=Decimal(principal),
+        annual_rate_pct=Decimal(annual_rate),
+        number_of_installments=installments,
+        contract_date=date(2025, 1, 1),
+        first_installment_date=first,
+    )
+
+
+class QuotePortfolioParityTest(SimpleTestCase):
+    def assert_parity(self, requests: list[LoanInput]) -> None:
+        quote = quote_portfolio(requests)
+        self.assertEqual(len(quote), len(requests))
+        for index, request in enumerate(requests):
+            scalar = generate_installments(request)
+            self.assertEqual(quote.iof(index), calculate_iof(request), request)
+            self.assertEqual(quote.installments(index), scalar, request)
+
+    def test_matches_scalar_functions_on_grid(self) -> None:
+        requests = [
+            _loan(principal, rate, installments, date(2025, 2, 10))
+            for principal in ("0.01", "999.99", "10000.00", "250000.55")
+            for rate in ("0", "0.01", "10.00", "12.50", "18.00", "35.99")
+            for installments in (1, 2, 12, 60, 420)
+        ]
+        self.assert_parity(requests)
+
+    def test_matches_scalar_functions_on_random_portfolio(self) -> None:
+        rng = random.Random(20250101)
+        requests = [
+            _loan(
+                f"{rng.randint(100, 5_000_000) / 100:.2f}",
+                f"{rng.randint(0, 6000) / 100:.2f}",
+                rng.randint(1, 420),
+                date(rng.randint(2024, 2027), rng.randint(1, 12), rng.randint(1, 28)),
+            )
+            for _ in range(300)
+        ]
+        self.assert_parity(requests)
+
+    def test_month_end_due_dates_are_clamped_like_scalar(self) -> None:
+        requests = [
+            _loan("5000.00", "12.00", 14, date(2024, 1, 31)),
+            _loan("5000.00", "12.00", 14, date(2024, 2, 29)),
+            _loan("5000.00", "12.00", 14, date(2025, 8, 30)),
+        ]
+        self.assert_parity(requests)
+
+        quote = quote_portfolio(requests)
+        self.assertEqual(quote.due_dates(0)[1], date(2024, 2, 29))
+        self.assertEqual(quote.due_dates(0)[13], date(2025, 2, 28))
+
+    def test_columns_use_compact_offsets(self) -> None:
+        quote = quote_portfolio(
+            iter([_loan("1000.00", "10.00", 3, date(2025, 2, 1)), _loan("2000.00", "10.00", 2, date(2025, 3, 1))]),
+        )
+
+        self.assertEqual(list(quote.schedule_offsets), [0, 3, 5])
+        self.assertEqual(list(quote.installment_counts), [3, 2])
+        self.assertEqual(list(quote.principal_cents), [100000, 200000])
+        self.assertEqual(list(quote.monthly_rate_bp), [83, 83])
+        self.assertEqual(quote.payment(1), generate_installments(_loan("2000.00", "10.00", 2, date(2025, 3, 1)))[0].amount)
+
+    def test_exact_ties_defer_to_scalar_rounding(self) -> None:
+        request = _loan("1000.00", "10.00", 12, date(2025, 2, 1))
+        with patch.object(portfolio_quotes, "_payment_cents", return_value=(1, True)):
+            quote = quote_portfolio([request])
+
+        self.assertEqual(quote.payment(0), generate_installments(request)[0].amount)
+
+    def test_rejects_invalid_inputs(self) -> None:
+        with self.assertRaises(ValueError):
+            quote_portfolio([_loan("1000.00", "10.00", 0, date(2025, 2, 1))])
+        with self.assertRaises(ValueError):
+            quote_portfolio([_loan("1000.005", "10.00", 12, date(2025, 2, 1))])
+
+    def test_empty_portfolio(self) -> None:
+        quote = quote_portfolio([])
+        self.assertEqual(len(quote), 0)
+        self.assertEqual(list(quote.schedule_offsets), [0])
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import csv
+import json
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from backend.apps.banking.models import BankAccount, FinancialTransaction, Installment
+from backend.apps.banking.services.reconciliation import (
+    OpenInstallment,
+    ReconciliationService,
+    StatementRow,
+    match_rows,
+)
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+CUSTOMER = uuid.uuid4()
+OTHER_CUSTOMER = uuid.uuid4()
+
+
+def _row(cents: int, day: date, customer: uuid.UUID = CUSTOMER) -> StatementRow:
+    return StatementRow(uuid.uuid4(), (cents, customer), day)
+
+
+def _installment(cents: int, day: date, customer: uuid.UUID = CUSTOMER) -> OpenInstallment:
+    return OpenInstallment(uuid.uuid4(), (cents, customer), day)
+
+
+class MatchRowsTest(SimpleTestCase):
+    def test_matches_by_amount_customer_and_date_window(self) -> None:
+        target = _installment(10000, date(2025, 3, 10))
+        inside = _row(10000, date(2025, 3, 14))
+        late = _row(10000, date(2025, 3, 16))
+        other_customer = _row(10000, date(2025, 3, 10), OTHER_CUSTOMER)
+        other_amount = _row(10001, date(2025, 3, 10))
+
+        report = match_rows([inside, late, other_customer, other_amount], [target], window_days=5)
+
+        self.assertEqual(report.matched, [(inside.id, target.id)])
+        self.assertEqual(report.unmatched, [late.id, other_customer.id, other_amount.id])
+
+    def test_reports_ambiguous_candidates_and_disputed_installments(self) -> None:
+        first = _installment(5000, date(2025, 3, 10))
+        second = _installment(5000, date(2025, 3, 12))
+        lone = _installment(7000, date(2025, 4, 10))
+        both = _row(5000, date(2025, 3, 11))
+        rival_a = _row(7000, date(2025, 4, 9))
+        rival_b = _row(7000, date(2025, 4, 11))
+
+        report = match_rows([both, rival_a, rival_b], [first, second, lone])
+
+        self.assertEqual(report.matched, [])
+        reasons = {item.transaction_id: item for item in report.ambiguous}
+        self.assertEqual(set(reasons[both.id].candidate_installment_ids), {first.id, second.id})
+        self.assertEqual(reasons[rival_a.id].candidate_installment_ids, (lone.id,))
+        self.assertIn(rival_b.id, reasons)
+
+    def test_scales_linearly_with_statement_size(self) -> None:
+        start = date(2025, 1, 1)
+        installments = [_installment(1000 + index, start + timedelta(days=index % 300)) for index in range(50_000)]
+        rows = [_row(1000 + index, start + timedelta(days=index % 300 + 1)) for index in range(50_000)]
+
+        started = time.perf_counter()
+        report = match_rows(rows, installments)
+
+        self.assertEqual(len(report.matched), 50_000)
+        self.assertLess(time.perf_counter() - started, 5.0)
+
+
+class ReconciliationServiceTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-conciliacao")
+        customer, consultant = create_borrower(self.tenant)
+        loan = create_loan(self.tenant, customer, consultant, installments=3)
+        with use_tenant(self.tenant.id):
+            self.installments = list(Installment.objects.filter(loan=loan).order_by("installment_number"))
+            self.account = BankAccount.objects.create(
+                customer=customer,
+                name="Conta",
+                agency="0001",
+                account_number="55555",
+                type=BankAccount.AccountType.CHECKING,
+            )
+
+    def _statement(self, amount: Decimal, day: date) -> FinancialTransaction:
+        with use_tenant(self.tenant.id):
+            return FinancialTransaction.objects.create(
+                description="Extrato",
+                amount=amount,
+                transaction_date=day,
+                is_paid=True,
+                payment_date=day,
+                type=FinancialTransaction.TransactionType.INCOME,
+                bank_account=self.account,
+            )
+
+    def _installment_of(self, tx: FinancialTransaction):
+        with use_tenant(self.tenant.id):
+            return FinancialTransaction.objects.get(id=tx.id).installment_id
+
+    def test_links_unique_matches_and_reports_the_rest(self) -> None:
+        first, second, _ = self.installments
+        exact = self._statement(first.amount_due, first.due_date + timedelta(days=2))
+        twin_a = self._statement(second.amount_due, second.due_date)
+        twin_b = self._statement(second.amount_due, second.due_date - timedelta(days=1))
+        stray = self._statement(Decimal("1.23"), first.due_date)
+
+        preview = ReconciliationService().reconcile(self.tenant.id, dry_run=True)
+        self.assertEqual(preview.matched, [(exact.id, first.id)])
+        self.assertIsNone(self._installment_of(exact))
+
+        report = ReconciliationService().reconcile(self.tenant.id)
+
+        self.assertEqual(report.as_dict(), {"matched": 1, "ambiguous": 2, "unmatched": 1, "skipped": 0})
+        self.assertEqual(self._installment_of(exact), first.id)
+        self.assertIsNone(self._installment_of(twin_a))
+        self.assertIsNone(self._installment_of(twin_b))
+        self.assertEqual(report.unmatched, [stray.id])
+
+        again = ReconciliationService().reconcile(self.tenant.id)
+        self.assertEqual(again.as_dict()["matched"], 0)
+
+    def test_command_writes_csv_report(self) -> None:
+        self._statement(self.installments[0].amount_due, self.installments[0].due_date)
+        self._statement(Decimal("9.99"), self.installments[0].due_date)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "conciliacao.csv"
+            stdout = StringIO()
+            call_command("reconcile_transactions", tenant=self.tenant.slug, report=str(path), stdout=stdout)
+            with path.open(encoding="utf-8") as handle:
+                statuses = [row["status"] for row in csv.DictReader(handle)]
+
+        self.assertEqual(json.loads(stdout.getvalue())["matched"], 1)
+        self.assertEqual(statuses, ["matched", "unmatched"])
+
+    def test_rejects_invalid_window(self) -> None:
+        with self.assertRaises(ValueError):
+            ReconciliationService(window_days=0)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from backend.apps.banking.services.financial_calculations import (
+    LoanInput,
+    calculate_cet,
+    generate_installments,
+)
+from backend.apps.banking.services.schedule_cache import AmortizationScheduleCache, get_schedule_cache
+from backend.apps.banking.tests.factories import FactoryContext, InstallmentFactory, LoanFactory
+
+
+def _loan(principal: str = "10000.00") -> LoanInput:
+    return LoanInput(
+        principal_amount=Decimal(principal),
+        annual_rate_pct=Decimal("12.50"),
+        number_of_installments=12,
+        contract_date=date(2025, 1, 10),
+        first_installment_date=date(2025, 2, 10),
+    )
+
+
+class AmortizationScheduleCacheTest(SimpleTestCase):
+    def test_evicts_least_recently_used_entry(self) -> None:
+        cache = AmortizationScheduleCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (3, 1, 1, 2))
+        self.assertAlmostEqual(stats.hit_ratio, 0.75)
+
+    def test_get_or_compute_counts_hits_and_misses(self) -> None:
+        cache = AmortizationScheduleCache(maxsize=4)
+        calls: list[int] = []
+
+        def compute() -> int:
+            calls.append(1)
+            return 42
+
+        self.assertEqual(cache.get_or_compute("k", compute), 42)
+        self.assertEqual(cache.get_or_compute("k", compute), 42)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.stats().hits, cache.stats().misses), (1, 1))
+
+    def test_resize_and_disabled_cache(self) -> None:
+        cache = AmortizationScheduleCache(maxsize=3)
+        for key in "abc":
+            cache.put(key, key)
+        cache.resize(1)
+        self.assertEqual(cache.stats().size, 1)
+        self.assertEqual(cache.get("c"), "c")
+
+        disabled = AmortizationScheduleCache(maxsize=0)
+        disabled.put("a", 1)
+        self.assertEqual(disabled.stats().size, 0)
+
+        with self.assertRaises(ValueError):
+            AmortizationScheduleCache(maxsize=-1)
+        with self.assertRaises(ValueError):
+            cache.resize(-1)
+
+
+class ScheduleCacheIntegrationTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cache = get_schedule_cache()
+        self.cache.clear()
+
+    def tearDown(self) -> None:
+        self.cache.clear()
+
+    def test_equivalent_inputs_share_entry(self) -> None:
+        first = generate_installments(_loan("10000"))
+        second = generate_installments(_loan("10000.00"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats().misses, 1)
+        self.assertEqual(self.cache.stats().hits, 1)
+
+    def test_callers_receive_independent_lists(self) -> None:
+        installments = generate_installments(_loan())
+        installments.clear()
+        breakdown = calculate_cet(_loan())
+        breakdown.installments.pop()
+
+        self.assertEqual(len(generate_installments(_loan())), 12)
+        self.assertEqual(len(calculate_cet(_loan()).installments), 12)
+
+    def test_seeding_loan_with_installments_computes_schedule_once(self) -> None:
+        context = FactoryContext.default()
+        loan = LoanFactory.build(factory_context=context)
+        for number in range(1, loan.number_of_installments + 1):
+            InstallmentFactory.build(factory_context=context, loan=loan, installment_number=number)
+
+        stats = self.cache.stats()
+        # 1 cotação nominal (Loan) + 1 CET real + 1 cronograma lido pelas parcelas.
+        self.assertLessEqual(stats.misses, 3)
+        self.assertGreaterEqual(stats.hits, loan.number_of_installments * 2)
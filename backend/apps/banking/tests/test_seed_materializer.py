@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.apps.banking.models import (
+    BankAccountDailyBalance,
+    Consultant,
+    Contract,
+    CreditLimit,
+    Customer,
+    FinancialTransaction,
+    Installment,
+    Loan,
+)
+from backend.apps.banking.services.seed_context import SEED_SHARD_SIZE
+from backend.apps.banking.services.seed_materializer import (
+    SeedMaterializationError,
+    SeedMaterializer,
+    context_for_seed_run,
+    reset_seed_batches,
+)
+from backend.apps.banking.tests.db_fixtures import create_tenant
+from backend.apps.tenancy import tasks as seed_tasks
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import SeedBatch, SeedCheckpoint, SeedDataset, SeedRun
+from backend.apps.tenancy.services.seed_runs import SeedRunService
+from backend.apps.tenancy.tests.seed_profile_test_utils import build_manifest
+
+CAPS = {
+    "tenant_users": 2,
+    "customers": 6,
+    "addresses": 9,
+    "consultants": 2,
+    "bank_accounts": 6,
+    "account_categories": 3,
+    "suppliers": 3,
+    "loans": 4,
+    "installments": 20,
+    "financial_transactions": 25,
+    "limits": 10,
+    "contracts": 5,
+}
+
+
+class SeedMaterializerTest(TestCase):
+    def setUp(self) -> None:
+        self.tenant = create_tenant("seed-materializer")
+
+    def _create_run(self, *, dry_run: bool = False, caps: dict[str, int] | None = None, mode: str = "baseline"):
+        manifest = build_manifest(
+            tenant_slug=self.tenant.slug,
+            environment="staging",
+            overrides={"volumetry": {entity: {"cap": cap} for entity, cap in (caps or CAPS).items()}},
+        )
+        return SeedRunService().create_seed_run(
+            tenant_id=self.tenant.id,
+            environment="staging",
+            manifest=manifest,
+            manifest_path="configs/seed_profiles/staging/seed-materializer.yaml",
+            idempotency_key=f"seed-materializer-{dry_run}-{mode}",
+            requested_by="svc-seeds",
+            dry_run=dry_run,
+            mode=mode,
+        )
+
+    def _batch(self, seed_run: SeedRun, entity: str) -> SeedBatch:
+        return SeedBatch.objects.unscoped().select_related("seed_run__seed_profile").get(seed_run=seed_run, entity=entity)
+
+    def test_dispatch_fills_every_entity_up_to_cap_and_records_throughput(self) -> None:
+        creation = self._create_run()
+        for batch in creation.batches:
+            result = seed_tasks.dispatch_baseline.__wrapped__.__func__(
+                None,
+                str(batch.seed_run_id),
+                str(batch.tenant_id),
+                str(batch.id),
+            )
+            self.assertEqual(result["status"], "completed")
+
+        with use_tenant(self.tenant.id):
+            self.assertEqual(Customer.objects.count(), CAPS["customers"])
+            self.assertEqual(Loan.objects.count(), CAPS["loans"])
+            self.assertEqual(Installment.objects.count(), CAPS["installments"])
+            self.assertEqual(FinancialTransaction.objects.count(), CAPS["financial_transactions"])
+            self.assertEqual(Contract.objects.count(), CAPS["contracts"])
+            self.assertEqual(Consultant.objects.count(), CAPS["consultants"])
+            # Um limite por conta: o cap acima do número de contas é cortado.
+            self.assertEqual(CreditLimit.objects.count(), CAPS["bank_accounts"])
+            self.assertTrue(BankAccountDailyBalance.objects.exists())
+            loan = Loan.objects.order_by("id").first()
+            self.assertEqual(loan.installments.count(), loan.number_of_installments)
+
+            datasets = {dataset.entity: dataset for dataset in SeedDataset.objects.filter(seed_run=creation.seed_run)}
+        self.assertEqual(set(datasets), set(CAPS))
+        transactions = datasets["financial_transactions"]
+        self.assertEqual(transactions.volumetria_real, CAPS["financial_transactions"])
+        self.assertGreater(transactions.throughput_rows_per_second, Decimal("0"))
+        self.assertEqual(datasets["limits"].volumetria_real, CAPS["bank_accounts"])
+        self.assertEqual(datasets["limits"].drift_percentual, Decimal("40.00"))
+
+        creation.seed_run.refresh_from_db()
+        self.assertEqual(creation.seed_run.status, SeedRun.Status.SUCCEEDED)
+        self.assertIsNotNone(creation.seed_run.finished_at)
+
+    def test_rows_are_deterministic_and_written_in_chunks(self) -> None:
+        seed_run = self._create_run().seed_run
+        materializer = SeedMaterializer(chunk_size=4)
+
+        result = materializer.materialize_batch(self._batch(seed_run, "customers"))
+
+        self.assertEqual((result.rows, result.chunks), (CAPS["customers"], 2))
+        context = context_for_seed_run(seed_run)
+        with use_tenant(self.tenant.id):
+            documents = set(Customer.objects.values_list("document_number", flat=True))
+        stream = context.stream("customers", 0)
+        stream.digits(SEED_SHARD_SIZE, 4)  # coluna de nascimento sai antes do documento
+        expected = stream.digits(SEED_SHARD_SIZE, 11)[: CAPS["customers"]]
+        self.assertEqual(documents, {context.mask(document) for document in expected})
+        self.assertEqual(
+            self._batch(seed_run, "customers").status,
+            SeedBatch.Status.COMPLETED,
+        )
+
+    def test_dry_run_and_missing_parents(self) -> None:
+        dry = self._create_run(dry_run=True).seed_run
+        result = SeedMaterializer().materialize_batch(self._batch(dry, "customers"))
+        self.assertTrue(result.skipped)
+        self.assertEqual(Customer.objects.scoped(self.tenant.id).count(), 0)
+
+        seed_run = self._create_run(caps={"customers": 2, "consultants": 1, "loans": 1}).seed_run
+        with self.assertRaises(SeedMaterializationError):
+            SeedMaterializer().materialize_batch(self._batch(seed_run, "consultants"))
+        self.assertEqual(self._batch(seed_run, "consultants").status, SeedBatch.Status.FAILED)
+        self.assertFalse(get_user_model().objects.filter(username__startswith="seed-").exists())
+
+    def test_failed_batch_resumes_from_last_sealed_chunk(self) -> None:
+        seed_run = self._create_run().seed_run
+        batch = self._batch(seed_run, "customers")
+        limiter = "backend.apps.banking.services.seed_materializer.SeedRateLimiter.acquire"
+        with patch(limiter, side_effect=[0.0, 0.0, RuntimeError("conexão perdida")]):
+            with self.assertRaises(RuntimeError):
+                SeedMaterializer(chunk_size=2).materialize_batch(batch)
+
+        with use_tenant(self.tenant.id):
+            self.assertEqual(Customer.objects.count(), 4)
+            checkpoints = list(
+                SeedCheckpoint.objects.filter(seed_run=seed_run, entity="customers").order_by("percentual_concluido"),
+            )
+        self.assertEqual([checkpoint.percentual_concluido for checkpoint in checkpoints], [Decimal("33.33"), Decimal("66.66")])
+        self.assertTrue(all(checkpoint.sealed for checkpoint in checkpoints))
+        self.assertEqual(self._batch(seed_run, "customers").status, SeedBatch.Status.FAILED)
+
+        result = seed_tasks.retry_seed_batch.__wrapped__.__func__(None, str(batch.id), 500)
+
+        self.assertFalse(result["to_dlq"])
+        self.assertEqual(result["resume_token"], bytes(checkpoints[-1].resume_token).decode())
+        # Antes do backoff o scheduler não libera o batch; vencido, ele retoma do checkpoint.
+        self.assertEqual(self._batch(seed_run, "customers").status, SeedBatch.Status.PENDING)
+        with use_tenant(self.tenant.id):
+            SeedBatch.objects.filter(id=batch.id).update(next_retry_at=timezone.now() - timedelta(seconds=1))
+        seed_tasks.advance_seed_run.apply(args=[str(seed_run.id)]).get()
+        with use_tenant(self.tenant.id):
+            self.assertEqual(Customer.objects.count(), CAPS["customers"])
+            dataset = SeedDataset.objects.get(seed_run=seed_run, entity="customers")
+        self.assertEqual(dataset.volumetria_real, CAPS["customers"])
+        self.assertEqual(dataset.drift_percentual, Decimal("0.00"))
+        self.assertEqual(self._batch(seed_run, "customers").status, SeedBatch.Status.COMPLETED)
+
+    def test_resume_rejects_foreign_checkpoint_and_dr_respects_rpo(self) -> None:
+        seed_run = self._create_run().seed_run
+        with use_tenant(self.tenant.id):
+            SeedCheckpoint.objects.create(
+                tenant=self.tenant,
+                seed_run=seed_run,
+                entity="suppliers",
+                hash_estado="0" * 64,
+                resume_token=b'{"next_index": 2}',
+                percentual_concluido=Decimal("66.66"),
+                sealed=True,
+            )
+        with self.assertRaises(SeedMaterializationError):
+            SeedMaterializer().materialize_batch(self._batch(seed_run, "suppliers"))
+
+        dr_run = self._create_run(mode="dr").seed_run
+        batch = self._batch(dr_run, "customers")
+        with patch("backend.apps.banking.services.seed_materializer.SeedRateLimiter.acquire", side_effect=[0.0, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                SeedMaterializer(chunk_size=2).materialize_batch(batch)
+        with use_tenant(self.tenant.id):
+            SeedCheckpoint.objects.filter(seed_run=dr_run).update(updated_at=timezone.now() - timedelta(minutes=30))
+
+        result = seed_tasks.retry_seed_batch.__wrapped__.__func__(None, str(batch.id), 500)
+
+        self.assertEqual(result["status"], "blocked")
+        self.assertEqual(result["problem"]["title"], "rpo_rto_violation")
+        dr_run.refresh_from_db()
+        self.assertEqual(dr_run.status, SeedRun.Status.BLOCKED)
+        with use_tenant(self.tenant.id):
+            self.assertEqual(Customer.objects.count(), 2)
+
+    def test_reset_clears_partial_batch_so_it_restarts_from_zero(self) -> None:
+        seed_run = self._create_run().seed_run
+        with patch("backend.apps.banking.services.seed_materializer.SeedRateLimiter.acquire", side_effect=[0.0, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                SeedMaterializer(chunk_size=4).materialize_batch(self._batch(seed_run, "customers"))
+
+        out = StringIO()
+        call_command("reset_seed_batches", seed_run_id=str(seed_run.id), entity=["customers"], stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())["deleted"]["customers"], 4)
+        with use_tenant(self.tenant.id):
+            self.assertFalse(Customer.objects.exists())
+            self.assertFalse(SeedCheckpoint.objects.filter(seed_run=seed_run, entity="customers").exists())
+        self.assertEqual(self._batch(seed_run, "customers").status, SeedBatch.Status.PENDING)
+
+        result = SeedMaterializer(chunk_size=4).materialize_batch(self._batch(seed_run, "customers"))
+        self.assertEqual((result.resumed_from, result.rows), (0, CAPS["customers"]))
+
+    def test_reset_lets_the_same_manifest_run_again(self) -> None:
+        seed_run = self._create_run().seed_run
+        for entity in ("tenant_users", "customers", "consultants", "loans", "installments"):
+            SeedMaterializer().materialize_batch(self._batch(seed_run, entity))
+        with use_tenant(self.tenant.id):
+            self.assertTrue(Installment.objects.exists())
+
+        deleted = reset_seed_batches(seed_run)
+
+        # Filhas saem antes das mães, e as entidades não gravadas não apagam nada.
+        order = list(deleted)
+        self.assertLess(order.index("installments"), order.index("loans"))
+        self.assertLess(order.index("loans"), order.index("customers"))
+        self.assertLess(order.index("consultants"), order.index("tenant_users"))
+        self.assertEqual(deleted["customers"], CAPS["customers"])
+        self.assertEqual(deleted["financial_transactions"], 0)
+        self.assertFalse(get_user_model().objects.filter(username__startswith="seed-").exists())
+        with use_tenant(self.tenant.id):
+            self.assertFalse(Customer.objects.exists())
+            self.assertFalse(Installment.objects.exists())
+            self.assertFalse(SeedCheckpoint.objects.filter(seed_run=seed_run).exists())
+        for entity in ("tenant_users", "customers", "consultants", "loans", "installments"):
+            result = SeedMaterializer().materialize_batch(self._batch(seed_run, entity))
+            self.assertEqual(result.resumed_from, 0)
+        with use_tenant(self.tenant.id):
+            self.assertEqual(Installment.objects.count(), CAPS["installments"])
+
+    def test_reset_refuses_batches_in_processing(self) -> None:
+        seed_run = self._create_run().seed_run
+        with use_tenant(self.tenant.id):
+            SeedBatch.objects.filter(seed_run=seed_run, entity="loans").update(status=SeedBatch.Status.PROCESSING)
+
+        with self.assertRaises(SeedMaterializationError):
+            reset_seed_batches(seed_run, ["customers"])
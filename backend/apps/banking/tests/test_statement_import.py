@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from backend.apps.banking.models import BankAccount, FinancialTransaction
+from backend.apps.banking.services.account_balances import balance_at
+from backend.apps.banking.services.statement_import import (
+    StatementImporter,
+    StatementImportError,
+    StatementRecord,
+    iter_csv_records,
+    iter_ofx_records,
+    validate_record,
+)
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+CSV_STATEMENT = (
+    "date,description,amount\n"
+    "2025-03-01,Depósito,1500.00\n"
+    "02/03/2025,Tarifa,-12.50\n"
+    "2025-03-03,Valor inválido,abc\n"
+    "\n"
+    "2025-03-04,PIX recebido,\"250,75\"\n"
+)
+OFX_STATEMENT = """OFXHEADER:100
+<OFX>
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250310120000[-3:BRT]
+<TRNAMT>300.00
+<FITID>1
+<NAME>TED recebida
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250311
+<TRNAMT>-45.90
+<MEMO>Conta de luz
+</STMTTRN>
+</BANKTRANLIST>
+</OFX>
+"""
+
+
+def _record(**values: str) -> StatementRecord:
+    return StatementRecord(0, {"date": "2025-03-01", "description": "Linha", "amount": "10.00", **values})
+
+
+class StatementParsingTest(SimpleTestCase):
+    def test_csv_records_carry_resumable_offsets(self) -> None:
+        records = list(iter_csv_records(io.BytesIO(CSV_STATEMENT.encode())))
+
+        self.assertEqual([record.values["description"] for record in records], ["Depósito", "Tarifa", "Valor inválido", "PIX recebido"])
+        self.assertEqual(records[-1].end_offset, len(CSV_STATEMENT.encode()))
+
+        resumed = list(iter_csv_records(io.BytesIO(CSV_STATEMENT.encode()), records[1].end_offset))
+        self.assertEqual([record.values["description"] for record in resumed], ["Valor inválido", "PIX recebido"])
+
+    def test_ofx_transactions_become_records(self) -> None:
+        records = list(iter_ofx_records(io.BytesIO(OFX_STATEMENT.encode())))
+
+        entries = [validate_record(record) for record in records]
+        self.assertEqual([entry.transaction_date for entry in entries], [date(2025, 3, 10), date(2025, 3, 11)])
+        self.assertEqual([entry.signed_amount for entry in entries], [Decimal("300.00"), Decimal("-45.90")])
+        self.assertEqual(entries[1].description, "Conta de luz")
+
+    def test_validation_mirrors_model_constraints(self) -> None:
+        self.assertEqual(validate_record(_record(amount="-1.5")).type, FinancialTransaction.TransactionType.EXPENSE)
+        for values in (
+            {"amount": "0"},
+            {"amount": "1.005"},
+            {"amount": "10000000000.00"},
+            {"description": " "},
+            {"description": "x" * 256},
+            {"date": "2025-13-01"},
+        ):
+            with self.subTest(values=values), self.assertRaises(ValueError):
+                validate_record(_record(**values))
+
+    def test_parsing_memory_does_not_grow_with_file_size(self) -> None:
+        lines = "".join(f"2025-03-01,Linha {index},{index}.00\n" for index in range(1, 10_001))
+        handle = io.BytesIO(("date,description,amount\n" + lines).encode())
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            consumed = sum(1 for record in iter_csv_records(handle) if validate_record(record))
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(consumed, 10_000)
+        self.assertLess(peak, len(lines) // 4)
+
+
+class StatementImporterTest(TestCase):
+    databases = {"default"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tenant = create_tenant("tenant-extrato")
+        customer, _ = create_borrower(self.tenant)
+        with use_tenant(self.tenant.id):
+            self.account = BankAccount.objects.create(
+                customer=customer,
+                name="Conta",
+                agency="0001",
+                account_number="77777",
+                initial_balance=Decimal("100.00"),
+                type=BankAccount.AccountType.CHECKING,
+            )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _file(self, name: str, content: str) -> Path:
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def _descriptions(self) -> list[str]:
+        with use_tenant(self.tenant.id):
+            return list(FinancialTransaction.objects.order_by("transaction_date").values_list("description", flat=True))
+
+    def test_copy_and_bulk_create_write_paid_rows_and_balances(self) -> None:
+        for method in ("copy", "bulk_create"):
+            with self.subTest(method=method):
+                with use_tenant(self.tenant.id):
+                    FinancialTransaction.objects.all().delete()
+                result = StatementImporter(chunk_size=2, method=method).import_file(
+                    self.tenant.id,
+                    self.account.id,
+                    self._file("extrato.csv", CSV_STATEMENT),
+                )
+
+                self.assertEqual((result.rows_imported, result.rows_rejected, result.chunks), (3, 1, 2))
+                self.assertEqual(result.next_offset, len(CSV_STATEMENT.encode()))
+                self.assertIn("valor inválido", result.errors[0])
+                self.assertEqual(self._descriptions(), ["Depósito", "Tarifa", "PIX recebido"])
+                with use_tenant(self.tenant.id):
+                    self.assertFalse(FinancialTransaction.objects.filter(is_paid=False).exists())
+                self.assertEqual(balance_at(self.tenant.id, self.account.id, date(2025, 3, 31)), Decimal("1838.25"))
+
+    def test_failure_reports_last_committed_offset_for_resume(self) -> None:
+        path = self._file("extrato.ofx", OFX_STATEMENT)
+        importer = StatementImporter(chunk_size=1)
+        original = importer._write
+        calls = []
+
+        def flaky(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("conexão perdida")
+            return original(*args, **kwargs)
+
+        with mock.patch.object(importer, "_write", side_effect=flaky):
+            with self.assertRaises(StatementImportError) as raised:
+                importer.import_file(self.tenant.id, self.account.id, path)
+        self.assertEqual(self._descriptions(), ["TED recebida"])
+
+        resumed = importer.import_file(self.tenant.id, self.account.id, path, start_offset=raised.exception.offset)
+
+        self.assertEqual(resumed.rows_imported, 1)
+        self.assertEqual(self._descriptions(), ["TED recebida", "Conta de luz"])
+        self.assertEqual(balance_at(self.tenant.id, self.account.id, date(2025, 3, 31)), Decimal("354.10"))
+
+    def test_command_imports_and_rejects_unknown_account(self) -> None:
+        path = self._file("extrato.csv", CSV_STATEMENT)
+        stdout = StringIO()
+        call_command("import_statement", str(path), tenant=self.tenant.slug, account=str(self.account.id), stdout=stdout)
+        self.assertEqual(json.loads(stdout.getvalue())["rows_imported"], 3)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "import_statement",
+                str(path),
+                tenant=self.tenant.slug,
+                account="00000000-0000-0000-0000-000000000000",
+                stdout=StringIO(),
+            )
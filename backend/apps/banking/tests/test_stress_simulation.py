@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from backend.apps.banking.models import Installment
+from backend.apps.banking.services import stress_simulation
+from backend.apps.banking.services.stress_simulation import (
+    LoanBook,
+    StressScenario,
+    StressSimulator,
+    load_loan_book,
+    simulate_tenant_stress,
+)
+from backend.apps.banking.tests.db_fixtures import create_borrower, create_loan, create_tenant
+from backend.apps.tenancy.managers import use_tenant
+
+BOOK = LoanBook.from_flows(
+    date(2025, 1, 1),
+    [
+        [(0, 100.0), (1, 100.0), (2, 100.0)],
+        [(3, 250.0), (1, 50.0)],
+    ],
+)
+
+
+class StressSimulatorTest(SimpleTestCase):
+    def test_columnar_book_keeps_remaining_balance_per_flow(self) -> None:
+        self.assertEqual(BOOK.loans, 2)
+        self.assertEqual(list(BOOK.starts), [0, 3, 5])
+        self.assertEqual(list(BOOK.flow_month), [0, 1, 2, 1, 3])
+        self.assertEqual(list(BOOK.remaining), [300.0, 200.0, 100.0, 300.0, 250.0])
+        self.assertEqual(BOOK.exposure, 600.0)
+
+    def test_degenerate_scenarios_have_closed_form_results(self) -> None:
+        simulator = StressSimulator(chunk_paths=7)
+
+        calm = simulator.simulate(BOOK, StressScenario(0.0, 0.0, 0.6), paths=20)
+        self.assertEqual((calm.expected_loss, calm.cash_flow_quantiles["p50"]), (0.0, 600.0))
+
+        crash = simulator.simulate(BOOK, StressScenario(1.0, 0.0, 0.6), paths=20)
+        self.assertAlmostEqual(crash.expected_loss, 360.0)
+        self.assertAlmostEqual(crash.cash_flow_quantiles["p95"], 240.0)
+
+        prepaid = simulator.simulate(BOOK, StressScenario(0.0, 1.0, 0.6), paths=20)
+        self.assertEqual((prepaid.expected_loss, prepaid.cash_flow_quantiles["p5"]), (0.0, 600.0))
+
+    def test_chunks_are_reproducible_across_process_pool(self) -> None:
+        book = LoanBook.synthetic(50, installments=12, seed=3)
+        scenario = StressScenario(0.05, 0.02, 0.5)
+
+        serial = StressSimulator(chunk_paths=40, seed=9).simulate(book, scenario, paths=200)
+        pooled = StressSimulator(chunk_paths=40, workers=2, seed=9).simulate(book, scenario, paths=200)
+
+        self.assertEqual(serial.loss_quantiles, pooled.loss_quantiles)
+        self.assertAlmostEqual(serial.expected_loss, pooled.expected_loss)
+        self.assertLessEqual(serial.loss_quantiles["p50"], serial.loss_quantiles["p99"])
+        self.assertGreater(serial.expected_loss, 0)
+        self.assertLess(serial.expected_loss, book.exposure)
+
+    def test_rejects_invalid_parameters(self) -> None:
+        with self.assertRaises(ValueError):
+            StressScenario(monthly_default_probability=1.5)
+        with self.assertRaises(ValueError):
+            StressSimulator(chunk_paths=0)
+        with self.assertRaises(ValueError):
+            StressSimulator(workers=0)
+        with self.assertRaises(ValueError):
+            StressSimulator().simulate(BOOK, StressScenario(), paths=0)
+
+    def test_chunk_outside_initialized_worker_raises(self) -> None:
+        with self.assertRaises(RuntimeError):
+            stress_simulation._run_chunk((7, 10))
+
+    def test_benchmark_command_reports_paths_per_second(self) -> None:
+        stdout = StringIO()
+        call_command("benchmark_stress_simulation", loans=20, paths=30, workers=[1], stdout=stdout)
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["loans"], 20)
+        self.assertGreater(report["runs"][0]["paths_per_second"], 0)
+
+
+class LoanBookLoaderTest(TestCase):
+    databases = {"default"}
+
+    def test_loads_open_installments_once_per_tenant(self) -> None:
+        tenant = create_tenant("tenant-estresse")
+        customer, consultant = create_borrower(tenant)
+        loan = create_loan(tenant, customer, consultant, installments=4)
+        with use_tenant(tenant.id):
+            Installment.objects.filter(loan=loan, installment_number=1).update(status=Installment.Status.PAID)
+            open_total = sum(
+                Installment.objects.filter(loan=loan, installment_number__gt=1).values_list("amount_due", flat=True),
+                Decimal("0"),
+            )
+
+        book = load_loan_book(tenant.id, date(2025, 2, 15))
+
+        self.assertEqual(book.loans, 1)
+        self.assertEqual(list(book.flow_month), [1, 2, 3])
+        self.assertAlmostEqual(book.exposure, float(open_total))
+        result = simulate_tenant_stress(tenant.id, StressScenario(1.0, 0.0, 1.0), paths=5, as_of=date(2025, 2, 15))
+        self.assertAlmostEqual(result.expected_loss, float(open_total))
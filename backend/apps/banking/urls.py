@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .views import Customer360View, CustomerSearchView
+
+urlpatterns = [
+    path('tenants/<slug:tenant_slug>/customers/search', CustomerSearchView.as_view(), name='banking-customer-search'),
+    path(
+        'tenants/<slug:tenant_slug>/customers/<uuid:customer_id>/360',
+        Customer360View.as_view(),
+        name='banking-customer-360',
+    ),
+]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from django.http import HttpRequest
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from backend.apps.banking.serializers import Customer360Serializer, CustomerSearchHitSerializer
+from backend.apps.banking.services.customer_360 import load_customer_360
+from backend.apps.banking.services.customer_search import DEFAULT_PAGE_SIZE, CustomerSearchError, search_customers
+from backend.apps.foundation.api.views import _respond_not_modified_if_needed
+from backend.apps.tenancy.models import Tenant
+
+
+def _tenant_header_mismatch(request: HttpRequest, tenant_slug: str) -> Response | None:
+    if request.headers.get("X-Tenant-Id") == tenant_slug:
+        return None
+    return Response(
+        {"detail": "Cabeçalho X-Tenant-Id ausente ou diferente do tenant da URL."},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def _page_limit(raw: str | None) -> int:
+    if raw in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise CustomerSearchError("limit deve ser um número inteiro.") from exc
+
+
+class CustomerSearchView(APIView):
+    """
+    ``GET tenants/<slug>/customers/search?name=&document=&status=&cursor=&limit=``
+    """
+
+    def get(self, request: HttpRequest, tenant_slug: str) -> Response:
+        mismatch = _tenant_header_mismatch(request, tenant_slug)
+        if mismatch is not None:
+            return mismatch
+        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        params = request.query_params
+        try:
+            page = search_customers(
+                tenant,
+                name=params.get("name", ""),
+                document=params.get("document", ""),
+                status=params.get("status") or None,
+                cursor=params.get("cursor") or None,
+                limit=_page_limit(params.get("limit")),
+            )
+        except CustomerSearchError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                "results": CustomerSearchHitSerializer(page.results, many=True).data,
+                "next_cursor": page.next_cursor,
+            },
+        )
+
+
+class Customer360View(APIView):
+    """
+    ``GET tenants/<slug>/customers/<id>/360``: visão consolidada do cliente com ETag.
+    """
+
+    def get(self, request: HttpRequest, tenant_slug: str, customer_id: UUID) -> Response:
+        mismatch = _tenant_header_mismatch(request, tenant_slug)
+        if mismatch is not None:
+            return mismatch
+        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        view = load_customer_360(tenant, customer_id, if_none_match=request.headers.get("If-None-Match"))
+        if view is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        if view.not_modified:
+            return _respond_not_modified_if_needed(request, view.etag)
+        response = Response(Customer360Serializer(view).data)
+        response["ETag"] = view.etag
+        return response
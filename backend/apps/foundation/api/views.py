@@ -200,12 +200,18 @@ def _compute_etag_for_payload(payload: dict[str, Any]) -> str:
     return f'"{hashlib.sha256(etag_source).hexdigest()}"'
 
 
-def _respond_not_modified_if_needed(request: HttpRequest, etag_value: str) -> Response | None:
-    if_none_match = request.headers.get('If-None-Match')
+def _etag_matches(if_none_match: str | None, etag_value: str) -> bool:
+    """
+    Comparação fraca do If-None-Match (RFC 9110 §13.1.2): aceita lista, ``*`` e tags ``W/``.
+    """
     if not if_none_match:
-        return None
-    requested = {token.strip() for token in if_none_match.split(',') if token.strip()}
-    if '*' in requested or etag_value in requested:
+        return False
+    requested = {token.strip().removeprefix('W/') for token in if_none_match.split(',') if token.strip()}
+    return '*' in requested or etag_value.removeprefix('W/') in requested
+
+
+def _respond_not_modified_if_needed(request: HttpRequest, etag_value: str) -> Response | None:
+    if _etag_matches(request.headers.get('If-None-Match'), etag_value):
         not_modified = Response(status=status.HTTP_304_NOT_MODIFIED)
         not_modified['ETag'] = etag_value
         return not_modified
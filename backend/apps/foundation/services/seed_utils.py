@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 import hashlib
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+DEFAULT_FPE_BATCH_SIZE = 256
+DEFAULT_FPE_MEMO_SIZE = 65536
 
 
 def derive_factory_seed(tenant_id: str, environment: str, manifest_version: str, salt_version: str) -> int:
@@ -33,29 +39,116 @@ def build_idempotency_fingerprint(
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
+class FPETransport(Protocol):
+    """
+    Backend de FPE injetável: recebe um lote de valores e devolve os mascarados na
+    mesma ordem. Sem transporte o cliente usa o stub determinístico por hash.
+    """
+
+    def encode(self, *, transit_path: str, transformation: str, tweak: str, values: Sequence[str]) -> List[str]: ...
+
+
+MemoKey = Tuple[str, str, str, str]
+
+
+class FPEMaskMemo:
+    """
+    LRU limitado e thread-safe de valores já mascarados, por (transit_path, namespace,
+    salt_version, valor). Pode ser compartilhado entre clientes: a chave inclui o path.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_FPE_MEMO_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize do memo de FPE não pode ser negativo.")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[MemoKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: MemoKey) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: MemoKey, value: str) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def stub_fpe_mask(transit_path: str, salt_namespace: str, salt_version: str, value: str) -> str:
+    """Mascaramento determinístico por hash que preserva o tamanho (ambientes sem Vault)."""
+    payload = f"{transit_path}:{salt_namespace}:{salt_version}:{value}"
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    # Repete o digest para manter o comprimento do campo original.
+    return (digest * ((len(value) // len(digest)) + 1))[: len(value)]
+
+
 @dataclass(slots=True)
 class VaultTransitFPEClient:
     """
     Cliente simplificado para Vault Transit FPE.
 
-    Em ambientes sem Vault, utiliza um mascaramento determinístico baseado em hash
-    apenas para preservar formato/tamanho e permitir TDD das factories.
+    Em ambientes sem Vault (``transport`` ausente), utiliza um mascaramento
+    determinístico baseado em hash apenas para preservar formato/tamanho e permitir TDD
+    das factories. ``mask_many`` consulta o memo LRU e envia só os valores inéditos, em
+    lotes de ``batch_size`` por chamada ao transporte.
     """
 
     transit_path: str
     salt_namespace: str = "seed-data"
     allow_stub_decrypt: bool = False
+    transport: Optional[FPETransport] = None
+    batch_size: int = DEFAULT_FPE_BATCH_SIZE
+    memo: FPEMaskMemo = field(default_factory=FPEMaskMemo, repr=False, compare=False)
 
-    def _hash(self, value: str, salt_version: str) -> str:
-        payload = f"{self.transit_path}:{self.salt_namespace}:{salt_version}:{value}"
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
-
-    def mask(self, value: str, *, salt_version: str) -> str:
+    def mask(self, value: Optional[str], *, salt_version: str) -> Optional[str]:
         if value is None:
             return value
-        digest = self._hash(value, salt_version)
-        # Repete o digest para manter o comprimento do campo original.
-        return (digest * ((len(value) // len(digest)) + 1))[: len(value)]
+        return self.mask_many([value], salt_version=salt_version)[0]
+
+    def mask_many(self, values: Iterable[Optional[str]], *, salt_version: str) -> List[Optional[str]]:
+        items = list(values)
+        masked: Dict[str, str] = {}
+        pending: List[str] = []
+        for value in dict.fromkeys(item for item in items if item is not None):
+            cached = self.memo.get((self.transit_path, self.salt_namespace, salt_version, value))
+            if cached is None:
+                pending.append(value)
+            else:
+                masked[value] = cached
+        for start in range(0, len(pending), max(1, self.batch_size)):
+            chunk = pending[start : start + max(1, self.batch_size)]
+            for value, result in zip(chunk, self._encode(chunk, salt_version)):
+                masked[value] = result
+                self.memo.put((self.transit_path, self.salt_namespace, salt_version, value), result)
+        return [None if item is None else masked[item] for item in items]
+
+    def _encode(self, values: List[str], salt_version: str) -> List[str]:
+        if self.transport is None:
+            return [stub_fpe_mask(self.transit_path, self.salt_namespace, salt_version, value) for value in values]
+        encoded = list(
+            self.transport.encode(
+                transit_path=self.transit_path,
+                transformation=self.salt_namespace,
+                tweak=salt_version,
+                values=values,
+            ),
+        )
+        if len(encoded) != len(values):
+            raise RuntimeError(
+                f"Transporte FPE {type(self.transport).__name__} devolveu {len(encoded)} valores para "
+                f"{len(values)} enviados em {self.transit_path}.",
+            )
+        return encoded
 
     def unmask(self, value: str, *, salt_version: str) -> str:
         if self.allow_stub_decrypt:
@@ -1,12 +1,22 @@
 from django.test import SimpleTestCase
 
 from backend.apps.foundation.services.seed_utils import (
+    FPEMaskMemo,
     VaultTransitFPEClient,
     build_idempotency_fingerprint,
     derive_factory_seed,
 )
 
 
+class _RecordingTransport:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def encode(self, *, transit_path: str, transformation: str, tweak: str, values) -> list[str]:
+        self.calls.append(list(values))
+        return [f"{tweak}:{value}" for value in values]
+
+
 class SeedUtilsTest(SimpleTestCase):
     def test_factory_seed_is_stable(self) -> None:
         seed_a = derive_factory_seed("tenant-a", "staging", "1.0.0", "2025-q1")
@@ -45,3 +55,50 @@ class SeedUtilsTest(SimpleTestCase):
             allow_stub_decrypt=True,
         )
         self.assertEqual("abc", client.unmask("abc", salt_version="2025-q1"))
+
+    def test_mask_many_matches_mask_and_keeps_order_and_none(self) -> None:
+        client = VaultTransitFPEClient(transit_path="transit/seeds/staging")
+        values = ["123", None, "4567", "123"]
+
+        masked = client.mask_many(values, salt_version="2025-q1")
+
+        fresh = VaultTransitFPEClient(transit_path="transit/seeds/staging")
+        self.assertEqual(masked, [fresh.mask(value, salt_version="2025-q1") for value in values])
+        self.assertIsNone(masked[1])
+        self.assertEqual(masked[0], masked[3])
+
+    def test_mask_many_batches_only_values_missing_from_memo(self) -> None:
+        transport = _RecordingTransport()
+        client = VaultTransitFPEClient(transit_path="transit/seeds/staging", transport=transport, batch_size=2)
+
+        first = client.mask_many(["a", "b", "c", "a"], salt_version="v1")
+        second = client.mask_many(["c", "d"], salt_version="v1")
+        client.mask("a", salt_version="v2")
+
+        self.assertEqual(first, ["v1:a", "v1:b", "v1:c", "v1:a"])
+        self.assertEqual(second, ["v1:c", "v1:d"])
+        self.assertEqual(transport.calls, [["a", "b"], ["c"], ["d"], ["a"]])
+
+    def test_mask_many_rejects_short_transport_response(self) -> None:
+        class _ShortTransport(_RecordingTransport):
+            def encode(self, **kwargs) -> list[str]:
+                return super().encode(**kwargs)[:-1]
+
+        client = VaultTransitFPEClient(transit_path="transit/seeds/staging", transport=_ShortTransport())
+
+        with self.assertRaisesRegex(RuntimeError, "_ShortTransport devolveu 1 valores para 2"):
+            client.mask_many(["a", "b"], salt_version="v1")
+        self.assertEqual(len(client.memo), 0)
+
+    def test_mask_memo_is_bounded_lru(self) -> None:
+        memo = FPEMaskMemo(maxsize=2)
+        memo.put(("p", "n", "v1", "a"), "A")
+        memo.put(("p", "n", "v1", "b"), "B")
+        memo.get(("p", "n", "v1", "a"))
+        memo.put(("p", "n", "v1", "c"), "C")
+
+        self.assertEqual(len(memo), 2)
+        self.assertIsNone(memo.get(("p", "n", "v1", "b")))
+        self.assertEqual(memo.get(("p", "n", "v1", "a")), "A")
+        with self.assertRaises(ValueError):
+            FPEMaskMemo(maxsize=-1)
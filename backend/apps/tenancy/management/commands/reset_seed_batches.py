@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.apps.banking.services.seed_materializer import SeedMaterializationError, reset_seed_batches
+from backend.apps.tenancy.models import SeedRun
+
+
+class Command(BaseCommand):
+    help = 'Apaga as linhas e checkpoints gravados pelos batches de um seed run e os volta para pending.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--seed-run-id', required=True, help='Seed run cujos batches serão desfeitos (UUID).')
+        parser.add_argument(
+            '--entity',
+            action='append',
+            default=[],
+            help='Entidade a desfazer (repetível; padrão: todas). As dependentes entram junto.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        seed_run = (
+            SeedRun.objects.unscoped().select_related('seed_profile').filter(id=options['seed_run_id']).first()
+        )
+        if seed_run is None:
+            raise CommandError(f"Seed run não encontrado: {options['seed_run_id']}.")
+        try:
+            deleted = reset_seed_batches(seed_run, options['entity'] or None)
+        except SeedMaterializationError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(json.dumps({'seed_run_id': str(seed_run.id), 'deleted': deleted}, sort_keys=True))
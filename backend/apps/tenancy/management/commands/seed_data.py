@@ -22,6 +22,7 @@ from backend.apps.tenancy.services.seed_manifest_validator import SeedManifestVa
 from backend.apps.tenancy.services.seed_preflight import PreflightContext, SeedPreflightService
 from backend.apps.tenancy.services.seed_queue_gc import SeedQueueGC
 from backend.apps.tenancy.services.seed_runs import ProblemDetail, SeedRunService
+from backend.apps.tenancy.services.seed_scheduler import SeedBatchScheduler
 
 
 class Command(BaseCommand):
@@ -241,19 +242,22 @@ class Command(BaseCommand):
 
     def _dispatch_batches(self, creation, mode: str) -> None:
         """
-        Dispara tasks Celery para cada batch criado.
+        Dispara os batches criados na ordem do DAG de entidades (mães antes das dependentes).
         Por padrão roda de forma síncrona (sem broker) para testes/dev; habilite async com SEED_CELERY_ASYNC=1.
         """
-        use_async = os.getenv('SEED_CELERY_ASYNC', '0') == '1'
+        seed_run_id = str(creation.seed_run.id)
+        if os.getenv('SEED_CELERY_ASYNC', '0') == '1':
+            seed_tasks.advance_seed_run.apply_async(args=[seed_run_id])  # pragma: no cover - integração real com broker
+            return
         queue = 'seed_data.load_dr' if mode in {'carga', 'dr'} else 'seed_data.default'
         task = seed_tasks.dispatch_load_dr if queue == 'seed_data.load_dr' else seed_tasks.dispatch_baseline
-        for batch in creation.batches:
-            args = [str(batch.seed_run_id), str(batch.tenant_id)]
-            if use_async:
-                task.apply_async(args=args, queue=queue)  # pragma: no cover - integração real com broker
-            else:
-                fake_self = SimpleNamespace(request=SimpleNamespace(delivery_info={'routing_key': queue}))
-                task.__wrapped__.__func__(fake_self, *args)  # type: ignore[attr-defined]
+        fake_self = SimpleNamespace(request=SimpleNamespace(delivery_info={'routing_key': queue}))
+
+        def execute(batch) -> None:
+            args = [str(batch.seed_run_id), str(batch.tenant_id), str(batch.id)]
+            task.__wrapped__.__func__(fake_self, *args)  # type: ignore[attr-defined]
+
+        SeedBatchScheduler().run_inline(seed_run_id, execute)
 
     def _resolve_idempotency_key(self, options: dict, manifest_hash: str) -> str:
         explicit = options.get('idempotency_key') or os.getenv('SEED_IDEMPOTENCY_KEY')
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-18 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0029_alter_budgetratelimit_managers_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seeddataset',
+            name='throughput_rows_per_second',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+    ]
@@ -228,6 +228,8 @@ class SeedDataset(TenantScopedModel):
     entity = models.CharField(max_length=64)
     volumetria_prevista = models.PositiveIntegerField(default=0)
     volumetria_real = models.PositiveIntegerField(default=0)
+    # Vazão da materialização (linhas gravadas por segundo de ``COPY``) da entidade.
+    throughput_rows_per_second = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     slo_target_p95 = models.PositiveIntegerField(default=0)
     slo_target_p99 = models.PositiveIntegerField(default=0)
     drift_percentual = models.DecimalField(max_digits=5, decimal_places=2, default=0)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import BudgetRateLimit, SeedProfile
+
+
+class SeedRateLimiter:
+    """
+    Aplica o ``rate_limit`` do manifesto (``limit`` requisições por ``window_seconds``)
+    às escritas do seed, em janela fixa sobre a linha ``BudgetRateLimit`` do perfil.
+
+    A linha é travada com ``select_for_update``, então o saldo é único para todos os
+    workers que materializam o mesmo perfil em paralelo. Sem saldo, ``acquire`` dorme
+    até o reset da janela. Perfis sem ``BudgetRateLimit`` (ou com limite zero) não são
+    limitados.
+    """
+
+    def __init__(
+        self,
+        seed_profile: SeedProfile,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], datetime] = timezone.now,
+    ) -> None:
+        self.seed_profile = seed_profile
+        self.sleep = sleep
+        self.clock = clock
+
+    def acquire(self) -> float:
+        """Consome uma requisição da janela e retorna os segundos esperados por saldo."""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire()
+            if wait is None:
+                return waited
+            self.sleep(wait)
+            waited += wait
+
+    def _try_acquire(self) -> Optional[float]:
+        now = self.clock()
+        with use_tenant(self.seed_profile.tenant_id), transaction.atomic():
+            budget = BudgetRateLimit.objects.select_for_update().filter(seed_profile_id=self.seed_profile.id).first()
+            if budget is None or budget.rate_limit_limit < 1:
+                return None
+            if budget.reset_at is None or budget.reset_at <= now:
+                budget.rate_limit_remaining = budget.rate_limit_limit
+                budget.reset_at = now + timedelta(seconds=budget.rate_limit_window_seconds)
+            if budget.rate_limit_remaining < 1:
+                return max(0.0, (budget.reset_at - now).total_seconds())
+            budget.rate_limit_remaining -= 1
+            budget.consumed_at = now
+            budget.save(update_fields=['rate_limit_remaining', 'reset_at', 'consumed_at', 'updated_at'])
+        return None
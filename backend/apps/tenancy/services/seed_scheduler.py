@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, List, Mapping, Optional, Sequence, Set
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.apps.banking.services.seed_materializer import entity_dependencies
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import SeedBatch, SeedCheckpoint, SeedRun
+
+
+class SeedBatchScheduler:
+    """
+    Libera os batches de um seed run pelo DAG de dependências das entidades: um batch
+    fica pronto quando todas as entidades-mãe presentes no run têm checkpoint selado em
+    100% (os checkpoints parciais de cada chunk não liberam dependentes).
+    Entidades independentes saem juntas, limitadas a ``max_parallel`` batches em
+    processamento por run.
+
+    ``claim_ready`` trava o ``SeedRun`` para que conclusões simultâneas (cada uma
+    chamando o scheduler) não despachem o mesmo batch nem estourem o limite.
+    """
+
+    def __init__(
+        self,
+        dependencies: Optional[Mapping[str, Sequence[str]]] = None,
+        max_parallel: Optional[int] = None,
+    ) -> None:
+        self.dependencies = dependencies if dependencies is not None else entity_dependencies()
+        self.max_parallel = max(1, int(max_parallel or getattr(settings, 'SEED_MAX_PARALLEL_BATCHES', 4)))
+
+    def claim_ready(self, seed_run_id: UUID | str) -> List[SeedBatch]:
+        """
+        Marca como ``processing`` e retorna os batches liberados, até completar o limite
+        de paralelismo do run.
+        """
+        seed_run = SeedRun.objects.unscoped().filter(id=seed_run_id).first()
+        if seed_run is None or seed_run.dry_run:
+            return []
+        with use_tenant(seed_run.tenant_id), transaction.atomic():
+            SeedRun.objects.select_for_update().filter(id=seed_run.id).first()
+            ready = self._select_ready(seed_run.id, timezone.now())
+        return ready
+
+    def _select_ready(self, seed_run_id: UUID, now: datetime) -> List[SeedBatch]:
+        batches = list(SeedBatch.objects.filter(seed_run_id=seed_run_id).select_related('seed_run').order_by('created_at', 'entity'))
+        sealed = set(
+            SeedCheckpoint.objects.filter(seed_run_id=seed_run_id, sealed=True, percentual_concluido__gte=100)
+            .values_list('entity', flat=True),
+        )
+        in_flight = sum(1 for batch in batches if batch.status == SeedBatch.Status.PROCESSING)
+        present = {batch.entity for batch in batches}
+        ready = [batch for batch in batches if self._is_ready(batch, sealed, present, now)]
+        ready = ready[: max(0, self.max_parallel - in_flight)]
+        if ready:
+            SeedBatch.objects.filter(id__in=[batch.id for batch in ready]).update(
+                status=SeedBatch.Status.PROCESSING,
+                updated_at=now,
+            )
+        for batch in ready:
+            batch.status = SeedBatch.Status.PROCESSING
+        return ready
+
+    def _is_ready(self, batch: SeedBatch, sealed: Set[str], present: Set[str], now: datetime) -> bool:
+        if batch.status != SeedBatch.Status.PENDING:
+            return False
+        if batch.next_retry_at is not None and batch.next_retry_at > now:
+            return False
+        # Mães fora do manifesto não bloqueiam; o materializador acusa se a linha for exigida.
+        return all(parent in sealed for parent in self.dependencies.get(batch.entity, ()) if parent in present)
+
+    def run_inline(self, seed_run_id: UUID | str, execute: Callable[[SeedBatch], object]) -> List[str]:
+        """
+        Executa o DAG no processo atual (sem broker), onda a onda; retorna as entidades
+        na ordem em que foram executadas.
+        """
+        executed: List[str] = []
+        while True:
+            claimed = self.claim_ready(seed_run_id)
+            if not claimed:
+                return executed
+            for batch in claimed:
+                execute(batch)
+                executed.append(batch.entity)
@@ -10,13 +10,19 @@ DECLARE
         'banking_address',
         'banking_consultant',
         'banking_bank_account',
+        'banking_bank_account_daily_balance',
         'banking_account_category',
         'banking_supplier',
         'banking_loan',
         'banking_installment',
         'banking_financial_transaction',
+        'banking_cash_flow_daily_rollup',
+        'banking_loan_interest_accrual',
+        'banking_commission_ledger',
         'banking_credit_limit',
+        'banking_credit_limit_shard',
         'banking_contract',
+        'banking_batch_job_cursor',
         'tenancy_seed_profile',
         'tenancy_seed_run',
         'tenancy_seed_batch',
@@ -64,13 +70,19 @@ DECLARE
         'banking_address',
         'banking_consultant',
         'banking_bank_account',
+        'banking_bank_account_daily_balance',
         'banking_account_category',
         'banking_supplier',
         'banking_loan',
         'banking_installment',
         'banking_financial_transaction',
+        'banking_cash_flow_daily_rollup',
+        'banking_loan_interest_accrual',
+        'banking_commission_ledger',
         'banking_credit_limit',
+        'banking_credit_limit_shard',
         'banking_contract',
+        'banking_batch_job_cursor',
         'tenancy_seed_profile',
         'tenancy_seed_run',
         'tenancy_seed_batch',
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 import structlog
 from celery import shared_task
 from django.utils import timezone
 
+from backend.apps.banking.services.seed_materializer import last_sealed_checkpoint, materialize_seed_batch
 from backend.apps.tenancy.models import SeedBatch, SeedCheckpoint, SeedRun
 from backend.apps.tenancy.services.seed_batches import BackoffConfig, SeedBatchOrchestrator
 from backend.apps.tenancy.services.seed_observability import SeedObservabilityService
 from backend.apps.tenancy.services.seed_runs import ProblemDetail
+from backend.apps.tenancy.services.seed_scheduler import SeedBatchScheduler
 
 logger = structlog.get_logger(__name__)
 
+_RETRY_WAKEUP_SLACK_SECONDS = 1
+
+
+def _materialize(batch_id: str | None) -> dict[str, object]:
+    """
+    Materializa o batch via ``COPY`` quando o dispatch informa o batch; sem batch o
+    dispatch só registra o enfileiramento.
+    """
+    if not batch_id:
+        return {}
+    result = materialize_seed_batch(batch_id)
+    if result is None:
+        return {'batch_id': batch_id, 'status': 'not_found'}
+    return {'batch_id': batch_id, 'status': 'skipped' if result.skipped else 'completed', **result.as_dict()}
+
 
 @shared_task(
     name='seed_data.dispatch_baseline',
@@ -19,9 +38,10 @@ logger = structlog.get_logger(__name__)
     reject_on_worker_lost=True,
     queue='seed_data.default',
 )
-def dispatch_baseline(self, seed_run_id: str, tenant_id: str) -> dict[str, str]:
+def dispatch_baseline(self, seed_run_id: str, tenant_id: str, batch_id: str | None = None) -> dict[str, object]:
     """
-    Enfileira execuções baseline na fila default com acks tardios.
+    Enfileira execuções baseline na fila default com acks tardios e materializa o
+    batch informado.
     """
     routing_key = self.request.delivery_info.get('routing_key') if hasattr(self, 'request') else None
     logger.info(
@@ -30,7 +50,7 @@ def dispatch_baseline(self, seed_run_id: str, tenant_id: str) -> dict[str, str]:
         tenant_id=tenant_id,
         queue=routing_key or 'seed_data.default',
     )
-    return {'seed_run_id': seed_run_id, 'queue': routing_key or 'seed_data.default'}
+    return {'seed_run_id': seed_run_id, 'queue': routing_key or 'seed_data.default', **_materialize(batch_id)}
 
 
 @shared_task(
@@ -40,9 +60,10 @@ def dispatch_baseline(self, seed_run_id: str, tenant_id: str) -> dict[str, str]:
     reject_on_worker_lost=True,
     queue='seed_data.load_dr',
 )
-def dispatch_load_dr(self, seed_run_id: str, tenant_id: str) -> dict[str, str]:
+def dispatch_load_dr(self, seed_run_id: str, tenant_id: str, batch_id: str | None = None) -> dict[str, object]:
     """
-    Enfileira execuções de carga/DR em fila dedicada com acks tardios.
+    Enfileira execuções de carga/DR em fila dedicada com acks tardios e materializa o
+    batch informado.
     """
     routing_key = self.request.delivery_info.get('routing_key') if hasattr(self, 'request') else None
     logger.info(
@@ -51,7 +72,32 @@ def dispatch_load_dr(self, seed_run_id: str, tenant_id: str) -> dict[str, str]:
         tenant_id=tenant_id,
         queue=routing_key or 'seed_data.load_dr',
     )
-    return {'seed_run_id': seed_run_id, 'queue': routing_key or 'seed_data.load_dr'}
+    return {'seed_run_id': seed_run_id, 'queue': routing_key or 'seed_data.load_dr', **_materialize(batch_id)}
+
+
+@shared_task(
+    name='seed_data.advance_run',
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    queue='seed_data.default',
+)
+def advance_seed_run(self, seed_run_id: str) -> dict[str, object]:
+    """
+    Despacha os batches liberados pelo DAG de entidades; cada dispatch encadeia uma nova
+    chamada desta task, que libera as dependentes assim que o checkpoint da mãe é selado.
+    """
+    claimed = SeedBatchScheduler().claim_ready(seed_run_id)
+    for batch in claimed:
+        carga = batch.seed_run.mode in {'carga', 'dr'}
+        dispatch = dispatch_load_dr if carga else dispatch_baseline
+        dispatch.apply_async(
+            args=[str(batch.seed_run_id), str(batch.tenant_id), str(batch.id)],
+            queue='seed_data.load_dr' if carga else 'seed_data.default',
+            link=advance_seed_run.si(seed_run_id),
+        )
+    logger.info('seed_run_advanced', seed_run_id=seed_run_id, dispatched=[batch.entity for batch in claimed])
+    return {'seed_run_id': seed_run_id, 'dispatched': [batch.entity for batch in claimed]}
 
 
 @shared_task(
@@ -90,6 +136,13 @@ def _backoff_from_profile(seed_run: SeedRun) -> BackoffConfig:
     )
 
 
+def _resume_problem(batch: SeedBatch, checkpoint: SeedCheckpoint | None, now: datetime) -> ProblemDetail | None:
+    """Gate de RPO/RTO para retomar um batch de DR a partir de checkpoint."""
+    if checkpoint is None or batch.seed_run.mode != 'dr':
+        return None
+    return SeedObservabilityService().check_rpo_rto(seed_run=batch.seed_run, checkpoints=[checkpoint], now=now)
+
+
 @shared_task(
     name='seed_data.retry_batch',
     bind=True,
@@ -106,6 +159,10 @@ def retry_seed_batch(
 ) -> dict[str, object]:
     """
     Reagenda um batch com backoff/jitter ou envia para DLQ quando exceder tentativas.
+    O reenvio passa pelo ``advance_seed_run``: despachar o batch direto permitia que o
+    scheduler o liberasse de novo em paralelo. Sem ``checkpoint_id`` o retry parte do
+    último checkpoint selado do batch; o materializador retoma dali sem regerar os
+    chunks gravados. Em DR a retomada só é despachada dentro do RPO/RTO.
     """
     now = timezone.now()
     batch = (
@@ -118,8 +175,11 @@ def retry_seed_batch(
         return {'status': 'not_found', 'batch_id': batch_id}
 
     checkpoint = (
-        SeedCheckpoint.objects.unscoped().filter(id=checkpoint_id).first() if checkpoint_id else None
+        SeedCheckpoint.objects.unscoped().filter(id=checkpoint_id).first() if checkpoint_id else last_sealed_checkpoint(batch)
     )
+    problem = _resume_problem(batch, checkpoint, now)
+    if problem is not None:
+        return {'batch_id': str(batch.id), 'status': 'blocked', 'problem': problem.as_dict()}
 
     orchestrator = SeedBatchOrchestrator(_backoff_from_profile(batch.seed_run))
     plan = orchestrator.plan_retry(
@@ -136,11 +196,13 @@ def retry_seed_batch(
                 queue=plan.queue,
             )
         else:
-            dispatch = dispatch_load_dr if plan.queue == 'seed_data.load_dr' else dispatch_baseline
-            dispatch.apply_async(
-                args=[str(batch.seed_run_id), str(batch.tenant_id)],
-                countdown=plan.retry_in_seconds or 0,
-                queue=plan.queue,
+            # O batch volta a ``pending`` com ``next_retry_at``; quem o despacha é o
+            # scheduler, sob a trava do run e o limite de paralelismo. A folga de 1s cobre
+            # diferença de relógio entre workers.
+            advance_seed_run.apply_async(
+                args=[str(batch.seed_run_id)],
+                countdown=(plan.retry_in_seconds or 0) + _RETRY_WAKEUP_SLACK_SECONDS,
+                queue='seed_data.default',
             )
 
     return {
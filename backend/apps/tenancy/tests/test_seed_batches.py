@@ -265,7 +265,8 @@ class SeedBatchCeleryTaskTest(TestCase):
         self.assertIn(str(self.batch.seed_run_id), called_kwargs.get('args', []))
 
     @patch('backend.apps.tenancy.tasks.dispatch_load_dr.apply_async')
-    def test_retry_seed_batch_auto_dispatches_to_load_dr(self, mock_apply_async) -> None:
+    @patch('backend.apps.tenancy.tasks.advance_seed_run.apply_async')
+    def test_retry_seed_batch_reschedules_through_scheduler(self, mock_apply_async, mock_dispatch) -> None:
         with use_tenant(self.tenant.id):
             SeedProfile.objects.filter(id=self.batch.seed_run.seed_profile_id).update(
                 backoff={'base_seconds': 1, 'jitter_factor': 0, 'max_retries': 3, 'max_interval_seconds': 5}
@@ -281,6 +282,10 @@ class SeedBatchCeleryTaskTest(TestCase):
         self.assertFalse(result['to_dlq'])
         mock_apply_async.assert_called_once()
         called_args, called_kwargs = mock_apply_async.call_args
-        self.assertIn(str(self.batch.seed_run_id), called_kwargs.get('args', []))
-        self.assertEqual(called_kwargs.get('queue'), 'seed_data.load_dr')
-        self.assertEqual(called_kwargs.get('countdown'), result['retry_in_seconds'])
+        self.assertEqual(called_kwargs.get('args'), [str(self.batch.seed_run_id)])
+        self.assertGreater(called_kwargs.get('countdown'), result['retry_in_seconds'])
+        # O batch não é despachado direto: volta a pending e espera o scheduler.
+        mock_dispatch.assert_not_called()
+        self.assertEqual(result['queue'], 'seed_data.load_dr')
+        with use_tenant(self.tenant.id):
+            self.assertEqual(SeedBatch.objects.get(id=self.batch.id).status, SeedBatch.Status.PENDING)
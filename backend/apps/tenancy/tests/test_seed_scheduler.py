@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.apps.banking.models import Installment
+from backend.apps.banking.services.seed_materializer import entity_dependencies
+from backend.apps.tenancy import tasks as seed_tasks
+from backend.apps.tenancy.managers import use_tenant
+from backend.apps.tenancy.models import BudgetRateLimit, SeedBatch, SeedCheckpoint, SeedRun, Tenant
+from backend.apps.tenancy.services.seed_rate_limit import SeedRateLimiter
+from backend.apps.tenancy.services.seed_runs import SeedRunService
+from backend.apps.tenancy.services.seed_scheduler import SeedBatchScheduler
+from backend.apps.tenancy.tests.seed_profile_test_utils import build_manifest
+
+CAPS = {
+    'tenant_users': 1,
+    'customers': 3,
+    'addresses': 3,
+    'consultants': 1,
+    'bank_accounts': 2,
+    'account_categories': 2,
+    'suppliers': 2,
+    'loans': 2,
+    'installments': 6,
+    'financial_transactions': 4,
+    'limits': 2,
+    'contracts': 2,
+}
+
+
+class SeedBatchSchedulerTest(TestCase):
+    databases = {'default'}
+
+    def setUp(self) -> None:
+        self.tenant = Tenant.objects.create(
+            slug='tenant-scheduler',
+            display_name='Tenant Scheduler',
+            primary_domain='tenant-scheduler.iabank.local',
+            pii_policy_version='v1',
+        )
+        manifest = build_manifest(
+            tenant_slug=self.tenant.slug,
+            environment='staging',
+            overrides={'volumetry': {entity: {'cap': cap} for entity, cap in CAPS.items()}},
+        )
+        self.seed_run = SeedRunService().create_seed_run(
+            tenant_id=self.tenant.id,
+            environment='staging',
+            manifest=manifest,
+            manifest_path='configs/seed_profiles/staging/tenant-scheduler.yaml',
+            idempotency_key='seed-scheduler-1',
+            requested_by='svc-seeds',
+            dry_run=False,
+            mode='baseline',
+        ).seed_run
+
+    def _seal(self, entity: str) -> None:
+        with use_tenant(self.tenant.id):
+            SeedCheckpoint.objects.create(
+                tenant=self.tenant,
+                seed_run=self.seed_run,
+                entity=entity,
+                hash_estado='0' * 64,
+                resume_token=b'{}',
+                percentual_concluido=100,
+                sealed=True,
+            )
+            SeedBatch.objects.filter(seed_run=self.seed_run, entity=entity).update(status=SeedBatch.Status.COMPLETED)
+
+    def test_dependencies_follow_banking_foreign_keys(self) -> None:
+        dependencies = entity_dependencies()
+
+        self.assertEqual(dependencies['customers'], ())
+        self.assertEqual(dependencies['suppliers'], ())
+        self.assertEqual(dependencies['consultants'], ('tenant_users',))
+        self.assertEqual(dependencies['limits'], ('bank_accounts',))
+        self.assertEqual(set(dependencies['loans']), {'customers', 'consultants'})
+        self.assertIn('installments', dependencies['financial_transactions'])
+
+    def test_claim_releases_roots_up_to_cap_and_dependents_after_seal(self) -> None:
+        scheduler = SeedBatchScheduler(max_parallel=2)
+
+        first = [batch.entity for batch in scheduler.claim_ready(self.seed_run.id)]
+        self.assertEqual(len(first), 2)
+        self.assertTrue(all(not entity_dependencies()[entity] for entity in first))
+        # Com o teto ocupado nada novo sai, mesmo havendo raízes pendentes.
+        self.assertEqual(scheduler.claim_ready(self.seed_run.id), [])
+
+        for entity in first:
+            self._seal(entity)
+        self._seal('customers')
+        released = {batch.entity for batch in SeedBatchScheduler(max_parallel=20).claim_ready(self.seed_run.id)}
+        self.assertIn('addresses', released)
+        self.assertNotIn('loans', released)
+        self.assertNotIn('installments', released)
+
+    def test_claim_skips_batches_waiting_for_retry(self) -> None:
+        with use_tenant(self.tenant.id):
+            SeedBatch.objects.filter(seed_run=self.seed_run, entity='customers').update(
+                next_retry_at=timezone.now() + timedelta(minutes=5),
+            )
+
+        released = {batch.entity for batch in SeedBatchScheduler(max_parallel=20).claim_ready(self.seed_run.id)}
+
+        self.assertNotIn('customers', released)
+        self.assertIn('suppliers', released)
+
+    def test_advance_task_completes_run_through_the_dag(self) -> None:
+        result = seed_tasks.advance_seed_run.apply(args=[str(self.seed_run.id)]).get()
+
+        self.assertTrue(result['dispatched'])
+        self.seed_run.refresh_from_db()
+        self.assertEqual(self.seed_run.status, SeedRun.Status.SUCCEEDED)
+        with use_tenant(self.tenant.id):
+            self.assertEqual(Installment.objects.count(), CAPS['installments'])
+            self.assertFalse(SeedBatch.objects.filter(seed_run=self.seed_run).exclude(status=SeedBatch.Status.COMPLETED).exists())
+            self.assertEqual(SeedCheckpoint.objects.filter(seed_run=self.seed_run, sealed=True).count(), len(CAPS))
+
+    def test_rate_limiter_waits_for_window_reset_when_exhausted(self) -> None:
+        now = timezone.now()
+        clock = [now]
+        sleeps: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            clock[0] += timedelta(seconds=seconds)
+
+        with use_tenant(self.tenant.id):
+            BudgetRateLimit.objects.filter(seed_profile=self.seed_run.seed_profile).update(
+                rate_limit_limit=2,
+                rate_limit_remaining=2,
+                rate_limit_window_seconds=10,
+                reset_at=now + timedelta(seconds=10),
+            )
+        limiter = SeedRateLimiter(self.seed_run.seed_profile, sleep=sleep, clock=lambda: clock[0])
+
+        waited = [limiter.acquire() for _ in range(3)]
+
+        self.assertEqual(waited, [0.0, 0.0, 10.0])
+        self.assertEqual(sleeps, [10.0])
+        with use_tenant(self.tenant.id):
+            budget = BudgetRateLimit.objects.get(seed_profile=self.seed_run.seed_profile)
+        self.assertEqual(budget.rate_limit_remaining, 1)
+        self.assertEqual(budget.reset_at, now + timedelta(seconds=20))
@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 
 import structlog
+from celery.schedules import crontab
 from kombu import Exchange, Queue
 
 from backend.config.logging_utils import structlog_pii_sanitizer
@@ -150,6 +151,8 @@ REST_FRAMEWORK = {
 
 PGCRYPTO_KEY = os.environ.get('FOUNDATION_PGCRYPTO_KEY', 'dev-only-pgcrypto-key')
 
+BANKING_SCHEDULE_CACHE_SIZE = int(os.environ.get('BANKING_SCHEDULE_CACHE_SIZE', '4096'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -218,10 +221,13 @@ CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_BROKER_TRANSPORT_OPTIONS = {
     'visibility_timeout': int(os.environ.get('SEED_QUEUE_VISIBILITY_TIMEOUT', '600')),
 }
+# Teto de batches de um mesmo seed run materializando em paralelo (entidades independentes no DAG).
+SEED_MAX_PARALLEL_BATCHES = int(os.environ.get('SEED_MAX_PARALLEL_BATCHES', '4'))
 CELERY_TASK_QUEUES = (
     Queue('seed_data.default', Exchange('seed_data'), routing_key='seed_data.default'),
     Queue('seed_data.load_dr', Exchange('seed_data'), routing_key='seed_data.load_dr'),
     Queue('seed_data.dlq', Exchange('seed_data'), routing_key='seed_data.dlq'),
+    Queue('banking.maintenance', Exchange('banking'), routing_key='banking.maintenance'),
 )
 CELERY_TASK_ROUTES = {
     'seed_data.dispatch_baseline': {
@@ -240,7 +246,56 @@ CELERY_TASK_ROUTES = {
         'queue': 'seed_data.default',
         'routing_key': 'seed_data.default',
     },
+    'seed_data.advance_run': {
+        'queue': 'seed_data.default',
+        'routing_key': 'seed_data.default',
+    },
+    'banking.sweep_overdue_installments': {
+        'queue': 'banking.maintenance',
+        'routing_key': 'banking.maintenance',
+    },
+    'banking.fold_commission_ledger': {
+        'queue': 'banking.maintenance',
+        'routing_key': 'banking.maintenance',
+    },
+    'banking.classify_delinquency': {
+        'queue': 'banking.maintenance',
+        'routing_key': 'banking.maintenance',
+    },
+    'banking.accrue_loan_interest': {
+        'queue': 'banking.maintenance',
+        'routing_key': 'banking.maintenance',
+    },
 }
+CELERY_BEAT_SCHEDULE = {
+    # Horário: o primeiro disparo do dia varre tudo; os seguintes retomam cursores pendentes.
+    'banking-overdue-sweep': {
+        'task': 'banking.sweep_overdue_installments',
+        'schedule': crontab(minute=5),
+    },
+    'banking-commission-fold': {
+        'task': 'banking.fold_commission_ledger',
+        'schedule': crontab(minute='*/10'),
+    },
+    # Diária, depois da primeira varredura de vencidas do dia.
+    'banking-delinquency-classification': {
+        'task': 'banking.classify_delinquency',
+        'schedule': crontab(hour=1, minute=30),
+    },
+    # Logo após a meia-noite, apropriando o dia que terminou.
+    'banking-interest-accrual': {
+        'task': 'banking.accrue_loan_interest',
+        'schedule': crontab(hour=0, minute=20),
+    },
+}
+BANKING_OVERDUE_SWEEP_CHUNK_SIZE = int(os.environ.get('BANKING_OVERDUE_SWEEP_CHUNK_SIZE', '5000'))
+BANKING_OVERDUE_SWEEP_MAX_CHUNKS = (
+    int(os.environ['BANKING_OVERDUE_SWEEP_MAX_CHUNKS']) if os.environ.get('BANKING_OVERDUE_SWEEP_MAX_CHUNKS') else None
+)
+BANKING_DELINQUENCY_CHUNK_SIZE = int(os.environ.get('BANKING_DELINQUENCY_CHUNK_SIZE', '2000'))
+BANKING_DELINQUENCY_THRESHOLD_DAYS = int(os.environ.get('BANKING_DELINQUENCY_THRESHOLD_DAYS', '30'))
+BANKING_INTEREST_ACCRUAL_CHUNK_SIZE = int(os.environ.get('BANKING_INTEREST_ACCRUAL_CHUNK_SIZE', '5000'))
+BANKING_INTEREST_ACCRUAL_WORKERS = int(os.environ.get('BANKING_INTEREST_ACCRUAL_WORKERS', '4'))
 
 if (
     DATABASES.get('postgresql')
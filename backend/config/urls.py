@@ -4,4 +4,5 @@ urlpatterns = [
     path('', include('django_prometheus.urls')),
     path('api/v1/', include('backend.apps.foundation.api.urls')),
     path('api/v1/', include('backend.apps.tenancy.urls')),
+    path('api/v1/', include('backend.apps.banking.urls')),
 ]
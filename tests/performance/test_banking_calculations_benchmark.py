@@ -0,0 +1,172 @@
+"""
+Micro-benchmarks dos cálculos financeiros do banking (cotação escalar e em lote).
+
+Cada caso mede operações por segundo (melhor de ``REPEATS`` janelas, após uma chamada
+de aquecimento) e compara com ``banking_calculations_baseline.json``. Junto de cada
+caso é medido um laço de calibração em ``Decimal``; o valor esperado é o do baseline
+escalado pela razão entre a calibração atual e a gravada, o que neutraliza a diferença
+entre máquinas e a variação de carga da própria máquina.
+
+Uma queda só reprova depois de ``ATTEMPTS`` medições abaixo do limite: ruído não se
+repete, regressão sim.
+
+Variáveis de ambiente:
+- ``BANKING_BENCHMARK_MAX_REGRESSION``: queda máxima tolerada (fração, padrão 0.30).
+- ``BANKING_BENCHMARK_UPDATE_BASELINE=1``: regrava o baseline (mediana de ``ATTEMPTS``).
+
+Com um tracer ativo (cobertura, depurador) as medições não são comparáveis; os casos
+rodam apenas como smoke test. O cache de cronogramas fica desligado durante a medição
+para que cada chamada calcule de fato. Nada depende de rede ou banco.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from backend.apps.banking.services.cet_solver import solve_cet_batch
+from backend.apps.banking.services.financial_calculations import (
+    LoanInput,
+    _add_months,
+    calculate_cet,
+    calculate_iof,
+    generate_installments,
+)
+from backend.apps.banking.services.portfolio_quotes import quote_portfolio
+from backend.apps.banking.services.schedule_cache import get_schedule_cache
+
+BASELINE_PATH = Path(__file__).with_name("banking_calculations_baseline.json")
+INSTALLMENT_COUNTS = (1, 12, 60, 120, 240, 420)
+BATCH_SIZE = 100
+REPEATS = 5
+ATTEMPTS = 5
+WINDOW_SECONDS = 0.02
+DEFAULT_MAX_REGRESSION = 0.30
+
+
+def _loan(installments: int, variant: int = 0) -> LoanInput:
+    return LoanInput(
+        principal_amount=Decimal("15000.00") + variant,
+        annual_rate_pct=Decimal("24.00"),
+        number_of_installments=installments,
+        contract_date=date(2025, 1, 10),
+        first_installment_date=date(2025, 2, 10),
+    )
+
+
+def _batch(installments: int) -> list:
+    return [_loan(installments, variant) for variant in range(BATCH_SIZE)]
+
+
+# nome -> (monta o argumento a partir do número de parcelas, operação, unidades por chamada)
+CASES = {
+    "calculate_iof": (_loan, calculate_iof, 1),
+    "generate_installments": (_loan, generate_installments, 1),
+    "calculate_cet": (_loan, calculate_cet, 1),
+    "add_months": (lambda count: count, lambda count: _add_months(date(2025, 1, 31), count), 1),
+    "quote_portfolio": (_batch, quote_portfolio, BATCH_SIZE),
+    "solve_cet_batch": (_batch, solve_cet_batch, BATCH_SIZE),
+}
+CASE_IDS = [f"{name}[{count}]" for name in CASES for count in INSTALLMENT_COUNTS]
+
+
+def _calibration_loop(_=None) -> None:
+    total = Decimal(0)
+    for value in range(200):
+        total += (Decimal(value) * Decimal("1.0125")).quantize(Decimal("0.01"))
+
+
+def _ops_per_second(operation, argument, units: int) -> float:
+    operation(argument)  # aquecimento: calendários, caches de módulo e alocações iniciais
+    best = 0.0
+    for _ in range(REPEATS):
+        calls = 0
+        elapsed = 0.0
+        started = time.perf_counter()
+        while elapsed < WINDOW_SECONDS:
+            operation(argument)
+            calls += 1
+            elapsed = time.perf_counter() - started
+        best = max(best, calls * units / elapsed)
+    return best
+
+
+def _measure(case_id: str) -> dict:
+    name, count = case_id[:-1].split("[")
+    build, operation, units = CASES[name]
+    ops = _ops_per_second(operation, build(int(count)), units)
+    return {"ops_per_second": ops, "calibration_ops_per_second": _ops_per_second(_calibration_loop, None, 1)}
+
+
+def _max_regression() -> float:
+    value = float(os.environ.get("BANKING_BENCHMARK_MAX_REGRESSION", DEFAULT_MAX_REGRESSION))
+    assert 0 < value < 1, "BANKING_BENCHMARK_MAX_REGRESSION deve estar entre 0 e 1."
+    return value
+
+
+def _updating_baseline() -> bool:
+    return os.environ.get("BANKING_BENCHMARK_UPDATE_BASELINE") == "1"
+
+
+def _load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    cache = get_schedule_cache()
+    previous = cache.maxsize
+    cache.clear()
+    cache.resize(0)
+    results: dict = {}
+    yield results
+    cache.resize(previous)
+    if _updating_baseline() and sys.gettrace() is None and results:
+        baseline = {**_load_baseline(), **results}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def test_baseline_covers_every_case():
+    if _updating_baseline():
+        pytest.skip("Baseline em regravação.")
+    missing = sorted(set(CASE_IDS) - set(_load_baseline()))
+    assert not missing, f"Baseline sem os casos {missing}; rode com BANKING_BENCHMARK_UPDATE_BASELINE=1."
+
+
+@pytest.mark.parametrize("case_id", CASE_IDS)
+def test_banking_calculation_throughput(case_id, benchmark_results):
+    if sys.gettrace() is not None:
+        measured = _measure(case_id)
+        assert measured["ops_per_second"] > 0, f"{case_id} não executou nenhuma operação."
+        return
+
+    if _updating_baseline():
+        samples = [_measure(case_id) for _ in range(ATTEMPTS)]
+        benchmark_results[case_id] = {
+            key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]
+        }
+        return
+
+    reference = _load_baseline()[case_id]
+    floor_ratio = 1 - _max_regression()
+    ratios = []
+    for _ in range(ATTEMPTS):
+        measured = _measure(case_id)
+        expected = reference["ops_per_second"] * (
+            measured["calibration_ops_per_second"] / reference["calibration_ops_per_second"]
+        )
+        ratios.append(measured["ops_per_second"] / expected)
+        if ratios[-1] >= floor_ratio:
+            return
+    pytest.fail(
+        f"{case_id}: vazão em {max(ratios):.0%} do baseline ajustado em {ATTEMPTS} tentativas "
+        f"(tolerância {_max_regression():.0%}).",
+    )
@@ -0,0 +1,151 @@
+"""
+Benchmark do mascaramento FPE em lote (``mask_many``) contra o mascaramento valor a
+valor (``mask``), usando um Vault stand-in local.
+
+O stand-in é um servidor HTTP em ``127.0.0.1`` que atende ``POST /v1/<path>/encode``
+com ``batch_input``, devolve o mascaramento do stub e conta as requisições; o
+``_StandInTransport`` deste módulo é o ``FPETransport`` que fala com ele. Não é o
+contrato da API do Vault: serve só para medir o custo de uma ida e volta por valor
+contra uma por lote. Cada requisição espera ``FPE_STANDIN_LATENCY_MS`` (padrão 1 ms).
+
+Com um tracer ativo (cobertura, depurador) a comparação de tempo não é confiável; o
+caso de desempenho roda apenas como smoke test. Nada sai da máquina.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.apps.foundation.services.seed_utils import (
+    FPEMaskMemo,
+    VaultTransitFPEClient,
+    stub_fpe_mask,
+)
+
+TRANSIT_PATH = "transit/seeds/perf/00000000-0000-0000-0000-000000000000"
+SALT_VERSION = "v1"
+VALUE_COUNT = 400
+BATCH_SIZE = 256
+MIN_SPEEDUP = 5.0
+
+
+class _StandInVaultHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802 - nome exigido por BaseHTTPRequestHandler
+        prefix, suffix = "/v1/", "/encode"
+        if not (self.path.startswith(prefix) and self.path.endswith(suffix)):
+            self.send_error(404)
+            return
+        transit_path = self.path[len(prefix) : -len(suffix)]
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests += 1
+        time.sleep(self.server.latency_seconds)
+        results = [
+            {"encoded_value": stub_fpe_mask(transit_path, body["transformation"], item["tweak"], item["value"])}
+            for item in body["batch_input"]
+        ]
+        payload = json.dumps({"data": {"batch_results": results}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - assinatura da stdlib
+        return
+
+
+class _StandInTransport:
+    def __init__(self, addr: str) -> None:
+        self.addr = addr
+
+    def encode(self, *, transit_path: str, transformation: str, tweak: str, values) -> list:
+        body = {"transformation": transformation, "batch_input": [{"value": value, "tweak": tweak} for value in values]}
+        request = urllib.request.Request(
+            f"{self.addr}/v1/{transit_path}/encode",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return [item["encoded_value"] for item in json.loads(response.read())["data"]["batch_results"]]
+
+
+@pytest.fixture(scope="module")
+def stand_in_vault():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInVaultHandler)
+    server.requests = 0
+    server.latency_seconds = float(os.environ.get("FPE_STANDIN_LATENCY_MS", "1")) / 1000
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, batch_size: int = BATCH_SIZE) -> VaultTransitFPEClient:
+    host, port = server.server_address
+    return VaultTransitFPEClient(
+        transit_path=TRANSIT_PATH,
+        transport=_StandInTransport(f"http://{host}:{port}"),
+        batch_size=batch_size,
+        memo=FPEMaskMemo(),
+    )
+
+
+def _values(label: str) -> list:
+    return [f"{label}{index:011d}" for index in range(VALUE_COUNT)]
+
+
+def _requests_during(server, operation) -> tuple:
+    before = server.requests
+    started = time.perf_counter()
+    result = operation()
+    return result, server.requests - before, time.perf_counter() - started
+
+
+def test_batched_masking_matches_per_value_and_stub(stand_in_vault):
+    values = _values("match")
+
+    per_value, per_value_requests, _ = _requests_during(
+        stand_in_vault,
+        lambda: [_client(stand_in_vault).mask(value, salt_version=SALT_VERSION) for value in values],
+    )
+    client = _client(stand_in_vault)
+    batched, batched_requests, _ = _requests_during(
+        stand_in_vault,
+        lambda: client.mask_many(values, salt_version=SALT_VERSION),
+    )
+    _, memo_requests, _ = _requests_during(stand_in_vault, lambda: client.mask_many(values, salt_version=SALT_VERSION))
+
+    stub = VaultTransitFPEClient(transit_path=TRANSIT_PATH)
+    assert batched == per_value == [stub.mask(value, salt_version=SALT_VERSION) for value in values]
+    assert per_value_requests == VALUE_COUNT
+    assert batched_requests == math.ceil(VALUE_COUNT / BATCH_SIZE)
+    assert memo_requests == 0
+
+
+def test_batched_masking_outperforms_per_value(stand_in_vault):
+    client = _client(stand_in_vault)
+    _, _, per_value_seconds = _requests_during(
+        stand_in_vault,
+        lambda: [client.mask(value, salt_version=SALT_VERSION) for value in _values("single")],
+    )
+    _, _, batched_seconds = _requests_during(
+        stand_in_vault,
+        lambda: client.mask_many(_values("batch"), salt_version=SALT_VERSION),
+    )
+
+    print(
+        f"\nFPE stand-in: {VALUE_COUNT} valores, por valor {per_value_seconds * 1000:.1f} ms, "
+        f"em lote {batched_seconds * 1000:.1f} ms ({per_value_seconds / batched_seconds:.1f}x)",
+    )
+    if sys.gettrace() is not None:
+        return
+    assert per_value_seconds / batched_seconds >= MIN_SPEEDUP